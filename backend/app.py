@@ -4,32 +4,60 @@ Spirit Food Backend API
 FastAPI server for Snowflake lookups and AI ID card generation.
 """
 
+import asyncio
+import json
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, EmailStr, Field, ValidationError
 from dotenv import load_dotenv
 
-from snowflake_lookup import lookup_flavor_profile
-from cuisine_matcher import determine_cuisine, get_supported_cuisines
-from id_generator import generate_id_card as ai_generate_id_card
-
-# Load environment variables
+# Load environment variables before importing backend modules, which read
+# their settings from the environment at import time
 env_path = Path(__file__).parent / "config" / ".env"
 print(f"DEBUG: Loading .env from: {env_path}")
 print(f"DEBUG: .env file exists: {env_path.exists()}")
 load_dotenv(dotenv_path=env_path)
 
+from snowflake_lookup import lookup_flavor_profile, get_cached_flavor_profile, get_flavor_profile_cache_stats
+from profile_store import get_profile_store
+from cuisine_matcher import determine_cuisine, get_supported_cuisines
+from id_generator import (
+    generate_id_card_async as ai_generate_id_card,
+    generate_id_cards_batch_async as ai_generate_id_cards_batch,
+    stream_id_card_async as ai_stream_id_card,
+    IDCardContent,
+    PeerReview,
+    card_events,
+    get_cache_stats,
+    load_cache_snapshot,
+)
+from utils.executor import PoolSaturatedError, get_pool, get_pool_stats as get_executor_stats, shutdown_pools
+from utils.logger import get_logger
+from utils.metrics import ID_CARD_FALLBACKS, MetricsMiddleware, get_registry, render_metrics, stats_collector
+from utils.portkey_llm import get_circuit_breaker
+from utils.rate_limiter import get_rate_limiter
+from utils.snowflake_connection import get_pool_stats as get_snowflake_pool_stats
+from utils.tracing import TracingMiddleware, get_tracer
+from warm_cache import DEFAULT_SNAPSHOT_PATH, enumerate_combinations, warm_id_card_cache
+
+logger = get_logger(__name__)
+
 # Debug: Print loaded API keys (masked)
 portkey_key = os.getenv('PORTKEY_API_KEY', '')
 portkey_virtual = os.getenv('PORTKEY_OPENAI_VIRTUAL_KEY', '')
 print(f"DEBUG: PORTKEY_API_KEY loaded: {'YES (' + portkey_key[:8] + '...)' if portkey_key else 'NO (empty)'}")
 print(f"DEBUG: PORTKEY_OPENAI_VIRTUAL_KEY loaded: {'YES (' + portkey_virtual[:8] + '...)' if portkey_virtual else 'NO (empty)'}")
 
+# Batch generation limits
+ID_CARD_BATCH_MAX_SIZE = int(os.getenv("ID_CARD_BATCH_MAX_SIZE", "200"))
+ID_CARD_BATCH_CONCURRENCY = int(os.getenv("ID_CARD_BATCH_CONCURRENCY", "8"))
+
 # Create FastAPI app
 app = FastAPI(
     title="Spirit Food API",
@@ -37,6 +65,39 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Per-route latency, status and in-flight metrics, and a root tracing span per request
+app.add_middleware(TracingMiddleware, routes=app.routes)
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+# Component stats exported at scrape time
+_registry = get_registry()
+_registry.register_collector(
+    "spirit_cache", "gauge", "Cache size and hit/miss/eviction counters",
+    stats_collector("spirit_cache", lambda: {
+        "flavor_profile": get_flavor_profile_cache_stats(),
+        "id_card": get_cache_stats(),
+    }, labelname="cache")
+)
+_registry.register_collector(
+    "spirit_snowflake_pool", "gauge", "Snowflake connection pool occupancy and counters",
+    stats_collector("spirit_snowflake_pool", get_snowflake_pool_stats, labelname="pool")
+)
+_registry.register_collector(
+    "spirit_executor", "gauge", "Dependency executor occupancy and rejections",
+    stats_collector("spirit_executor", get_executor_stats, labelname="pool")
+)
+_registry.register_collector(
+    "spirit_llm_circuit_breaker", "gauge", "LLM circuit breaker failures and transitions (open=1 when open)",
+    stats_collector("spirit_llm_circuit_breaker", lambda: {
+        **get_circuit_breaker().stats(),
+        "open": int(get_circuit_breaker().state == "open"),
+    })
+)
+_registry.register_collector(
+    "spirit_llm_rate_limiter", "gauge", "LLM rate limiter queue depth and grant/wait/timeout counters",
+    stats_collector("spirit_llm_rate_limiter", lambda: get_rate_limiter().stats() if get_rate_limiter() else {})
+)
+
 # Configure CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +115,40 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_profile_store_refresh():
+    """Keep the local flavor profile store fresh when FLAVOR_PROFILE_REFRESH_SECONDS is set."""
+    interval = float(os.getenv("FLAVOR_PROFILE_REFRESH_SECONDS", "0"))
+    if interval > 0:
+        get_profile_store().start_background_refresh(interval)
+
+
+@app.on_event("startup")
+async def warm_id_card_cache_on_startup():
+    """Load persisted ID cards and optionally finish warming the rest in the background."""
+    snapshot_path = Path(os.getenv("ID_CARD_CACHE_SNAPSHOT", DEFAULT_SNAPSHOT_PATH))
+    load_cache_snapshot(snapshot_path)
+    if os.getenv("ID_CARD_WARM_ON_STARTUP", "false").lower() == "true":
+        app.state.warm_task = asyncio.create_task(warm_id_card_cache(
+            enumerate_combinations(),
+            concurrency=int(os.getenv("ID_CARD_WARM_CONCURRENCY", "4")),
+            rate_per_second=float(os.getenv("ID_CARD_WARM_RATE", "2")),
+            snapshot_path=snapshot_path
+        ))
+
+
+@app.on_event("shutdown")
+def stop_dependency_pools():
+    """Release executor threads on shutdown."""
+    shutdown_pools(wait=False)
+
+
+@app.on_event("shutdown")
+def flush_traces():
+    """Export spans still queued at shutdown."""
+    get_tracer().shutdown()
+
+
 # ============================================================================
 # Request/Response Models
 # ============================================================================
@@ -84,12 +179,9 @@ class IDCardRequest(BaseModel):
     adventure_percent: int
 
 
-class PeerReview(BaseModel):
-    text: str
-    reviewer: str
-
-
 class IDCardResponse(BaseModel):
+    # Deliberately without IDCardContent's constraints: cards are validated
+    # in build_id_card_response, which falls back instead of failing with a 500
     title: str
     strengths: list[str]
     weaknesses: list[str]
@@ -99,6 +191,15 @@ class IDCardResponse(BaseModel):
     cached: bool
 
 
+class IDCardBatchRequest(BaseModel):
+    requests: list[IDCardRequest]
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class IDCardBatchResponse(BaseModel):
+    cards: list[IDCardResponse]
+
+
 class ErrorResponse(BaseModel):
     error: bool
     message: str
@@ -109,6 +210,16 @@ class ErrorResponse(BaseModel):
 # Endpoints
 # ============================================================================
 
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """Reject fast with 503 when a dependency pool has no capacity left."""
+    return JSONResponse(
+        status_code=503,
+        content=ErrorResponse(error=True, message=str(exc), code="DEPENDENCY_SATURATED").model_dump(),
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
@@ -118,6 +229,21 @@ async def health_check():
     )
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics scrape endpoint."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    """Cache hit/miss/eviction counters for monitoring."""
+    return {
+        "flavor_profile": get_flavor_profile_cache_stats(),
+        "id_card": get_cache_stats(),
+    }
+
+
 @app.post("/api/flavor-profile", response_model=FlavorProfileResponse)
 async def get_flavor_profile(request: FlavorProfileRequest):
     """
@@ -125,14 +251,19 @@ async def get_flavor_profile(request: FlavorProfileRequest):
 
     Returns cuisine preferences based on order history.
     """
+    # Cache hits are answered on the event loop; misses run on the bounded Snowflake pool
+    profile = get_cached_flavor_profile(request.email)
     try:
-        profile = lookup_flavor_profile(request.email)
+        if profile is None:
+            profile = await get_pool("snowflake").run(lookup_flavor_profile, request.email)
         return FlavorProfileResponse(
             found=profile.get("found", False),
             cuisine_preferences=profile.get("cuisine_preferences", []),
             top_cuisine=profile.get("top_cuisine"),
             confidence=profile.get("confidence", 0)
         )
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         return FlavorProfileResponse(
             found=False,
@@ -142,40 +273,32 @@ async def get_flavor_profile(request: FlavorProfileRequest):
         )
 
 
-@app.post("/api/generate-id-card", response_model=IDCardResponse)
-async def generate_id_card(request: IDCardRequest):
+def _validated_card(request: IDCardRequest, ai_result: Optional[dict]) -> Optional[IDCardResponse]:
     """
-    Generate AI-powered ID card content.
+    Convert an AI result to the response model, or None if there is none or it is invalid.
 
-    Uses Portkey LLM to create personalized card content.
-    Falls back to hardcoded content if AI is unavailable.
+    Results that do not satisfy IDCardContent (e.g. incomplete cards cached
+    before validation was added) are rejected so callers fall back.
     """
-    # Try AI generation first
-    ai_result = ai_generate_id_card(
-        dish_type=request.dish_type,
-        cuisine=request.cuisine,
-        alignment_adjective=request.alignment_adjective,
-        time_axis=request.time_axis,
-        time_percent=request.time_percent,
-        adventure_axis=request.adventure_axis,
-        adventure_percent=request.adventure_percent
-    )
+    if not ai_result:
+        return None
+    try:
+        content = IDCardContent.model_validate(ai_result)
+    except ValidationError as e:
+        logger.warning(f"Discarding invalid ID card for {request.alignment_adjective} "
+                       f"{request.cuisine} {request.dish_type}: {e.error_count()} errors")
+        return None
+    return IDCardResponse(**content.model_dump(), cached=ai_result.get("cached", False))
 
-    if ai_result:
-        return IDCardResponse(
-            title=ai_result.get("title", f"The {request.alignment_adjective} {request.dish_type}"),
-            strengths=ai_result.get("strengths", []),
-            weaknesses=ai_result.get("weaknesses", []),
-            quotes=ai_result.get("quotes", []),
-            hidden_talent=ai_result.get("hidden_talent", ""),
-            peer_reviews=[
-                PeerReview(text=pr.get("text", ""), reviewer=pr.get("reviewer", ""))
-                for pr in ai_result.get("peer_reviews", [])
-            ],
-            cached=ai_result.get("cached", False)
-        )
+
+def build_id_card_response(request: IDCardRequest, ai_result: Optional[dict]) -> IDCardResponse:
+    """Convert an AI result to the response model, or build the hardcoded fallback card."""
+    card = _validated_card(request, ai_result)
+    if card is not None:
+        return card
 
     # Fall back to hardcoded content
+    ID_CARD_FALLBACKS.inc()
     return IDCardResponse(
         title=f"The {request.alignment_adjective} {request.dish_type}",
         strengths=[
@@ -202,6 +325,107 @@ async def generate_id_card(request: IDCardRequest):
     )
 
 
+@app.post("/api/generate-id-card", response_model=IDCardResponse)
+async def generate_id_card(request: IDCardRequest):
+    """
+    Generate AI-powered ID card content.
+
+    Uses Portkey LLM to create personalized card content.
+    Falls back to hardcoded content if AI is unavailable.
+    """
+    # Try AI generation first (awaited so the event loop keeps serving other requests)
+    ai_result = await ai_generate_id_card(
+        dish_type=request.dish_type,
+        cuisine=request.cuisine,
+        alignment_adjective=request.alignment_adjective,
+        time_axis=request.time_axis,
+        time_percent=request.time_percent,
+        adventure_axis=request.adventure_axis,
+        adventure_percent=request.adventure_percent
+    )
+    return build_id_card_response(request, ai_result)
+
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _id_card_event_stream(request: IDCardRequest):
+    """
+    Yield SSE frames for an ID card: one per field as it completes, then "done".
+
+    If generation fails before finishing, or yields an invalid card, the
+    fallback card is replayed so the client always ends with a complete card.
+    """
+    async for kind, payload in ai_stream_id_card(**request.model_dump()):
+        if kind == "field":
+            field, index, value = payload
+            yield _sse(field, {"index": index, "value": value})
+            continue
+
+        card = _validated_card(request, payload)
+        if card is None:
+            card = build_id_card_response(request, None)
+            for field, index, value in card_events(card.model_dump()):
+                yield _sse(field, {"index": index, "value": value})
+        yield _sse("done", card.model_dump())
+
+
+def _streaming_id_card_response(request: IDCardRequest) -> StreamingResponse:
+    return StreamingResponse(
+        _id_card_event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/generate-id-card/stream")
+async def stream_id_card(request: IDCardRequest):
+    """
+    Stream ID card generation as Server-Sent Events.
+
+    Emits a "title", "strengths", "weaknesses", "quotes", "hidden_talent" or
+    "peer_reviews" event as soon as each value (or list element) is
+    complete, with data {"index": n|null, "value": ...}, followed by a final
+    "done" event carrying the full card. Cache hits replay instantly.
+    """
+    return _streaming_id_card_response(request)
+
+
+@app.get("/api/generate-id-card/stream")
+async def stream_id_card_get(request: IDCardRequest = Depends()):
+    """GET variant of /api/generate-id-card/stream for EventSource clients."""
+    return _streaming_id_card_response(request)
+
+
+@app.post("/api/generate-id-cards", response_model=IDCardBatchResponse)
+async def generate_id_cards(batch: IDCardBatchRequest):
+    """
+    Generate many ID cards in one round-trip.
+
+    Duplicate combinations are generated once, cache hits are served
+    immediately, and misses are generated concurrently up to the
+    concurrency cap. Cards are returned in request order, with the
+    hardcoded fallback for any that could not be generated.
+    """
+    if len(batch.requests) > ID_CARD_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch of {len(batch.requests)} exceeds the maximum of {ID_CARD_BATCH_MAX_SIZE} cards"
+        )
+
+    concurrency = min(batch.max_concurrency or ID_CARD_BATCH_CONCURRENCY, ID_CARD_BATCH_CONCURRENCY)
+    ai_results = await ai_generate_id_cards_batch(
+        [request.model_dump() for request in batch.requests],
+        max_concurrency=concurrency
+    )
+    return IDCardBatchResponse(cards=[
+        build_id_card_response(request, ai_result)
+        for request, ai_result in zip(batch.requests, ai_results)
+    ])
+
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
@@ -0,0 +1 @@
+"""Benchmarks for the Spirit Food backend."""
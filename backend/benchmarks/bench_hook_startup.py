@@ -0,0 +1,72 @@
+"""
+SnowflakeHook Startup Benchmark
+
+Measures how long it takes to construct a SnowflakeHook, which sits on the
+critical path of every /api/flavor-profile request. Construction must not
+touch Spark, Polars or SQLAlchemy, so it should stay well under a millisecond.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_hook_startup [--iterations 2000] [--budget-ms 1.0]
+
+Exits non-zero if the p99 construction time exceeds the budget.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Dummy credentials so parameter validation passes without a real config/.env
+os.environ.setdefault("SNOWFLAKE_USER", "benchmark")
+os.environ.setdefault("SNOWFLAKE_PASSWORD", "benchmark")
+
+from utils.snowflake_connection import SnowflakeHook
+
+
+def run(iterations: int) -> list:
+    """Construct `iterations` hooks and return per-construction times in milliseconds."""
+    # Warm up: the first construction loads config/.env
+    SnowflakeHook()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        SnowflakeHook()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--budget-ms", type=float, default=1.0,
+                        help="Maximum allowed p99 construction time in milliseconds")
+    args = parser.parse_args()
+
+    timings = sorted(run(args.iterations))
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+    print(f"SnowflakeHook() x {args.iterations}")
+    print(f"  mean: {statistics.mean(timings):.4f} ms")
+    print(f"  p50:  {p50:.4f} ms")
+    print(f"  p99:  {p99:.4f} ms")
+    print(f"  max:  {timings[-1]:.4f} ms")
+
+    for module in ("pyspark", "polars", "sqlalchemy"):
+        if module in sys.modules:
+            print(f"FAIL: constructing SnowflakeHook imported {module}")
+            return 1
+
+    if p99 > args.budget_ms:
+        print(f"FAIL: p99 {p99:.4f} ms exceeds budget of {args.budget_ms} ms")
+        return 1
+
+    print(f"OK: p99 within {args.budget_ms} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
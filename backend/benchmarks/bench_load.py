@@ -0,0 +1,281 @@
+"""
+End-to-end Load Benchmark
+
+Boots the FastAPI app in-process against a fake Snowflake connector and a
+fake OpenAI-compatible gateway, then drives /api/flavor-profile and
+/api/generate-id-card at a fixed concurrency. Reports throughput, latency
+percentiles, status codes and cache hit rates, so changes to pooling,
+caching and executor sizing can be compared without real dependencies.
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_load [--scenario mixed] [--concurrency 32] [--requests 2000]
+        [--users 500] [--combos 50] [--stream]
+        [--snowflake-connect-ms 300] [--snowflake-query-ms 50] [--found-rate 0.8]
+        [--llm-latency-ms 800] [--llm-error-rate 0.0] [--json] [--budget-p99-ms 0]
+
+Exits non-zero if any request fails or, with --budget-p99-ms, if the
+overall p99 latency exceeds the budget.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# Dummy credentials and isolated state so nothing touches real services or data/
+_workdir = Path(tempfile.mkdtemp(prefix="spirit-bench-"))
+os.environ.setdefault("SNOWFLAKE_USER", "benchmark")
+os.environ.setdefault("SNOWFLAKE_PASSWORD", "benchmark")
+os.environ.setdefault("PORTKEY_API_KEY", "benchmark")
+os.environ.setdefault("PORTKEY_OPENAI_VIRTUAL_KEY", "benchmark")
+os.environ["FLAVOR_PROFILE_STORE_PATH"] = str(_workdir / "flavor_profiles.sqlite")
+os.environ["ID_CARD_CACHE_SNAPSHOT"] = str(_workdir / "id_card_snapshot.json")
+os.environ["ID_CARD_CACHE_PATH"] = str(_workdir / "id_card_cache.sqlite")
+os.environ["ID_CARD_WARM_ON_STARTUP"] = "false"
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.fake_snowflake import FakeSnowflake
+
+ENDPOINTS = {
+    "flavor-profile": "/api/flavor-profile",
+    "id-card": "/api/generate-id-card",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def start_app(port: int) -> uvicorn.Server:
+    """Serve app.app on a background thread and wait until it accepts requests."""
+    from app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="bench-uvicorn", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("App failed to start")
+        time.sleep(0.05)
+    return server
+
+
+def build_workload(args) -> list:
+    """Return (endpoint, payload) pairs; pool sizes control how often caches can hit."""
+    from warm_cache import enumerate_combinations
+
+    rng = random.Random(args.seed)
+    emails = [f"bench.user{i}@example.com" for i in range(args.users)]
+    combos = enumerate_combinations()[:args.combos]
+
+    if args.scenario == "mixed":
+        kinds = ["flavor-profile", "id-card"]
+    else:
+        kinds = [args.scenario]
+
+    workload = []
+    for i in range(args.requests):
+        kind = kinds[i % len(kinds)]
+        if kind == "flavor-profile":
+            payload = {"email": rng.choice(emails)}
+        else:
+            dish_type, cuisine, adjective, time_axis, adventure_axis = rng.choice(combos)
+            payload = {
+                "dish_type": dish_type,
+                "cuisine": cuisine,
+                "alignment_adjective": adjective,
+                "time_axis": time_axis,
+                # The winning axis of three is always above a third
+                "time_percent": rng.randint(34, 100),
+                "adventure_axis": adventure_axis,
+                "adventure_percent": rng.randint(34, 100),
+            }
+        workload.append((kind, payload))
+    return workload
+
+
+async def _send(client: httpx.AsyncClient, kind: str, payload: dict, stream: bool) -> int:
+    path = ENDPOINTS[kind]
+    if kind == "id-card" and stream:
+        async with client.stream("POST", path + "/stream", json=payload) as response:
+            async for _ in response.aiter_bytes():
+                pass
+            return response.status_code
+    response = await client.post(path, json=payload)
+    return response.status_code
+
+
+async def drive(base_url: str, workload: list, concurrency: int, stream: bool) -> dict:
+    """Run the workload with `concurrency` workers; return per-endpoint latencies and statuses."""
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    queue = iter(workload)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            for kind, payload in queue:
+                start = time.perf_counter()
+                try:
+                    status = await _send(client, kind, payload, stream)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[kind].append((time.perf_counter() - start) * 1000)
+                statuses[kind][str(status)] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {"elapsed": elapsed, "latencies": latencies, "statuses": statuses}
+
+
+def _fallbacks(metrics_text: str) -> float:
+    for line in metrics_text.splitlines():
+        if line.startswith("spirit_id_card_fallbacks_total"):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def summarize(result: dict, cache_stats: dict, fallbacks: float, fakes: dict) -> dict:
+    elapsed = result["elapsed"]
+    endpoints = {}
+    all_latencies = []
+    for kind, values in result["latencies"].items():
+        values = sorted(values)
+        all_latencies.extend(values)
+        endpoints[kind] = {
+            "requests": len(values),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 0.50), 2),
+            "p95_ms": round(_percentile(values, 0.95), 2),
+            "p99_ms": round(_percentile(values, 0.99), 2),
+            "max_ms": round(values[-1], 2),
+            "statuses": dict(result["statuses"][kind]),
+        }
+    all_latencies.sort()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": len(all_latencies),
+        "rps": round(len(all_latencies) / elapsed, 2),
+        "p50_ms": round(_percentile(all_latencies, 0.50), 2),
+        "p95_ms": round(_percentile(all_latencies, 0.95), 2),
+        "p99_ms": round(_percentile(all_latencies, 0.99), 2),
+        "endpoints": endpoints,
+        "cache": {
+            name: {key: stats.get(key) for key in ("hits", "stale_hits", "misses", "hit_ratio", "size")}
+            for name, stats in cache_stats.items()
+        },
+        "id_card_fallbacks": fallbacks,
+        "fakes": fakes,
+    }
+
+
+def print_report(report: dict, args):
+    print(f"{args.scenario} x {report['requests']} requests, concurrency {args.concurrency}"
+          f"{' (streaming)' if args.stream else ''}")
+    print(f"  elapsed: {report['elapsed_s']:.2f} s   rps: {report['rps']:.1f}")
+    print(f"  p50: {report['p50_ms']:.1f} ms   p95: {report['p95_ms']:.1f} ms   p99: {report['p99_ms']:.1f} ms")
+    for kind, stats in report["endpoints"].items():
+        print(f"  {ENDPOINTS[kind]}")
+        print(f"    rps: {stats['rps']:.1f}   p50: {stats['p50_ms']:.1f} ms   p95: {stats['p95_ms']:.1f} ms"
+              f"   p99: {stats['p99_ms']:.1f} ms   max: {stats['max_ms']:.1f} ms")
+        print(f"    statuses: {stats['statuses']}")
+    for name, stats in report["cache"].items():
+        print(f"  cache {name}: hit_ratio {stats['hit_ratio']}  hits {stats['hits']}"
+              f"  stale_hits {stats['stale_hits']}  misses {stats['misses']}  size {stats['size']}")
+    print(f"  id card fallbacks: {report['id_card_fallbacks']:.0f}")
+    print(f"  fake snowflake: {report['fakes']['snowflake']}")
+    print(f"  fake llm: {report['fakes']['llm']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=["mixed", "flavor-profile", "id-card"], default="mixed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=500, help="Distinct emails in the flavor profile workload")
+    parser.add_argument("--combos", type=int, default=50, help="Distinct ID card combinations in the workload")
+    parser.add_argument("--stream", action="store_true", help="Use the SSE ID card endpoint")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--snowflake-connect-ms", type=float, default=300)
+    parser.add_argument("--snowflake-query-ms", type=float, default=50)
+    parser.add_argument("--snowflake-rows", type=int, default=1, help="Rows returned by non-lookup queries")
+    parser.add_argument("--found-rate", type=float, default=0.8, help="Fraction of users with a profile")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-stream-chunks", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--budget-p99-ms", type=float, default=0,
+                        help="Fail if overall p99 latency exceeds this (0 disables)")
+    args = parser.parse_args()
+
+    snowflake = FakeSnowflake(
+        connect_latency=args.snowflake_connect_ms / 1000,
+        query_latency=args.snowflake_query_ms / 1000,
+        found_rate=args.found_rate,
+        rows=args.snowflake_rows,
+    )
+    snowflake.install()
+    llm = FakeLLMServer(
+        latency=args.llm_latency_ms / 1000,
+        error_rate=args.llm_error_rate,
+        stream_chunks=args.llm_stream_chunks,
+    ).start()
+    os.environ["PORTKEY_BASE_URL"] = llm.base_url
+
+    server = start_app(_free_port())
+    host, port = server.config.host, server.config.port
+    base_url = f"http://{host}:{port}"
+    try:
+        result = asyncio.run(drive(base_url, build_workload(args), args.concurrency, args.stream))
+        cache_stats = httpx.get(f"{base_url}/api/cache-stats").json()
+        fallbacks = _fallbacks(httpx.get(f"{base_url}/metrics").text)
+    finally:
+        server.should_exit = True
+        llm.stop()
+        snowflake.uninstall()
+
+    report = summarize(result, cache_stats, fallbacks, {"snowflake": snowflake.counters, "llm": llm.counters})
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args)
+
+    failed = sum(
+        count for stats in report["endpoints"].values()
+        for status, count in stats["statuses"].items() if status != "200"
+    )
+    if failed:
+        print(f"FAIL: {failed} requests did not return 200")
+        return 1
+    if args.budget_p99_ms and report["p99_ms"] > args.budget_p99_ms:
+        print(f"FAIL: p99 {report['p99_ms']:.1f} ms exceeds budget of {args.budget_p99_ms} ms")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
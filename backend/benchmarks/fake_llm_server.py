@@ -0,0 +1,167 @@
+"""
+Fake OpenAI-compatible chat completions server for benchmarks.
+
+Serves POST /v1/chat/completions on a local port with configurable
+latency, error rate and streaming speed, returning a valid ID card JSON
+body, so the backend's LLM path can be load-tested without a gateway.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+def _card(n: int) -> dict:
+    return {
+        "title": f"Benchmark Card {n}",
+        "strengths": ["Strength one.", "Strength two.", "Strength three."],
+        "weaknesses": ["Weakness one.", "Weakness two.", "Weakness three."],
+        "quotes": ["Quote one.", "Quote two."],
+        "hidden_talent": "Load testing",
+        "peer_reviews": [
+            {"text": "Fast.", "reviewer": "Ramen"},
+            {"text": "Reliable.", "reviewer": "Burger"},
+            {"text": "Consistent.", "reviewer": "Salad"},
+        ],
+    }
+
+
+class FakeLLMServer:
+    """
+    Local OpenAI-compatible server with tunable behaviour.
+
+    Usage:
+        server = FakeLLMServer(latency=0.5).start()
+        os.environ["PORTKEY_BASE_URL"] = server.base_url
+        ...
+        server.stop()
+    """
+
+    def __init__(self, latency: float = 0.5, error_rate: float = 0.0, stream_chunks: int = 20,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            latency: Seconds before a response starts (time to first token when streaming)
+            error_rate: Fraction of requests answered with HTTP 500
+            stream_chunks: Number of content chunks a streamed response is split into
+            host: Bind address
+            port: Bind port (0 picks a free one)
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.counters = dict(requests=0, errors=0, streamed=0)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _count(self, name: str) -> int:
+        with self._lock:
+            self.counters[name] += 1
+            return self.counters[name]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                n = server._count("requests")
+                time.sleep(server.latency)
+                if random.random() < server.error_rate:
+                    server._count("errors")
+                    self._send_json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+                    return
+
+                content = json.dumps(_card(n))
+                model = request.get("model", "fake-model")
+                prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+                usage = {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                if request.get("stream"):
+                    server._count("streamed")
+                    include_usage = (request.get("stream_options") or {}).get("include_usage")
+                    self._stream(content, model, usage if include_usage else None)
+                    return
+                self._send_json(200, {
+                    "id": f"chatcmpl-{n}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                })
+
+            def _stream(self, content: str, model: str, usage: Optional[dict]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                size = -(-len(content) // server.stream_chunks)
+                pieces = [content[i:i + size] for i in range(0, len(content), size)]
+                for piece in pieces:
+                    chunk = {
+                        "id": "chatcmpl-stream",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                if usage is not None:
+                    chunk = {
+                        "id": "chatcmpl-stream",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text: str):
+                data = text.encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
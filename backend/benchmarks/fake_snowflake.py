@@ -0,0 +1,178 @@
+"""
+Fake Snowflake connector for benchmarks.
+
+Stands in for snowflake.connector.connect with configurable connect and
+query latency, so the backend's connection pool, caching and executor
+behaviour can be measured without a warehouse. Flavor profile lookups get
+a deterministic found/not-found answer per username.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+import snowflake.connector
+
+_CUISINES = ["Japanese", "Mexican", "Italian", "Thai", "Indian", "Chinese", "Korean", "Vietnamese"]
+
+
+class FakeResultBatch:
+    """Stand-in for a connector ResultBatch; downloading it costs the per-row fetch latency."""
+
+    def __init__(self, fake: "FakeSnowflake", frame: pd.DataFrame):
+        self._fake = fake
+        self._frame = frame
+        self.rowcount = len(frame)
+
+    def to_pandas(self, connection=None, **kwargs) -> pd.DataFrame:
+        time.sleep(self._fake.fetch_latency_per_row * self.rowcount)
+        return self._frame.copy()
+
+    def to_arrow(self, connection=None, **kwargs):
+        import pyarrow as pa
+        return pa.Table.from_pandas(self.to_pandas(), preserve_index=False)
+
+
+class FakeCursor:
+    def __init__(self, fake: "FakeSnowflake"):
+        self._fake = fake
+        self._frame: Optional[pd.DataFrame] = None
+
+    def execute(self, query: str, params=None):
+        self._fake._count("queries")
+        time.sleep(self._fake.query_latency)
+        username = (params or {}).get("username") if isinstance(params, dict) else None
+        self._frame = self._fake.result_for(query, username)
+        return self
+
+    def fetch_pandas_all(self) -> pd.DataFrame:
+        frame = self._frame if self._frame is not None else pd.DataFrame()
+        time.sleep(self._fake.fetch_latency_per_row * len(frame))
+        return frame
+
+    def fetch_arrow_all(self, force_return_table: bool = False):
+        import pyarrow as pa
+        frame = self.fetch_pandas_all()
+        if frame.empty and not force_return_table:
+            return None
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+    def fetch_pandas_batches(self) -> Iterator[pd.DataFrame]:
+        frame = self.fetch_pandas_all()
+        for start in range(0, len(frame), self._fake.batch_rows):
+            yield frame.iloc[start:start + self._fake.batch_rows]
+
+    def get_result_batches(self) -> list:
+        frame = self._frame if self._frame is not None else pd.DataFrame()
+        return [
+            FakeResultBatch(self._fake, frame.iloc[start:start + self._fake.batch_rows])
+            for start in range(0, len(frame), self._fake.batch_rows)
+        ]
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, fake: "FakeSnowflake"):
+        self._fake = fake
+        self._closed = False
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self._fake)
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._closed = True
+
+
+class FakeSnowflake:
+    """
+    Configurable stand-in for a Snowflake account.
+
+    Patch it in with install(); every snowflake.connector.connect call then
+    returns a FakeConnection after `connect_latency` seconds.
+    """
+
+    def __init__(self, connect_latency: float = 0.3, query_latency: float = 0.05,
+                 found_rate: float = 0.8, rows: int = 1, fetch_latency_per_row: float = 0.0,
+                 batch_rows: int = 10_000):
+        """
+        Args:
+            connect_latency: Seconds per new connection (login)
+            query_latency: Seconds per executed query
+            found_rate: Fraction of usernames that have a flavor profile
+            rows: Rows returned by queries other than single-user lookups
+            fetch_latency_per_row: Extra seconds per fetched row
+            batch_rows: Rows per result batch
+        """
+        self.connect_latency = connect_latency
+        self.query_latency = query_latency
+        self.found_rate = found_rate
+        self.rows = rows
+        self.fetch_latency_per_row = fetch_latency_per_row
+        self.batch_rows = batch_rows
+        self._lock = threading.Lock()
+        self.counters = dict(connects=0, queries=0)
+        self._original_connect: Optional[Callable] = None
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _has_profile(self, username: str) -> bool:
+        digest = hashlib.md5(username.lower().encode()).digest()
+        return digest[0] / 255 < self.found_rate
+
+    @staticmethod
+    def _profile_row(username: str) -> dict:
+        digest = hashlib.md5(username.lower().encode()).digest()
+        cuisines = [_CUISINES[(digest[i] + i) % len(_CUISINES)] for i in range(3)]
+        return {
+            "CONSUMER_ID": int.from_bytes(digest[:4], "big"),
+            "FLAVOR_PROFILE_JSON": json.dumps({"spice": digest[1] / 255}),
+            "TOP_CUISINES": ",".join(dict.fromkeys(cuisines)),
+            "CUISINE_CONFIDENCE": round(digest[2] / 255, 3),
+            "UPDATED_AT": "2026-01-01 00:00:00.000000",
+        }
+
+    def result_for(self, query: str, username: Optional[str]) -> pd.DataFrame:
+        """Build the result frame for a query."""
+        if username is not None:
+            rows = [self._profile_row(username)] if self._has_profile(username) else []
+            return pd.DataFrame(rows, columns=list(self._profile_row("x")))
+        return pd.DataFrame([
+            {"EMAIL_PREFIX": f"user{i}", **self._profile_row(f"user{i}")} for i in range(self.rows)
+        ])
+
+    def connect(self, **params) -> FakeConnection:
+        self._count("connects")
+        time.sleep(self.connect_latency)
+        return FakeConnection(self)
+
+    def install(self):
+        """Route snowflake.connector.connect to this fake."""
+        self._original_connect = snowflake.connector.connect
+        snowflake.connector.connect = self.connect
+
+    def uninstall(self):
+        if self._original_connect is not None:
+            snowflake.connector.connect = self._original_connect
+            self._original_connect = None
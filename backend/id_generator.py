@@ -2,67 +2,306 @@
 ID Card Generator
 
 Uses Portkey LLM to generate AI-powered Spirit Food ID card content.
+Generated cards are kept in a pluggable cache backend (in-memory LRU or a
+SQLite file shared by all worker processes).
 """
 
-from typing import Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Annotated, Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import asyncio
 import json
 import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
 
-from utils.portkey_llm import get_portkey_llm
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from utils.cache import AsyncSingleFlight, SingleFlight
+from utils.executor import PoolSaturatedError, get_pool
+from utils.portkey_llm import get_portkey_llm, get_async_portkey_llm
+from utils.tracing import traced
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# In-memory cache for AI responses
-_id_card_cache: Dict[str, dict] = {}
 
+class IDCardCacheBackend:
+    """
+    Interface for ID card cache storage.
 
-def generate_cache_key(dish_type: str, cuisine: str, alignment_adjective: str) -> str:
-    """Generate a unique cache key for this combination."""
-    combo = f"{dish_type}|{cuisine}|{alignment_adjective}"
-    return hashlib.md5(combo.encode()).hexdigest()
+    Values are JSON-serializable entry dicts holding a pool of card variants
+    ({"variants": [card, ...]}). Implementations must be safe to call from
+    multiple threads.
+    """
 
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached entry for key, or None."""
+        raise NotImplementedError
 
-def generate_id_card(
-    dish_type: str,
-    cuisine: str,
-    alignment_adjective: str,
-    time_axis: str,
-    time_percent: int,
-    adventure_axis: str,
-    adventure_percent: int,
-    use_cache: bool = True
-) -> Optional[Dict]:
+    def set(self, key: str, value: dict):
+        """Store a card under key."""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove key if present."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all cards."""
+        raise NotImplementedError
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """Iterate over (key, card) pairs."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def stats(self) -> dict:
+        """Backend name, size and any eviction counters."""
+        return {"backend": type(self).__name__, "size": len(self)}
+
+
+class MemoryLRUCardCache(IDCardCacheBackend):
+    """Process-local LRU cache bounded by entry count and approximate JSON size."""
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of cards kept
+            max_bytes: Maximum total size of cards, measured as serialized JSON
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: dict):
+        size = len(json.dumps(value))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        with self._lock:
+            snapshot = [(key, value) for key, (value, _) in self._data.items()]
+        return iter(snapshot)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+        }
+
+
+class SQLiteCardCache(IDCardCacheBackend):
     """
-    Generate AI-powered ID card content.
+    Durable cache in a local SQLite file, shared by every worker process.
 
-    Args:
-        dish_type: e.g., "Pho", "Burger"
-        cuisine: e.g., "Vietnamese", "American"
-        alignment_adjective: e.g., "Unhinged", "Classic"
-        time_axis: e.g., "Late Night", "Early Bird"
-        time_percent: 0-100
-        adventure_axis: e.g., "Adventurer", "Comfort Seeker"
-        adventure_percent: 0-100
-        use_cache: Whether to use cached responses
+    WAL mode lets many readers proceed while one process writes. Entries
+    beyond max_entries are pruned least-recently-written first, on a
+    background thread. Lookups run on the event loop, so get() waits at most
+    read_timeout for a lock and reports a miss instead of stalling every
+    request behind a writer; writes can wait on the lock for much longer
+    and belong off the event loop.
+    """
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 50000, read_timeout: float = 0.05):
+        """
+        Args:
+            path: SQLite file location (created if missing)
+            max_entries: Maximum number of cards kept
+            read_timeout: Seconds get() waits for a locked database before treating it as a miss
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.read_timeout = read_timeout
+        self._local = threading.local()
+        self._writes = 0
+        self._read_timeouts = 0
+        self._pruning = False
+        self._prune_lock = threading.Lock()
+        self._prune_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="id-card-cache-prune")
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS id_cards ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS id_cards_updated_at ON id_cards (updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _read_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "read_conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.read_timeout)
+            self._local.read_conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            # fetchall finishes the statement so no read lock outlives the call
+            rows = self._read_connection().execute("SELECT value FROM id_cards WHERE key = ?", (key,)).fetchall()
+        except sqlite3.OperationalError as e:
+            self._read_timeouts += 1
+            logger.warning(f"ID card cache read failed ({e}), treating as a miss")
+            return None
+        return json.loads(rows[0][0]) if rows else None
+
+    def set(self, key: str, value: dict):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO id_cards (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._schedule_prune()
+
+    def _schedule_prune(self):
+        """Queue a prune unless one is already pending; the triggering write does not wait for it."""
+        with self._prune_lock:
+            if self._pruning:
+                return
+            self._pruning = True
+        self._prune_executor.submit(self._prune)
+
+    def _prune(self):
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM id_cards WHERE key IN ("
+                    "SELECT key FROM id_cards ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"ID card cache prune failed: {e}")
+        finally:
+            with self._prune_lock:
+                self._pruning = False
+
+    def delete(self, key: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM id_cards WHERE key = ?", (key,))
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM id_cards")
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        rows = self._connection().execute("SELECT key, value FROM id_cards").fetchall()
+        return ((key, json.loads(value)) for key, value in rows)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM id_cards").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "path": str(self.path),
+            "max_entries": self.max_entries,
+            "read_timeouts": self._read_timeouts,
+        }
+
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / "data" / "id_card_cache.sqlite"
+
+
+def create_cache_backend() -> IDCardCacheBackend:
+    """
+    Build the ID card cache backend from environment configuration.
+
+    ID_CARD_CACHE_BACKEND selects "memory" (default) or "sqlite";
+    ID_CARD_CACHE_MAX_ENTRIES, ID_CARD_CACHE_MAX_BYTES, ID_CARD_CACHE_PATH and
+    ID_CARD_CACHE_READ_TIMEOUT tune it.
 
     Returns:
-        Dict with title, strengths, weaknesses, quotes, hidden_talent, peer_reviews
+        IDCardCacheBackend
     """
-    # Check cache first
-    cache_key = generate_cache_key(dish_type, cuisine, alignment_adjective)
-    if use_cache and cache_key in _id_card_cache:
-        logger.info(f"Cache hit for {alignment_adjective} {cuisine} {dish_type}")
-        cached = _id_card_cache[cache_key].copy()
-        cached['cached'] = True
-        return cached
-
-    llm = get_portkey_llm()
-    if not llm.is_available():
-        logger.warning("Portkey LLM not available, returning None")
-        return None
+    backend = os.getenv("ID_CARD_CACHE_BACKEND", "memory").lower()
+    max_entries = int(os.getenv("ID_CARD_CACHE_MAX_ENTRIES", "5000"))
+    if backend == "sqlite":
+        return SQLiteCardCache(
+            os.getenv("ID_CARD_CACHE_PATH", DEFAULT_CACHE_PATH),
+            max_entries=max_entries,
+            read_timeout=float(os.getenv("ID_CARD_CACHE_READ_TIMEOUT", "0.05"))
+        )
+    if backend != "memory":
+        logger.warning(f"Unknown ID_CARD_CACHE_BACKEND '{backend}', using memory")
+    return MemoryLRUCardCache(
+        max_entries=max_entries,
+        max_bytes=int(os.getenv("ID_CARD_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+    )
+
+
+# Cache for AI responses
+_id_card_cache: IDCardCacheBackend = create_cache_backend()
+
+# In-flight deduplication: concurrent misses for the same key share one LLM call
+_generation_flight = SingleFlight()
+_async_generation_flight = AsyncSingleFlight()
+GENERATION_TIMEOUT = float(os.getenv("ID_CARD_GENERATION_TIMEOUT", "30"))
+
 
-    prompt = f"""Generate a Spirit Food ID card for the following combination:
+# Model used for card generation; part of every cache key
+ID_CARD_MODEL = os.getenv("ID_CARD_MODEL", "gpt-4o-mini")
+
+PROMPT_TEMPLATE = """Generate a Spirit Food ID card for the following combination:
 
 SPIRIT FOOD: {alignment_adjective} {cuisine} {dish_type}
 - Dish Type: {dish_type}
@@ -95,47 +334,1037 @@ Return ONLY valid JSON:
   ]
 }}"""
 
+# Part of every cache key, so editing the template invalidates cached cards
+PROMPT_VERSION = hashlib.md5(PROMPT_TEMPLATE.encode()).hexdigest()[:8]
+
+# How much of the prompt input a cache key distinguishes, from best hit rate to most personal:
+#   "combination" - dish, cuisine, adjective and axes; percentages are ignored (default;
+#                   the only level the warm job, which uses one representative percent, fully covers)
+#   "banded"      - plus percentages bucketed into ID_CARD_CACHE_PERCENT_BAND-point bands
+#   "exact"       - plus exact percentages
+CACHE_FIDELITY_LEVELS = ("combination", "banded", "exact")
+CACHE_FIDELITY = os.getenv("ID_CARD_CACHE_FIDELITY", "combination").lower()
+if CACHE_FIDELITY not in CACHE_FIDELITY_LEVELS:
+    logger.warning(f"Unknown ID_CARD_CACHE_FIDELITY {CACHE_FIDELITY!r}, using 'combination'")
+    CACHE_FIDELITY = "combination"
+CACHE_PERCENT_BAND = max(1, int(os.getenv("ID_CARD_CACHE_PERCENT_BAND", "10")))
+
+
+def generate_cache_key(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int,
+    fidelity: Optional[str] = None
+) -> str:
+    """
+    Generate the cache key for a card request.
+
+    Keys always include the prompt template version and model; how much of
+    the remaining prompt input they include depends on the fidelity level.
+
+    Args:
+        fidelity: "combination", "banded" or "exact" (defaults to ID_CARD_CACHE_FIDELITY)
+
+    Returns:
+        str: Hex digest cache key
+    """
+    fidelity = fidelity or CACHE_FIDELITY
+    parts = [PROMPT_VERSION, ID_CARD_MODEL, dish_type, cuisine, alignment_adjective, time_axis, adventure_axis]
+    if fidelity == "banded":
+        parts += [time_percent // CACHE_PERCENT_BAND, adventure_percent // CACHE_PERCENT_BAND]
+    elif fidelity == "exact":
+        parts += [time_percent, adventure_percent]
+    combo = "|".join(str(part) for part in parts)
+    return hashlib.md5(combo.encode()).hexdigest()
+
+
+def _request_cache_key(request: Dict) -> str:
+    """Cache key for a dict of generate_id_card_async keyword arguments."""
+    return generate_cache_key(
+        request["dish_type"], request["cuisine"], request["alignment_adjective"],
+        request["time_axis"], request["time_percent"],
+        request["adventure_axis"], request["adventure_percent"]
+    )
+
+
+def _build_prompt(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int
+) -> str:
+    """Build the ID card generation prompt for this combination."""
+    return PROMPT_TEMPLATE.format(
+        dish_type=dish_type,
+        cuisine=cuisine,
+        alignment_adjective=alignment_adjective,
+        time_axis=time_axis,
+        time_percent=time_percent,
+        adventure_axis=adventure_axis,
+        adventure_percent=adventure_percent
+    )
+
+
+class PeerReview(BaseModel):
+    text: str
+    reviewer: str
+
+
+class IDCardContent(BaseModel):
+    """Schema of the generated part of an ID card; LLM output is validated against it."""
+    title: str = Field(min_length=1)
+    strengths: List[str] = Field(min_length=1)
+    weaknesses: List[str] = Field(min_length=1)
+    quotes: List[str] = Field(min_length=1)
+    hidden_talent: str = Field(min_length=1)
+    peer_reviews: List[PeerReview] = Field(min_length=1)
+
+
+# Per-field validators for salvaging partially valid responses
+_FIELD_VALIDATORS = {
+    name: TypeAdapter(Annotated[field.annotation, field])
+    for name, field in IDCardContent.model_fields.items()
+}
+
+# JSON shape of each field, for repair prompts
+_FIELD_FORMATS = {
+    "title": '"..." (2-4 words)',
+    "strengths": '["...", "...", "..."] (1 sentence each)',
+    "weaknesses": '["...", "...", "..."] (1 sentence each)',
+    "quotes": '["...", "..."]',
+    "hidden_talent": '"..." (1 phrase)',
+    "peer_reviews": '[{"text": "...", "reviewer": "..."}, {"text": "...", "reviewer": "..."}, {"text": "...", "reviewer": "..."}]',
+}
+
+# Ask for a JSON object so responses need no fence stripping or guesswork
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Completion budget for re-prompting only the missing fields of a card
+REPAIR_MAX_TOKENS = int(os.getenv("ID_CARD_REPAIR_MAX_TOKENS", "400"))
+
+
+_lookup_counts = dict(hits=0, stale_hits=0, misses=0)
+_lookup_counts_lock = threading.Lock()
+
+
+def _count_lookup(result: str):
+    with _lookup_counts_lock:
+        _lookup_counts[result] += 1
+
+
+def _get_cached(cache_key: str, label: str, prompt_args: Optional[Tuple] = None) -> Optional[Dict]:
+    """
+    Return a copy of one cached card variant marked as cached, or None on miss.
+
+    Args:
+        cache_key: Cache key for the request
+        label: Human-readable combination name for logging
+        prompt_args: _build_prompt arguments; when given, hits count towards
+            a background top-up of the key's variant pool and stale entries
+            are regenerated in the background
+    """
+    entry = _id_card_cache.get(cache_key)
+    if entry is None:
+        _count_lookup("misses")
+        return None
+    variants = _variants(entry)
+    age = time.time() - entry.get("created_at", time.time())
+    if CARD_TTL > 0 and age > CARD_TTL:
+        if age > CARD_TTL + CARD_MAX_STALENESS:
+            logger.info(f"Cached ID card for {label} is past max staleness, regenerating")
+            _count_lookup("misses")
+            return None
+        # Stale: serve it now and regenerate in the background
+        logger.info(f"Stale cache hit for {label}")
+        _count_lookup("stale_hits")
+        if prompt_args is not None:
+            _schedule_refill(cache_key, label, prompt_args, replace=True)
+    else:
+        logger.info(f"Cache hit for {label}")
+        _count_lookup("hits")
+        if prompt_args is not None:
+            _note_hit(cache_key, len(variants), label, prompt_args)
+    cached = _pick_variant(cache_key, variants).copy()
+    cached['cached'] = True
+    return cached
+
+
+def _parse_card(response: Optional[str], fields: Optional[Sequence[str]] = None) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Parse and validate a raw LLM response against the ID card schema in one pass.
+
+    Responses that are truncated or have invalid fields are salvaged: the
+    fields that validate are kept and the rest are reported as missing so
+    they can be repaired without regenerating the whole card.
+
+    Args:
+        response: Raw LLM response text
+        fields: Fields the response should contain (defaults to the whole card;
+            a repair response only has the missing ones)
+
+    Returns:
+        (card, missing_fields): card is None if nothing could be salvaged
+    """
+    fields = tuple(fields or CARD_FIELDS)
+    if not response:
+        logger.error("Empty response from LLM")
+        return None, list(fields)
+
+    text = response.strip()
+    # JSON mode returns bare JSON; tolerate markdown fences from providers without it
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+
+    if fields == CARD_FIELDS:
+        try:
+            return IDCardContent.model_validate_json(text).model_dump(), []
+        except ValidationError:
+            pass
+
     try:
+        partial = json.loads(text)
+    except json.JSONDecodeError:
+        # Truncated output: keep every field the incremental parser saw complete
+        partial = {}
+        for field, index, value in IncrementalCardParser().feed(text):
+            if index is None:
+                partial[field] = value
+            else:
+                partial.setdefault(field, []).append(value)
+    if not isinstance(partial, dict):
+        partial = {}
+
+    card = {}
+    for field in fields:
+        if field not in partial:
+            continue
+        try:
+            adapter = _FIELD_VALIDATORS[field]
+            card[field] = adapter.dump_python(adapter.validate_python(partial[field]), mode="json")
+        except ValidationError:
+            continue
+    missing = [field for field in fields if field not in card]
+    if not card:
+        logger.error("Failed to parse AI response as an ID card")
+        logger.debug(f"Raw response: {response}")
+        return None, missing
+    if missing:
+        logger.warning(f"AI response missing or invalid fields: {', '.join(missing)}")
+    return card, missing
+
+
+def _build_repair_prompt(label: str, card: Dict, missing: List[str]) -> str:
+    """Build a short prompt asking only for the missing fields of a partial card."""
+    formats = ",\n".join(f'  "{field}": {_FIELD_FORMATS[field]}' for field in missing)
+    return f"""You are finishing a Spirit Food ID card for: {label}
+
+Fields already written (match their tone, do not repeat them):
+{json.dumps(card, indent=2)}
+
+Return ONLY valid JSON with exactly these keys:
+{{
+{formats}
+}}"""
+
+
+def _merge_repair(card: Dict, missing: List[str], response: Optional[str]) -> Optional[Dict]:
+    """
+    Merge a repair response into a partial card.
+
+    Returns:
+        The complete card dict, or None if the repair did not supply every missing field
+    """
+    if not response:
+        return None
+    repaired, still_missing = _parse_card(response, fields=missing)
+    if repaired is None or still_missing:
+        logger.error("ID card repair did not return the missing fields")
+        return None
+    merged = dict(card)
+    merged.update({field: repaired[field] for field in missing})
+    return merged
+
+
+def _store_card(card: Optional[Dict], cache_key: str, label: str, use_cache: bool) -> Optional[Dict]:
+    """Mark a freshly generated card as uncached and store it."""
+    if card is None:
+        return None
+    result = dict(card)
+    result['cached'] = False
+
+    if use_cache:
+        try:
+            _id_card_cache.set(cache_key, {"variants": [result.copy()], "created_at": time.time()})
+            logger.info(f"Cached ID card for {label}")
+        except Exception as e:
+            logger.warning(f"Failed to cache ID card for {label}: {e}")
+
+    return result
+
+
+# Cache writes from the async paths run here: a SQLite write can wait up to its lock
+# timeout behind another writer (a second worker process, warm_cache), which must
+# hold up only the request that made it, not the event loop
+_cache_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="id-card-cache-write")
+
+
+async def _store_card_async(card: Optional[Dict], cache_key: str, label: str, use_cache: bool) -> Optional[Dict]:
+    """_store_card for coroutines: the cache write runs on the cache write thread."""
+    if card is None or not use_cache:
+        return _store_card(card, cache_key, label, use_cache)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cache_write_executor, _store_card, card, cache_key, label, use_cache)
+
+
+# Variant pools: up to VARIANT_POOL_SIZE cards per key, generated in the background
+# as the key gets hits, so popular combinations feel fresh without per-request LLM calls
+VARIANT_POOL_SIZE = max(1, int(os.getenv("ID_CARD_VARIANTS", "1")))
+VARIANT_SELECTION = os.getenv("ID_CARD_VARIANT_SELECTION", "random").lower()  # random | round_robin
+# Hits between background additions while a pool is filling
+VARIANT_TOPUP_HITS = max(1, int(os.getenv("ID_CARD_VARIANT_TOPUP_HITS", "5")))
+# Hits between replacing the oldest variant of a full pool (0 = never rotate)
+VARIANT_ROTATE_HITS = int(os.getenv("ID_CARD_VARIANT_ROTATE_HITS", "0"))
+
+# Stale-while-revalidate: cards older than CARD_TTL are served while regenerated in the
+# background; past CARD_TTL + CARD_MAX_STALENESS requests block on regeneration (0 TTL = never expire)
+CARD_TTL = float(os.getenv("ID_CARD_CACHE_TTL", "0"))
+CARD_MAX_STALENESS = float(os.getenv("ID_CARD_CACHE_MAX_STALENESS", "86400"))
+
+_variant_lock = threading.Lock()
+_variant_hits: Dict[str, int] = {}
+_variant_cursor: Dict[str, int] = {}
+_variant_refills: set = set()
+_variant_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ID_CARD_VARIANT_WORKERS", "2")),
+    thread_name_prefix="id-card-variants"
+)
+# Bound on tracked per-key counters; counts reset when exceeded
+_MAX_TRACKED_KEYS = 100_000
+
+
+def _variants(entry: Dict) -> List[Dict]:
+    """Cards in a cache entry; entries written before variant pools hold a single card."""
+    return entry["variants"] if "variants" in entry else [entry]
+
+
+def _pick_variant(cache_key: str, variants: List[Dict]) -> Dict:
+    """Choose the variant to serve, at random or round-robin per key."""
+    if len(variants) == 1:
+        return variants[0]
+    if VARIANT_SELECTION == "round_robin":
+        with _variant_lock:
+            if len(_variant_cursor) > _MAX_TRACKED_KEYS:
+                _variant_cursor.clear()
+            index = _variant_cursor.get(cache_key, 0)
+            _variant_cursor[cache_key] = index + 1
+        return variants[index % len(variants)]
+    return random.choice(variants)
+
+
+def _note_hit(cache_key: str, pool_size: int, label: str, prompt_args: Tuple):
+    """Count a cache hit and schedule a background top-up or rotation when the threshold is crossed."""
+    threshold = VARIANT_TOPUP_HITS if pool_size < VARIANT_POOL_SIZE else VARIANT_ROTATE_HITS
+    if threshold <= 0:
+        return
+    with _variant_lock:
+        if len(_variant_hits) > _MAX_TRACKED_KEYS:
+            _variant_hits.clear()
+        hits = _variant_hits.get(cache_key, 0) + 1
+        if hits < threshold:
+            _variant_hits[cache_key] = hits
+            return
+        _variant_hits.pop(cache_key, None)
+    _schedule_refill(cache_key, label, prompt_args)
+
+
+def _schedule_refill(cache_key: str, label: str, prompt_args: Tuple, replace: bool = False):
+    """Queue a background variant generation for a key unless one is already pending."""
+    with _variant_lock:
+        if cache_key in _variant_refills:
+            return
+        _variant_refills.add(cache_key)
+    _variant_executor.submit(_refill_variant, cache_key, label, prompt_args, replace)
+
+
+def _refill_variant(cache_key: str, label: str, prompt_args: Tuple, replace: bool = False):
+    """
+    Generate a variant for a key in the background.
+
+    Adds it to the pool (dropping the oldest if full), or with replace=True
+    starts a fresh pool with it, refreshing a stale entry.
+    """
+    try:
+        llm = get_portkey_llm()
+        entry = _id_card_cache.get(cache_key)
+        if entry is None or not llm.is_available():
+            return
+
+        prompt = _build_prompt(*prompt_args)
+        if not replace:
+            titles = ", ".join(card.get("title", "") for card in _variants(entry))
+            prompt += f"\n\nMake it clearly different from existing cards titled: {titles}"
         response = llm.analyze_text(
-            text=f"{alignment_adjective} {cuisine} {dish_type}",
+            text=label,
             prompt=prompt,
-            model="gpt-4o-mini",
+            model=ID_CARD_MODEL,
             max_tokens=1000,
-            temperature=0.8  # Higher for creativity
+            temperature=0.8,
+            priority="background",
+            response_format=JSON_RESPONSE_FORMAT
         )
+        card, missing = _parse_card(response)
+        if card is None or missing:
+            return
+        card['cached'] = False
+
+        if replace:
+            _id_card_cache.set(cache_key, {"variants": [card], "created_at": time.time()})
+            logger.info(f"Refreshed stale ID card for {label}")
+            return
+
+        # Re-read: the entry may have been replaced or evicted while generating
+        entry = _id_card_cache.get(cache_key)
+        if entry is None:
+            return
+        variants = (_variants(entry) + [card])[-VARIANT_POOL_SIZE:]
+        _id_card_cache.set(cache_key, {"variants": variants, "created_at": entry.get("created_at", time.time())})
+        logger.info(f"Added ID card variant for {label} ({len(variants)}/{VARIANT_POOL_SIZE})")
+    except Exception as e:
+        logger.error(f"ID card variant generation failed for {label}: {e}")
+    finally:
+        with _variant_lock:
+            _variant_refills.discard(cache_key)
+
+
+@traced("generate_id_card")
+def generate_id_card(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int,
+    use_cache: bool = True
+) -> Optional[Dict]:
+    """
+    Generate AI-powered ID card content.
+
+    Args:
+        dish_type: e.g., "Pho", "Burger"
+        cuisine: e.g., "Vietnamese", "American"
+        alignment_adjective: e.g., "Unhinged", "Classic"
+        time_axis: e.g., "Late Night", "Early Bird"
+        time_percent: 0-100
+        adventure_axis: e.g., "Adventurer", "Comfort Seeker"
+        adventure_percent: 0-100
+        use_cache: Whether to use cached responses
+
+    Returns:
+        Dict with title, strengths, weaknesses, quotes, hidden_talent, peer_reviews
+    """
+    label = f"{alignment_adjective} {cuisine} {dish_type}"
+
+    # Check cache first
+    cache_key = generate_cache_key(
+        dish_type, cuisine, alignment_adjective,
+        time_axis, time_percent, adventure_axis, adventure_percent
+    )
+    if use_cache:
+        cached = _get_cached(cache_key, label, (
+            dish_type, cuisine, alignment_adjective,
+            time_axis, time_percent, adventure_axis, adventure_percent
+        ))
+        if cached is not None:
+            return cached
 
-        if not response:
-            logger.error("Empty response from LLM")
+    def _generate() -> Optional[Dict]:
+        llm = get_portkey_llm()
+        if not llm.is_available():
+            logger.warning("Portkey LLM not available, returning None")
             return None
 
-        # Parse JSON response
-        # Handle potential markdown code blocks
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0]
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0]
+        prompt = _build_prompt(
+            dish_type, cuisine, alignment_adjective,
+            time_axis, time_percent, adventure_axis, adventure_percent
+        )
 
-        result = json.loads(response.strip())
-        result['cached'] = False
+        try:
+            response = llm.analyze_text(
+                text=label,
+                prompt=prompt,
+                model=ID_CARD_MODEL,
+                max_tokens=1000,
+                temperature=0.8,  # Higher for creativity
+                response_format=JSON_RESPONSE_FORMAT
+            )
+        except Exception as e:
+            logger.error(f"AI generation failed: {e}")
+            return None
 
-        # Cache the result
-        if use_cache:
-            _id_card_cache[cache_key] = result.copy()
-            logger.info(f"Cached ID card for {alignment_adjective} {cuisine} {dish_type}")
+        card, missing = _parse_card(response)
+        if card is not None and missing:
+            # Re-prompt for the missing fields only instead of discarding the card
+            card = _merge_repair(card, missing, llm.analyze_text(
+                text=label,
+                prompt=_build_repair_prompt(label, card, missing),
+                model=ID_CARD_MODEL,
+                max_tokens=REPAIR_MAX_TOKENS,
+                temperature=0.8,
+                response_format=JSON_RESPONSE_FORMAT
+            ))
+        return _store_card(card, cache_key, label, use_cache)
 
-        return result
+    if not use_cache:
+        return _generate()
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse AI response as JSON: {e}")
-        logger.debug(f"Raw response: {response}")
+    try:
+        result = _generation_flight.do(cache_key, _generate, timeout=GENERATION_TIMEOUT)
+    except TimeoutError:
+        logger.error(f"Timed out waiting for in-flight generation of {label}")
         return None
+    return result.copy() if result is not None else None
+
+
+async def _repair_card_async(llm, card: Dict, missing: List[str], label: str,
+                             priority: str = "interactive") -> Optional[Dict]:
+    """Re-prompt for the missing fields of a partial card through the shared LLM pool."""
+    try:
+        response = await get_pool("llm").run_async(
+            llm.analyze_text_async,
+            text=label,
+            prompt=_build_repair_prompt(label, card, missing),
+            model=ID_CARD_MODEL,
+            max_tokens=REPAIR_MAX_TOKENS,
+            temperature=0.8,
+            priority=priority,
+            response_format=JSON_RESPONSE_FORMAT
+        )
+    except Exception as e:
+        logger.error(f"ID card repair failed for {label}: {e}")
+        return None
+    return _merge_repair(card, missing, response)
+
+
+@traced("generate_id_card_async")
+async def generate_id_card_async(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int,
+    use_cache: bool = True,
+    priority: str = "interactive",
+    check_cache: bool = True
+) -> Optional[Dict]:
+    """
+    Generate AI-powered ID card content without blocking the event loop.
+
+    Same contract as generate_id_card, but awaits the LLM through the
+    shared AsyncPortkeyLLM client so many generations can run concurrently.
+    Concurrent cache misses for the same key wait on a single generation.
+    Background callers (warm-up, batches) pass priority="background" so
+    they queue behind interactive requests when the LLM rate limit is hit.
+    Callers that already missed the cache pass check_cache=False so the
+    miss is not looked up (and counted) twice; the result is still cached.
+
+    Returns:
+        Dict with title, strengths, weaknesses, quotes, hidden_talent, peer_reviews
+    """
+    label = f"{alignment_adjective} {cuisine} {dish_type}"
+
+    # Check cache first
+    cache_key = generate_cache_key(
+        dish_type, cuisine, alignment_adjective,
+        time_axis, time_percent, adventure_axis, adventure_percent
+    )
+    if use_cache and check_cache:
+        cached = _get_cached(cache_key, label, (
+            dish_type, cuisine, alignment_adjective,
+            time_axis, time_percent, adventure_axis, adventure_percent
+        ))
+        if cached is not None:
+            return cached
+
+    async def _generate() -> Optional[Dict]:
+        llm = get_async_portkey_llm()
+        if not llm.is_available():
+            logger.warning("Portkey LLM not available, returning None")
+            return None
+
+        prompt = _build_prompt(
+            dish_type, cuisine, alignment_adjective,
+            time_axis, time_percent, adventure_axis, adventure_percent
+        )
+
+        try:
+            # Bounded by the shared LLM pool: rejected fast when saturated, capped by its timeout
+            response = await get_pool("llm").run_async(
+                llm.analyze_text_async,
+                text=label,
+                prompt=prompt,
+                model=ID_CARD_MODEL,
+                max_tokens=1000,
+                temperature=0.8,  # Higher for creativity
+                priority=priority,
+                response_format=JSON_RESPONSE_FORMAT
+            )
+        except PoolSaturatedError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"AI generation timed out for {label}")
+            return None
+        except Exception as e:
+            logger.error(f"AI generation failed: {e}")
+            return None
+
+        card, missing = _parse_card(response)
+        if card is not None and missing:
+            card = await _repair_card_async(llm, card, missing, label, priority)
+        return await _store_card_async(card, cache_key, label, use_cache)
+
+    if not use_cache:
+        return await _generate()
+
+    try:
+        result = await _async_generation_flight.do(cache_key, _generate, timeout=GENERATION_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out waiting for in-flight generation of {label}")
+        return None
+    return result.copy() if result is not None else None
+
+
+@traced("generate_id_cards_batch_async")
+async def generate_id_cards_batch_async(
+    requests: List[Dict],
+    max_concurrency: int = 8,
+    priority: str = "background"
+) -> List[Optional[Dict]]:
+    """
+    Generate ID cards for many combinations at once.
+
+    Requests sharing a cache key are generated once; cache hits return
+    immediately and the remaining unique misses run concurrently, at most
+    `max_concurrency` at a time. A card that fails (pool saturated,
+    timeout) comes back as None without affecting the rest of the batch.
+
+    Args:
+        requests: Keyword arguments for generate_id_card_async, one dict per card
+        max_concurrency: Maximum generations in flight
+        priority: LLM rate-limit priority for the generations
+
+    Returns:
+        List of results (or None for failures) in the same order as requests
+    """
+    unique: Dict[str, Dict] = {}
+    keys = []
+    for request in requests:
+        key = _request_cache_key(request)
+        keys.append(key)
+        unique.setdefault(key, request)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _generate(request: Dict) -> Optional[Dict]:
+        label = f"{request['alignment_adjective']} {request['cuisine']} {request['dish_type']}"
+        cached = _get_cached(_request_cache_key(request), label, (
+            request["dish_type"], request["cuisine"], request["alignment_adjective"],
+            request["time_axis"], request["time_percent"],
+            request["adventure_axis"], request["adventure_percent"]
+        ))
+        if cached is not None:
+            return cached
+        try:
+            async with semaphore:
+                return await generate_id_card_async(**request, priority=priority, check_cache=False)
+        except Exception as e:
+            logger.error(f"Batch generation failed for {label}: {e}")
+            return None
+
+    results = await asyncio.gather(*(_generate(request) for request in unique.values()))
+    by_key = dict(zip(unique.keys(), results))
+    logger.info(f"Batch generated {len(requests)} ID cards ({len(unique)} unique)")
+    return [by_key[key].copy() if by_key[key] is not None else None for key in keys]
+
+
+# Top-level card fields in the order the prompt asks for them
+CARD_FIELDS = ("title", "strengths", "weaknesses", "quotes", "hidden_talent", "peer_reviews")
+
+# (field, index, value): index is the position within a list field, None for scalar fields
+CardEvent = Tuple[str, Optional[int], Any]
+
+
+class IncrementalCardParser:
+    """
+    Incremental JSON scanner that reports card fields as soon as they are complete.
+
+    Feed it raw LLM text chunks (markdown fences and leading chatter are
+    skipped); each call returns the events completed by that chunk: one per
+    scalar field and one per element of a list field.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._value_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._index = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> List[CardEvent]:
+        """Consume a chunk of text and return newly completed events."""
+        self.text += chunk
+        events: List[CardEvent] = []
+        text = self.text
+        while self._pos < len(text) and not self.done:
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    value = json.loads(text[self._string_start:i + 1])
+                    if depth == 1 and self._expect_key:
+                        self._key = value
+                    elif depth == 1:
+                        events.append((self._key, None, value))
+                    elif depth == 2 and self._stack[-1] == "[":
+                        events.append((self._key, self._index, value))
+                continue
+
+            if depth == 0:
+                if ch == "{":
+                    # Only an object that opens with a key (or is empty) is the card;
+                    # a "{" in leading chatter ("Here is your {card}:") is skipped
+                    following = text[i + 1:].lstrip()
+                    if not following:
+                        # Cannot tell yet: resume at this "{" once more text arrives
+                        self._pos = i
+                        break
+                    if following[0] in '"}':
+                        self._stack.append("{")
+                        self._expect_key = True
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if depth == 1 and ch == "[":
+                    self._index = 0
+                elif depth == 1 or (depth == 2 and self._stack[-1] == "["):
+                    self._value_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == 0:
+                    self.done = True
+                elif depth == 1 and ch == "}":
+                    events.append((self._key, None, json.loads(text[self._value_start:i + 1])))
+                elif depth == 2 and ch == "}" and self._stack[-1] == "[":
+                    events.append((self._key, self._index, json.loads(text[self._value_start:i + 1])))
+            elif ch == ":" and depth == 1:
+                self._expect_key = False
+            elif ch == ",":
+                if depth == 1:
+                    self._expect_key = True
+                elif depth == 2 and self._stack[-1] == "[":
+                    self._index += 1
+        return events
+
+
+def card_events(card: Dict) -> Iterator[CardEvent]:
+    """Replay a complete card as the same events the incremental parser emits."""
+    for field in CARD_FIELDS:
+        value = card.get(field)
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                yield (field, index, item)
+        elif value is not None:
+            yield (field, None, value)
+
+
+class _CardStream:
+    """
+    Field events of one in-flight streamed generation, fanned out to every follower.
+
+    The generation runs once as a shared task and publishes each completed
+    field here; followers replay the events published so far and then
+    receive new ones as they arrive.
+    """
+
+    def __init__(self):
+        self.events: List[CardEvent] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def publish(self, event: CardEvent):
+        self.events.append(event)
+        self._notify()
+
+    def close(self):
+        self.closed = True
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[CardEvent]:
+        """Yield every event from the first, until the generation finishes."""
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.closed:
+                return
+            await changed.wait()
+
+
+# Streamed generations in flight by cache key, so concurrent streams follow one upstream call
+_card_streams: Dict[str, _CardStream] = {}
+
+
+async def _stream_generation(llm, stream: _CardStream, prompt: str, cache_key: str,
+                             label: str, use_cache: bool) -> Optional[Dict]:
+    """Stream one card from the LLM, publishing fields as they complete, then repair and store it."""
+    parser = IncrementalCardParser()
+    try:
+        # Headers are already sent once streaming starts, so saturation falls back instead of 503
+        async with get_pool("llm").slot():
+            async for delta in llm.stream_text_async(
+                text=label,
+                prompt=prompt,
+                model=ID_CARD_MODEL,
+                max_tokens=1000,
+                temperature=0.8,  # Higher for creativity
+                response_format=JSON_RESPONSE_FORMAT
+            ):
+                for event in parser.feed(delta):
+                    stream.publish(event)
     except Exception as e:
-        logger.error(f"AI generation failed: {e}")
+        logger.error(f"AI streaming generation failed: {e}")
         return None
 
+    card, missing = _parse_card(parser.text)
+    if card is not None and missing:
+        card = await _repair_card_async(llm, card, missing, label)
+        if card is not None:
+            for event in card_events({field: card[field] for field in missing}):
+                stream.publish(event)
+    return await _store_card_async(card, cache_key, label, use_cache)
+
+
+@traced("stream_id_card_async")
+async def stream_id_card_async(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Generate an ID card, yielding each field as soon as the LLM completes it.
+
+    Cache hits are replayed instantly through the same events. Concurrent
+    requests for the same key share one generation with each other and with
+    generate_id_card_async: a stream joining a streamed generation follows
+    its events from the start, one joining a non-streamed generation gets
+    the finished card replayed. The generation is capped at
+    ID_CARD_GENERATION_TIMEOUT.
+
+    Yields:
+        ("field", CardEvent) for each completed field or list element, then
+        ("done", card_dict_or_None); None means generation failed and the
+        caller should fall back.
+    """
+    label = f"{alignment_adjective} {cuisine} {dish_type}"
+
+    cache_key = generate_cache_key(
+        dish_type, cuisine, alignment_adjective,
+        time_axis, time_percent, adventure_axis, adventure_percent
+    )
+    if use_cache:
+        cached = _get_cached(cache_key, label, (
+            dish_type, cuisine, alignment_adjective,
+            time_axis, time_percent, adventure_axis, adventure_percent
+        ))
+        if cached is not None:
+            for event in card_events(cached):
+                yield ("field", event)
+            yield ("done", cached)
+            return
+
+    llm = get_async_portkey_llm()
+    if not llm.is_available():
+        logger.warning("Portkey LLM not available, returning None")
+        yield ("done", None)
+        return
+
+    prompt = _build_prompt(
+        dish_type, cuisine, alignment_adjective,
+        time_axis, time_percent, adventure_axis, adventure_percent
+    )
+
+    own_stream = _CardStream()
+
+    async def _generate() -> Optional[Dict]:
+        try:
+            return await asyncio.wait_for(
+                _stream_generation(llm, own_stream, prompt, cache_key, label, use_cache),
+                GENERATION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"AI streaming generation timed out for {label}")
+            return None
+        finally:
+            own_stream.close()
+            if _card_streams.get(cache_key) is own_stream:
+                del _card_streams[cache_key]
+
+    def _start():
+        _card_streams[cache_key] = own_stream
+        return _generate()
+
+    if use_cache:
+        task = _async_generation_flight.start(cache_key, _start)
+        # None when the generation already in flight for this key is not streamed
+        stream = _card_streams.get(cache_key)
+    else:
+        task = asyncio.ensure_future(_generate())
+        stream = own_stream
+
+    if stream is not None:
+        async for event in stream.follow():
+            yield ("field", event)
+        card = await asyncio.shield(task)
+        yield ("done", card.copy() if card is not None else None)
+        return
+
+    try:
+        card = await asyncio.wait_for(asyncio.shield(task), GENERATION_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out waiting for in-flight generation of {label}")
+        card = None
+    if card is not None:
+        for event in card_events(card):
+            yield ("field", event)
+    yield ("done", card.copy() if card is not None else None)
+
+
+def is_cached(
+    dish_type: str,
+    cuisine: str,
+    alignment_adjective: str,
+    time_axis: str,
+    time_percent: int,
+    adventure_axis: str,
+    adventure_percent: int
+) -> bool:
+    """Check whether a card for this request is already cached."""
+    return generate_cache_key(
+        dish_type, cuisine, alignment_adjective,
+        time_axis, time_percent, adventure_axis, adventure_percent
+    ) in _id_card_cache
+
+
+def save_cache_snapshot(path: Union[str, Path]) -> int:
+    """
+    Persist the ID card cache to a JSON file (written atomically).
+
+    Args:
+        path: Destination file
+
+    Returns:
+        int: Number of cards written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot = dict(_id_card_cache.items())
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved {len(snapshot)} ID cards to {path}")
+    return len(snapshot)
+
+
+def load_cache_snapshot(path: Union[str, Path]) -> int:
+    """
+    Load cards from a JSON snapshot into the ID card cache.
+
+    Keys already present in the backend (e.g. a shared SQLite cache) are kept.
+
+    Args:
+        path: Snapshot file written by save_cache_snapshot
+
+    Returns:
+        int: Number of cards loaded (0 if the file does not exist)
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    with open(path) as f:
+        snapshot = json.load(f)
+    written_at = path.stat().st_mtime
+    for key, entry in snapshot.items():
+        if key not in _id_card_cache:
+            if "variants" not in entry:
+                entry = {"variants": [entry]}
+            # Snapshots from before TTL metadata are treated as written when the file was
+            entry.setdefault("created_at", written_at)
+            _id_card_cache.set(key, entry)
+    logger.info(f"Loaded {len(snapshot)} ID cards from {path}")
+    return len(snapshot)
+
+
+def get_cache_stats() -> dict:
+    """Size, hit/miss and eviction counters for the ID card cache, plus in-flight deduplication counts."""
+    with _lookup_counts_lock:
+        lookups = dict(_lookup_counts)
+    total = sum(lookups.values())
+    return {
+        **_id_card_cache.stats(),
+        **lookups,
+        "hit_ratio": round((lookups["hits"] + lookups["stale_hits"]) / total, 4) if total else 0.0,
+        "in_flight": _generation_flight.in_flight() + _async_generation_flight.in_flight(),
+        "coalesced": _generation_flight.coalesced + _async_generation_flight.coalesced,
+        "fidelity": CACHE_FIDELITY,
+        "variant_pool_size": VARIANT_POOL_SIZE,
+        "variant_refills_in_flight": len(_variant_refills),
+        "ttl": CARD_TTL,
+        "max_staleness": CARD_MAX_STALENESS,
+        "prompt_version": PROMPT_VERSION,
+    }
+
 
 def clear_cache():
     """Clear the ID card cache."""
-    global _id_card_cache
-    _id_card_cache = {}
+    _id_card_cache.clear()
     logger.info("ID card cache cleared")
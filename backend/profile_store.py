@@ -0,0 +1,270 @@
+"""
+Flavor Profile Store
+
+Local SQLite index of proddb.public.consumer_flavor_profiles keyed by
+normalized (lowercased) email prefix. Bulk-exported from Snowflake and kept
+fresh by incremental refreshes on updated_at, so profile lookups are a local
+primary-key read instead of a warehouse scan.
+
+Usage:
+    python profile_store.py            # incremental refresh
+    python profile_store.py --full     # rebuild from scratch
+    python profile_store.py --watch 900  # refresh every 15 minutes
+"""
+
+import calendar
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.snowflake_connection import SnowflakeHook
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STORE_PATH = Path(__file__).parent / "data" / "flavor_profiles.sqlite"
+
+PROFILE_COLUMNS = (
+    "email_prefix", "consumer_id", "flavor_profile_json",
+    "top_cuisines", "cuisine_confidence", "updated_at"
+)
+
+EXPORT_QUERY = """
+SELECT
+    LOWER(email_prefix) AS email_prefix,
+    consumer_id,
+    flavor_profile_json,
+    top_cuisines,
+    cuisine_confidence,
+    TO_VARCHAR(updated_at, 'YYYY-MM-DD HH24:MI:SS.FF6') AS updated_at
+FROM proddb.public.consumer_flavor_profiles
+WHERE email_prefix IS NOT NULL
+{incremental_filter}
+"""
+
+_REFRESH_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flavor_profiles (
+    email_prefix TEXT PRIMARY KEY,
+    consumer_id TEXT,
+    flavor_profile_json TEXT,
+    top_cuisines TEXT,
+    cuisine_confidence REAL,
+    updated_at TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+class FlavorProfileStore:
+    """
+    SQLite-backed local index of flavor profiles.
+
+    Reads use one connection per thread; refreshes run in a single
+    transaction, so readers keep seeing the previous snapshot (WAL mode)
+    until a refresh commits.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: SQLite file location (defaults to FLAVOR_PROFILE_STORE_PATH or data/flavor_profiles.sqlite)
+        """
+        self.path = Path(path or os.getenv("FLAVOR_PROFILE_STORE_PATH", DEFAULT_STORE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the store."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value FROM store_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def is_populated(self) -> bool:
+        """Whether at least one refresh from Snowflake has completed."""
+        return self._get_meta("last_refresh_at") is not None
+
+    def refresh_age(self) -> Optional[float]:
+        """Seconds since the last completed refresh (by any process), or None if never refreshed."""
+        last_refresh_at = self._get_meta("last_refresh_at")
+        if last_refresh_at is None:
+            return None
+        return time.time() - calendar.timegm(time.strptime(last_refresh_at, _REFRESH_TIME_FORMAT))
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Whether a refresh from Snowflake has completed within the last `max_age` seconds."""
+        age = self.refresh_age()
+        return age is not None and age <= max_age
+
+    def get(self, username: str) -> Optional[Dict]:
+        """
+        Look up a profile row by email prefix.
+
+        Args:
+            username: Email prefix (case-insensitive)
+
+        Returns:
+            Dict of raw profile columns, or None if not in the store
+        """
+        row = self._connection().execute(
+            "SELECT * FROM flavor_profiles WHERE email_prefix = ?", (username.lower(),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def upsert(self, row: Dict):
+        """Insert or replace a single profile row (e.g. after a Snowflake fallback hit)."""
+        record = dict(row)
+        record["email_prefix"] = str(record["email_prefix"]).lower()
+        conn = self._connection()
+        with conn:
+            self._upsert_many(conn, [record])
+
+    @staticmethod
+    def _upsert_many(conn: sqlite3.Connection, records):
+        conn.executemany(
+            f"INSERT OR REPLACE INTO flavor_profiles ({', '.join(PROFILE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in PROFILE_COLUMNS)})",
+            (tuple(record.get(col) for col in PROFILE_COLUMNS) for record in records)
+        )
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Pull profiles from Snowflake into the store.
+
+        An incremental refresh only fetches rows with updated_at newer than
+        the last one seen; a full refresh replaces the whole table. Results
+        are streamed in connector batches so memory stays bounded.
+
+        Args:
+            full: Rebuild the store instead of applying an incremental update
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._refresh_lock:
+            since = None if full else self._get_meta("max_updated_at")
+            incremental_filter = "AND updated_at > TO_TIMESTAMP(%(since)s)" if since else ""
+            query = EXPORT_QUERY.format(incremental_filter=incremental_filter)
+            params = {"since": since} if since else None
+
+            start = time.monotonic()
+            written = 0
+            max_updated_at = since
+            conn = self._connection()
+
+            with SnowflakeHook(use_pool=True) as hook:
+                with conn:
+                    if since is None:
+                        conn.execute("DELETE FROM flavor_profiles")
+                    for batch in hook.iter_pandas_batches(query, params):
+                        batch = batch.where(batch.notna(), None)
+                        records = batch.to_dict("records")
+                        self._upsert_many(conn, records)
+                        written += len(records)
+                        batch_max = batch["updated_at"].dropna().max() if len(batch) else None
+                        if batch_max and (max_updated_at is None or batch_max > max_updated_at):
+                            max_updated_at = batch_max
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                        [
+                            ("last_refresh_at", time.strftime(_REFRESH_TIME_FORMAT, time.gmtime())),
+                            ("max_updated_at", max_updated_at),
+                        ]
+                    )
+
+            logger.info(
+                f"{'Full' if since is None else 'Incremental'} flavor profile refresh wrote "
+                f"{written} rows in {time.monotonic() - start:.1f}s"
+            )
+            return written
+
+    def start_background_refresh(self, interval_seconds: float):
+        """
+        Refresh the store on a daemon thread every `interval_seconds`.
+
+        The first run is a full refresh if the store has never been populated.
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        def _loop():
+            while not self._stop_event.is_set():
+                try:
+                    self.refresh(full=not self.is_populated())
+                except Exception as e:
+                    logger.error(f"Background flavor profile refresh failed: {e}")
+                self._stop_event.wait(interval_seconds)
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=_loop, name="flavor-profile-refresh", daemon=True)
+        self._refresh_thread.start()
+        logger.info(f"Started flavor profile refresh every {interval_seconds}s")
+
+    def stop_background_refresh(self):
+        """Stop the background refresh thread, if running."""
+        self._stop_event.set()
+
+
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> FlavorProfileStore:
+    """
+    Get shared FlavorProfileStore instance (singleton pattern).
+
+    Returns:
+        FlavorProfileStore
+    """
+    global _store_instance
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = FlavorProfileStore()
+    return _store_instance
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh the local flavor profile store from Snowflake")
+    parser.add_argument("--full", action="store_true", help="Rebuild the store from scratch")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="Keep running and refresh incrementally every SECONDS")
+    args = parser.parse_args()
+
+    store = get_profile_store()
+    store.refresh(full=args.full or not store.is_populated())
+    while args.watch:
+        time.sleep(args.watch)
+        try:
+            store.refresh()
+        except Exception as e:
+            logger.error(f"Flavor profile refresh failed: {e}")
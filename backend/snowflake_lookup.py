@@ -2,20 +2,153 @@
 Snowflake Flavor Profile Lookup
 
 Queries Snowflake for user flavor profiles to personalize cuisine selection.
+Profiles are served from the local profile store while it is being kept
+fresh, falling back to a Snowflake point lookup on a miss. Results (including misses and
+errors) are cached in-process with separate TTLs; expired profiles are
+served stale while a background refresh runs, up to a max-staleness bound.
 """
 
+import copy
 import json
-from typing import Dict
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional
 
+from utils.cache import MISSING, SingleFlight, TTLCache
 from utils.snowflake_connection import SnowflakeHook
+from utils.tracing import traced
 from utils.logger import get_logger
+from profile_store import get_profile_store
 
 logger = get_logger(__name__)
 
+_profile_cache: Optional[TTLCache] = None
+_profile_flight = SingleFlight()
 
+# Background refreshes of stale entries, at most one queued per key
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _settings() -> Dict:
+    """
+    Cache settings, read on first use rather than at import so values from
+    config/.env apply however this module was imported.
+    """
+    return {
+        # TTLs in seconds for found profiles, "not found" results and lookup errors
+        "hit_ttl": float(os.getenv("FLAVOR_PROFILE_CACHE_HIT_TTL", "3600")),
+        "miss_ttl": float(os.getenv("FLAVOR_PROFILE_CACHE_MISS_TTL", "600")),
+        "error_ttl": float(os.getenv("FLAVOR_PROFILE_CACHE_ERROR_TTL", "30")),
+        # Seconds past its TTL that a profile (not an error) is still served while it is refreshed
+        "max_staleness": float(os.getenv("FLAVOR_PROFILE_CACHE_MAX_STALENESS", "3600")),
+        "max_entries": int(os.getenv("FLAVOR_PROFILE_CACHE_MAX_ENTRIES", "10000")),
+        "refresh_workers": int(os.getenv("FLAVOR_PROFILE_REFRESH_WORKERS", "2")),
+        # The local store is only trusted (and written through) if refreshed this recently
+        "store_max_age": float(os.getenv("FLAVOR_PROFILE_STORE_MAX_AGE", "3600")),
+    }
+
+
+def _get_profile_cache() -> TTLCache:
+    global _profile_cache
+    if _profile_cache is None:
+        with _init_lock:
+            if _profile_cache is None:
+                settings = _settings()
+                _profile_cache = TTLCache(max_entries=settings["max_entries"], default_ttl=settings["hit_ttl"])
+    return _profile_cache
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _init_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=_settings()["refresh_workers"],
+                    thread_name_prefix="profile-refresh"
+                )
+    return _refresh_executor
+
+
+def _not_found() -> Dict:
+    return {
+        "found": False,
+        "cuisine_preferences": [],
+        "top_cuisine": None,
+        "confidence": 0
+    }
+
+
+def _row_to_profile(row) -> Dict:
+    """Convert a flavor profile row (Snowflake or local store) to the API shape."""
+    # Parse JSON flavor profile
+    profile = json.loads(row.get('flavor_profile_json') or '{}')
+    cuisines_raw = row.get('top_cuisines', '')
+    cuisines = cuisines_raw.split(',') if cuisines_raw else []
+    cuisines = [c.strip() for c in cuisines if c.strip()]
+    confidence = float(row.get('cuisine_confidence') or 0)
+
+    return {
+        "found": True,
+        "cuisine_preferences": cuisines[:5],  # Top 5 cuisines
+        "top_cuisine": cuisines[0] if cuisines else None,
+        "confidence": confidence
+    }
+
+
+def _to_native(record: Dict) -> Dict:
+    """Convert numpy scalars/NaN from a pandas row into plain Python values."""
+    native = {}
+    for key, value in record.items():
+        if hasattr(value, "item"):
+            value = value.item()
+        native[key] = None if isinstance(value, float) and value != value else value
+    return native
+
+
+def _lookup_local(username: str):
+    """Return the profile from the local store, or None on miss, store error or a stale store."""
+    try:
+        store = get_profile_store()
+        if not store.is_fresh(_settings()["store_max_age"]):
+            return None
+        row = store.get(username)
+    except Exception as e:
+        logger.warning(f"Local flavor profile store unavailable: {e}")
+        return None
+    if row is None:
+        return None
+    logger.debug(f"Local store hit for {username}")
+    return _row_to_profile(row)
+
+
+def _write_through(username: str, row: Dict):
+    """
+    Copy a Snowflake hit into the local store while the store is being refreshed.
+
+    Incremental refreshes pick up later changes to the row. A store nothing
+    refreshes is never read, so nothing is written to it either.
+    """
+    try:
+        store = get_profile_store()
+        if store.is_fresh(_settings()["store_max_age"]):
+            store.upsert({"email_prefix": username, **_to_native(row)})
+    except Exception as e:
+        logger.warning(f"Failed to write flavor profile to local store: {e}")
+
+
+@traced("lookup_flavor_profile")
 def lookup_flavor_profile(email: str) -> Dict:
     """
-    Look up a user's flavor profile from Snowflake.
+    Look up a user's flavor profile, using the in-process cache when possible.
+
+    Concurrent lookups for the same user share a single underlying query.
 
     Args:
         email: User's email (e.g., "fiona.fan@doordash.com")
@@ -25,20 +158,125 @@ def lookup_flavor_profile(email: str) -> Dict:
     """
     # Extract username from email
     username = email.split('@')[0] if '@' in email else email
+    cache_key = username.lower()
+
+    cached, stale = _get_profile_cache().get_stale(cache_key)
+    if cached is MISSING:
+        cached = _profile_flight.do(cache_key, lambda: _lookup_and_cache(username, cache_key))
+    elif stale:
+        _schedule_refresh(username, cache_key)
+    return copy.deepcopy(cached)
+
+
+def get_cached_flavor_profile(email: str) -> Optional[Dict]:
+    """
+    Return the cached profile for this email without querying anything.
+
+    Cheap enough to call on the event loop before offloading a full lookup.
+    Misses are not counted here; the lookup that follows counts them.
+
+    Returns:
+        Profile dict, or None if not cached
+    """
+    username = email.split('@')[0] if '@' in email else email
+    cache_key = username.lower()
+    cached, stale = _get_profile_cache().get_stale(cache_key, count_miss=False)
+    if cached is MISSING:
+        return None
+    if stale:
+        _schedule_refresh(username, cache_key)
+    return copy.deepcopy(cached)
+
+
+def _lookup_and_cache(username: str, cache_key: str) -> Dict:
+    """Run the uncached lookup and cache the result with a TTL matching its outcome."""
+    result = _lookup_flavor_profile_uncached(username)
+    _cache_result(cache_key, result)
+    return result
+
+
+def _cache_result(cache_key: str, result: Dict):
+    settings = _settings()
+    if "error" in result:
+        # Errors are never served stale
+        _get_profile_cache().set(cache_key, result, ttl=settings["error_ttl"])
+        return
+    ttl = settings["hit_ttl"] if result["found"] else settings["miss_ttl"]
+    _get_profile_cache().set(cache_key, result, ttl=ttl, max_stale=settings["max_staleness"])
+
+
+def _schedule_refresh(username: str, cache_key: str):
+    """Queue a background refresh of a stale entry unless one is already pending."""
+    with _refreshing_lock:
+        if cache_key in _refreshing:
+            return
+        _refreshing.add(cache_key)
+    _get_refresh_executor().submit(_refresh, username, cache_key)
+
+
+def _refresh(username: str, cache_key: str):
+    """Refresh a stale entry, keeping the stale value if the lookup fails."""
+    try:
+        result = _profile_flight.do(cache_key, lambda: _lookup_flavor_profile_uncached(username, use_local=False))
+        if "error" in result:
+            logger.warning(f"Background refresh failed for {username}; serving stale profile")
+            return
+        _cache_result(cache_key, result)
+    except Exception as e:
+        logger.error(f"Background refresh failed for {username}: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(cache_key)
+
+
+def get_flavor_profile_cache_stats() -> Dict:
+    """Hit/miss/eviction counters for the flavor profile cache."""
+    return {
+        **_get_profile_cache().stats(),
+        "coalesced": _profile_flight.coalesced,
+        "refreshing": len(_refreshing),
+    }
+
+
+def clear_flavor_profile_cache():
+    """Clear the flavor profile cache."""
+    _get_profile_cache().clear()
+    logger.info("Flavor profile cache cleared")
+
+
+@traced("lookup_flavor_profile.uncached")
+def _lookup_flavor_profile_uncached(username: str, use_local: bool = True) -> Dict:
+    """
+    Look up a user's flavor profile from the local store, then Snowflake.
+
+    Args:
+        username: Email prefix (e.g., "fiona.fan")
+        use_local: Check the local store first; background refreshes of
+            stale cache entries pass False to go to Snowflake
+
+    Returns:
+        Dict with keys: found, cuisine_preferences, top_cuisine, confidence
+        (plus "error" if the lookup failed)
+    """
+    local = _lookup_local(username) if use_local else None
+    if local is not None:
+        return local
 
     query = """
     SELECT
         consumer_id,
         flavor_profile_json,
         top_cuisines,
-        cuisine_confidence
+        cuisine_confidence,
+        TO_VARCHAR(updated_at, 'YYYY-MM-DD HH24:MI:SS.FF6') AS updated_at
     FROM proddb.public.consumer_flavor_profiles
     WHERE LOWER(email_prefix) = LOWER(%(username)s)
     LIMIT 1
     """
 
     try:
-        with SnowflakeHook() as hook:
+        # Borrow a pooled connection so each lookup costs one query, not a login
+        with SnowflakeHook(use_pool=True) as hook:
             df = hook.fetch_pandas_all(query, params={"username": username})
             # Lowercase column names for consistent access
             df.columns = [c.lower() for c in df.columns]
@@ -46,12 +284,7 @@ def lookup_flavor_profile(email: str) -> Dict:
             if df.empty:
                 logger.info(f"No flavor profile found for {username}")
                 print(f"DEBUG: No profile found for username: {username}")
-                return {
-                    "found": False,
-                    "cuisine_preferences": [],
-                    "top_cuisine": None,
-                    "confidence": 0
-                }
+                return _not_found()
 
             row = df.iloc[0]
 
@@ -59,27 +292,14 @@ def lookup_flavor_profile(email: str) -> Dict:
             print(f"DEBUG: Retrieved profile for {username}:")
             print(f"DEBUG: Raw row data: {str(dict(row))[:1000]}")
 
-            # Parse JSON flavor profile
-            profile = json.loads(row.get('flavor_profile_json', '{}'))
-            cuisines_raw = row.get('top_cuisines', '')
-            cuisines = cuisines_raw.split(',') if cuisines_raw else []
-            cuisines = [c.strip() for c in cuisines if c.strip()]
-            confidence = float(row.get('cuisine_confidence', 0))
+            result = _row_to_profile(row)
+
+        # Write through so the next lookup is served locally
+        _write_through(username, dict(row))
 
-            return {
-                "found": True,
-                "cuisine_preferences": cuisines[:5],  # Top 5 cuisines
-                "top_cuisine": cuisines[0] if cuisines else None,
-                "confidence": confidence
-            }
+        return result
 
     except Exception as e:
         logger.error(f"Snowflake lookup failed: {e}")
-        print(f"DEBUG: Snowflake lookup FAILED for {email}: {str(e)[:500]}")
-        return {
-            "found": False,
-            "cuisine_preferences": [],
-            "top_cuisine": None,
-            "confidence": 0,
-            "error": str(e)
-        }
+        print(f"DEBUG: Snowflake lookup FAILED for {username}: {str(e)[:500]}")
+        return {**_not_found(), "error": str(e)}
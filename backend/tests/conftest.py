@@ -0,0 +1,85 @@
+"""
+Shared test setup: import path, isolated settings and fake dependencies.
+
+Run from backend/:
+    python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read at import time, so they are pinned before any backend module
+# loads; config/.env never overrides variables that are already set
+_workdir = Path(tempfile.mkdtemp(prefix="spirit-tests-"))
+os.environ.update({
+    "SNOWFLAKE_USER": "test",
+    "SNOWFLAKE_PASSWORD": "test",
+    "PORTKEY_API_KEY": "test",
+    "PORTKEY_OPENAI_VIRTUAL_KEY": "test",
+    "PORTKEY_RPM": "0",
+    "PORTKEY_TPM": "0",
+    "PORTKEY_MAX_RETRIES": "0",
+    "ID_CARD_CACHE_BACKEND": "memory",
+    "ID_CARD_CACHE_FIDELITY": "combination",
+    "ID_CARD_VARIANTS": "1",
+    "ID_CARD_CACHE_TTL": "0",
+    "ID_CARD_WARM_ON_STARTUP": "false",
+    "ID_CARD_CACHE_SNAPSHOT": str(_workdir / "id_card_snapshot.json"),
+    "FLAVOR_PROFILE_STORE_PATH": str(_workdir / "flavor_profiles.sqlite"),
+    "FLAVOR_PROFILE_REFRESH_SECONDS": "0",
+    "TRACING_EXPORTER": "none",
+})
+
+
+@pytest.fixture(scope="session")
+def fake_llm_server():
+    """One fake OpenAI-compatible gateway for the whole session."""
+    from benchmarks.fake_llm_server import FakeLLMServer
+
+    server = FakeLLMServer(latency=0.2, stream_chunks=20).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_llm(fake_llm_server, monkeypatch):
+    """
+    Point the Portkey clients at the fake gateway with fresh per-test state.
+
+    Clients are recreated so none is bound to a previous test's event loop,
+    and the circuit breaker and ID card cache start empty.
+    """
+    import id_generator
+    from utils import portkey_llm
+
+    monkeypatch.setenv("PORTKEY_BASE_URL", fake_llm_server.base_url)
+    monkeypatch.setattr(portkey_llm, "_portkey_instance", None)
+    monkeypatch.setattr(portkey_llm, "_async_portkey_instance", None)
+    monkeypatch.setattr(portkey_llm, "_circuit_breaker", portkey_llm.CircuitBreaker())
+    fake_llm_server.latency = 0.2
+    fake_llm_server.error_rate = 0.0
+    fake_llm_server.counters.update(requests=0, errors=0, streamed=0)
+    id_generator.clear_cache()
+    yield fake_llm_server
+    id_generator.clear_cache()
+
+
+@pytest.fixture
+def card_request():
+    """Keyword arguments for one ID card combination."""
+    return dict(
+        dish_type="Ramen",
+        cuisine="Japanese",
+        alignment_adjective="Bold",
+        time_axis="Early Bird",
+        time_percent=60,
+        adventure_axis="Adventurer",
+        adventure_percent=70,
+    )
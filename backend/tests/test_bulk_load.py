@@ -0,0 +1,107 @@
+"""Tests for SnowflakeHook.bulk_load statement generation."""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from utils.snowflake_connection import SnowflakeHook
+
+
+class RecordingCursor:
+    def __init__(self, statements):
+        self._statements = statements
+
+    def execute(self, query, params=None):
+        self._statements.append(query)
+        return self
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.puts = []
+
+    def cursor(self):
+        return RecordingCursor(self.puts)
+
+
+@pytest.fixture
+def hook(monkeypatch):
+    """A hook with a fake connection that records every statement instead of running it."""
+    hook = SnowflakeHook(database="DB", schema="SCH", create_local_spark=False)
+    hook.conn = RecordingConnection()
+    hook.statements = []
+    monkeypatch.setattr(hook, "query_without_result", hook.statements.append)
+    return hook
+
+
+def test_merge_sql_upserts_non_key_columns():
+    sql = SnowflakeHook._merge_sql("DB.SCH.T", "DB.SCH.S", ["ID", "REGION", "NAME", "SCORE"], ["id", "region"])
+    assert sql == (
+        "MERGE INTO DB.SCH.T t USING DB.SCH.S s ON t.id = s.id AND t.region = s.region "
+        "WHEN MATCHED THEN UPDATE SET t.NAME = s.NAME, t.SCORE = s.SCORE "
+        "WHEN NOT MATCHED THEN INSERT (ID, REGION, NAME, SCORE) VALUES (s.ID, s.REGION, s.NAME, s.SCORE)"
+    )
+
+
+def test_merge_sql_with_only_key_columns_skips_the_update():
+    sql = SnowflakeHook._merge_sql("T", "S", ["ID"], ["ID"])
+    assert "WHEN MATCHED" not in sql
+    assert sql.endswith("WHEN NOT MATCHED THEN INSERT (ID) VALUES (s.ID)")
+
+
+def test_merge_sql_rejects_keys_missing_from_the_data():
+    with pytest.raises(ValueError, match="region"):
+        SnowflakeHook._merge_sql("T", "S", ["ID", "NAME"], ["ID", "REGION"])
+
+
+def test_qualified_names(hook):
+    assert hook._qualified("CARDS") == "DB.SCH.CARDS"
+    assert hook._qualified("OTHER.SCHEMA.CARDS") == "OTHER.SCHEMA.CARDS"
+
+
+def test_merge_loads_through_a_staging_table(hook):
+    frames = [pd.DataFrame({"ID": [1, 2, 3], "NAME": list("abc")}), pd.DataFrame({"ID": [4], "NAME": ["d"]})]
+    stats = hook.bulk_load(iter(frames), "CARDS", mode="merge", merge_keys=["ID"], chunk_size=2)
+
+    assert stats["rows"] == 4
+    assert stats["files"] == 3
+    assert len(hook.conn.puts) == 3
+    kinds = [statement.split(" ", 2)[:2] for statement in hook.statements]
+    assert kinds == [
+        ["CREATE", "TEMPORARY"],  # stage
+        ["CREATE", "TEMPORARY"],  # staging table
+        ["COPY", "INTO"],
+        ["MERGE", "INTO"],
+        ["DROP", "TABLE"],
+        ["DROP", "STAGE"],
+    ]
+    staging = hook.statements[1].split()[3]
+    assert hook.statements[1].endswith("LIKE DB.SCH.CARDS")
+    assert hook.statements[2].startswith(f"COPY INTO {staging} FROM @")
+    assert hook.statements[3].startswith(f"MERGE INTO DB.SCH.CARDS t USING {staging} s ON t.ID = s.ID")
+
+
+def test_overwrite_truncates_then_copies(hook):
+    hook.bulk_load(pd.DataFrame({"ID": [1]}), "CARDS", mode="overwrite")
+    assert hook.statements[1] == "TRUNCATE TABLE IF EXISTS DB.SCH.CARDS"
+    assert hook.statements[2].startswith("COPY INTO DB.SCH.CARDS FROM @")
+    assert hook.statements[-1].startswith("DROP STAGE IF EXISTS")
+
+
+def test_stage_is_dropped_when_the_load_fails(hook):
+    frames = [pd.DataFrame({"ID": [1]}), pd.DataFrame({"OTHER": [2]})]
+    with pytest.raises(ValueError, match="do not match"):
+        hook.bulk_load(frames, "CARDS")
+    assert hook.statements[-1].startswith("DROP STAGE IF EXISTS")
+    assert not any(statement.startswith("COPY") for statement in hook.statements)
+
+
+@pytest.mark.parametrize("kwargs", [dict(mode="upsert"), dict(mode="merge")])
+def test_invalid_modes(hook, kwargs):
+    with pytest.raises(ValueError):
+        hook.bulk_load(pd.DataFrame({"ID": [1]}), "CARDS", **kwargs)
+    assert hook.statements == []
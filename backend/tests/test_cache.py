@@ -0,0 +1,177 @@
+"""Tests for TTLCache, SingleFlight and AsyncSingleFlight."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import MISSING, AsyncSingleFlight, SingleFlight, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module only."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_ttl_cache_hit_then_expiry(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.value += 10
+    assert cache.get("a") is MISSING
+    assert cache.get("a", default=None) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expirations"] == 1
+    assert stats["size"] == 0
+
+
+def test_ttl_cache_per_entry_ttl(clock):
+    cache = TTLCache(default_ttl=100)
+    cache.set("short", "s", ttl=1)
+    cache.set("long", "l")
+    clock.value += 5
+    assert cache.get("short") is MISSING
+    assert cache.get("long") == "l"
+
+
+def test_get_stale_serves_within_staleness_bound(clock):
+    cache = TTLCache()
+    cache.set("a", "value", ttl=10, max_stale=20)
+
+    assert cache.get_stale("a") == ("value", False)
+    clock.value += 15
+    assert cache.get_stale("a") == ("value", True)
+    # get() never serves stale values
+    assert cache.get("a") is MISSING
+    clock.value += 15
+    assert cache.get_stale("a") == (MISSING, False)
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_get_stale_can_skip_miss_count():
+    cache = TTLCache()
+    assert cache.get_stale("absent", count_miss=False) == (MISSING, False)
+    assert cache.stats()["misses"] == 0
+    cache.get_stale("absent")
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cached_none_is_distinct_from_missing():
+    cache = TTLCache()
+    cache.set("none", None)
+    assert cache.get("none") is None
+    assert cache.get("absent") is MISSING
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", work))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Let every follower join the leader's call before it finishes
+    deadline = time.monotonic() + 5
+    while flight.coalesced < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["result"] * 8
+    assert flight.coalesced == 7
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_shares_exceptions_and_forgets_key():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    # A finished call is not cached: the next call runs again
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_async_single_flight_coalesces():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        return calls, results, flight
+
+    calls, results, flight = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+    assert flight.coalesced == 4
+    assert flight.in_flight() == 0
+
+
+def test_async_single_flight_timeout_does_not_cancel_shared_task():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.1)
+            return "done"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", work, timeout=0.01)
+        # The task keeps running for callers with more patience
+        return await flight.do("key", work, timeout=1)
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_async_single_flight_start_returns_shared_task():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return 42
+
+        first = flight.start("key", work)
+        second = flight.start("key", work)
+        assert first is second
+        assert await flight.do("key", work) == 42
+        return flight.coalesced
+
+    assert asyncio.run(scenario()) == 2
@@ -0,0 +1,116 @@
+"""Tests for ID card response parsing: the incremental parser and _parse_card."""
+
+import json
+
+import pytest
+
+from id_generator import CARD_FIELDS, IncrementalCardParser, _parse_card, card_events
+
+CARD = {
+    "title": "The Broth Whisperer",
+    "strengths": ["Finds the best \"hidden\" spots", "Orders for the table", "Never skips dessert"],
+    "weaknesses": ["Judges menus by font", "Late to every reservation", "Hoards hot sauce"],
+    "quotes": ["Extra chashu, please.", "Is it spicy? Good."],
+    "hidden_talent": "Smells a good tonkotsu from a block away",
+    "peer_reviews": [
+        {"text": "Always knows where to go.", "reviewer": "Best friend"},
+        {"text": "Made me wait in line for ramen {twice}.", "reviewer": "Coworker"},
+        {"text": "Ten out of ten.", "reviewer": "Mom"},
+    ],
+}
+RAW = json.dumps(CARD, indent=2)
+
+
+def feed_all(chunks):
+    parser = IncrementalCardParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+def test_emits_every_field_and_list_element_in_order():
+    parser, events = feed_all([RAW])
+    assert events == list(card_events(CARD))
+    assert parser.done
+
+
+def test_character_by_character_chunks_match_a_single_chunk():
+    _, events = feed_all(RAW)
+    assert events == list(card_events(CARD))
+
+
+def test_events_arrive_as_soon_as_each_value_closes():
+    parser = IncrementalCardParser()
+    title_end = RAW.index('"The Broth Whisperer"') + len('"The Broth Whisperer"')
+    assert parser.feed(RAW[:title_end - 1]) == []
+    assert parser.feed(RAW[title_end - 1:title_end]) == [("title", None, "The Broth Whisperer")]
+
+
+def test_skips_markdown_fences():
+    _, events = feed_all(["```json\n", RAW, "\n```"])
+    assert events == list(card_events(CARD))
+
+
+@pytest.mark.parametrize("preamble", [
+    "Here is your {card}:\n",
+    "Sure! {Ramen} lover coming up {\n",
+    'He said "{hi}" so here it is: ',
+])
+def test_skips_braces_in_leading_chatter(preamble):
+    parser, events = feed_all([preamble, RAW])
+    assert events == list(card_events(CARD))
+    assert parser.done
+
+
+def test_brace_at_chunk_boundary_waits_for_more_text():
+    # The "{" that opens the card arrives alone; the parser cannot classify it yet
+    _, events = feed_all(["Your card: {", RAW[1:]])
+    assert events == list(card_events(CARD))
+    _, events = feed_all(["Your {", "card}: ", RAW])
+    assert events == list(card_events(CARD))
+
+
+def test_truncated_response_reports_only_completed_values():
+    cut = RAW.index("Late to every")
+    _, events = feed_all([RAW[:cut]])
+    assert events == [
+        ("title", None, CARD["title"]),
+        *[("strengths", i, s) for i, s in enumerate(CARD["strengths"])],
+        ("weaknesses", 0, CARD["weaknesses"][0]),
+    ]
+
+
+def test_nested_objects_are_reported_whole():
+    _, events = feed_all([RAW])
+    reviews = [(index, value) for field, index, value in events if field == "peer_reviews"]
+    assert reviews == list(enumerate(CARD["peer_reviews"]))
+
+
+def test_parse_card_accepts_a_complete_card():
+    assert _parse_card(RAW) == (CARD, [])
+    assert _parse_card(f"```json\n{RAW}\n```") == (CARD, [])
+
+
+def test_parse_card_salvages_a_truncated_card():
+    cut = RAW.index('"quotes"')
+    card, missing = _parse_card(RAW[:cut])
+    assert card == {key: CARD[key] for key in ("title", "strengths", "weaknesses")}
+    assert missing == ["quotes", "hidden_talent", "peer_reviews"]
+
+
+def test_parse_card_drops_invalid_fields():
+    broken = dict(CARD, strengths=[], title="")
+    card, missing = _parse_card(json.dumps(broken))
+    assert missing == ["title", "strengths"]
+    assert set(card) == set(CARD_FIELDS) - {"title", "strengths"}
+
+
+def test_parse_card_with_a_field_subset():
+    repair = json.dumps({"quotes": CARD["quotes"], "title": "ignored"})
+    assert _parse_card(repair, fields=["quotes"]) == ({"quotes": CARD["quotes"]}, [])
+
+
+@pytest.mark.parametrize("response", [None, "", "no json here", "[1, 2, 3]"])
+def test_parse_card_without_anything_to_salvage(response):
+    assert _parse_card(response) == (None, list(CARD_FIELDS))
@@ -0,0 +1,177 @@
+"""Tests for the LLM circuit breaker and the retry/resilience wrapper."""
+
+import asyncio
+import logging
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import openai
+import pytest
+
+from utils import portkey_llm
+from utils.portkey_llm import (
+    CircuitBreaker,
+    CircuitOpenError,
+    _acall_with_resilience,
+    _call_with_resilience,
+    _retry_after_seconds,
+    _retry_delay,
+)
+
+logger = logging.getLogger(__name__)
+RECOVERY = 0.02
+
+
+def api_error(status: int, headers: dict = None) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://gateway.test/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers=headers or {})
+    error_class = {400: openai.BadRequestError, 429: openai.RateLimitError}.get(status, openai.InternalServerError)
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """A fresh shared breaker that opens after two failures and recovers quickly."""
+    fresh = CircuitBreaker(failure_threshold=2, recovery_seconds=RECOVERY)
+    monkeypatch.setattr(portkey_llm, "_circuit_breaker", fresh)
+    monkeypatch.setattr(portkey_llm, "RETRY_BASE_DELAY", 0.001)
+    monkeypatch.setattr(portkey_llm, "MAX_RETRIES", 2)
+    return fresh
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures_and_rejects(breaker):
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    stats = breaker.stats()
+    assert stats["opened"] == 1
+    assert stats["rejected"] == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_admits_one_trial_then_closes_on_success(breaker):
+    open_breaker(breaker)
+    time.sleep(RECOVERY * 1.5)
+    assert breaker.state == "half_open"
+
+    breaker.before_call()
+    # Only one trial at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(breaker):
+    open_breaker(breaker)
+    time.sleep(RECOVERY * 1.5)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker._state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["opened"] == 2
+
+
+def test_abandoned_trial_frees_the_slot_without_closing(breaker):
+    open_breaker(breaker)
+    time.sleep(RECOVERY * 1.5)
+    breaker.before_call()
+    breaker.abandon_call()
+    assert breaker.state == "half_open"
+    # The next caller gets the trial
+    breaker.before_call()
+
+
+def test_retries_retryable_errors_then_succeeds(breaker):
+    attempts = []
+
+    def create(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise api_error(503)
+        return "response"
+
+    assert _call_with_resilience(create, logger, model="m", messages=[]) == "response"
+    assert len(attempts) == 3
+    assert breaker.state == "closed"
+
+
+def test_exhausted_retries_count_as_one_failure(breaker):
+    def create(**kwargs):
+        raise api_error(503)
+
+    with pytest.raises(openai.InternalServerError):
+        _call_with_resilience(create, logger, model="m", messages=[])
+    assert breaker.stats()["consecutive_failures"] == 1
+
+
+def test_client_errors_are_neutral_in_half_open_state(breaker):
+    open_breaker(breaker)
+    time.sleep(RECOVERY * 1.5)
+    calls = []
+
+    def create(**kwargs):
+        calls.append(1)
+        raise api_error(400)
+
+    with pytest.raises(openai.BadRequestError):
+        _call_with_resilience(create, logger, model="m", messages=[])
+    # Not retried, not treated as proof of health, and the trial slot is free again
+    assert len(calls) == 1
+    assert breaker.state == "half_open"
+    breaker.before_call()
+
+
+def test_cancelled_async_trial_releases_the_slot(breaker):
+    open_breaker(breaker)
+    time.sleep(RECOVERY * 1.5)
+
+    async def create(**kwargs):
+        await asyncio.sleep(10)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(_acall_with_resilience(create, logger, model="m", messages=[]), 0.05)
+
+    asyncio.run(scenario())
+    assert not breaker._trial_in_flight
+    assert breaker.state == "half_open"
+
+
+def test_retry_after_header_formats():
+    assert _retry_after_seconds(api_error(429, {"retry-after": "2"})) == 2.0
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < _retry_after_seconds(api_error(429, {"retry-after": http_date})) <= 30
+    assert _retry_after_seconds(api_error(429)) is None
+
+
+@pytest.mark.parametrize("value", ["Tue, 99 Foo 2026 xx:yy", "soon", "  "])
+def test_malformed_retry_after_falls_back_to_backoff(value):
+    error = api_error(429, {"retry-after": value})
+    assert _retry_after_seconds(error) is None
+    delay = _retry_delay(1, error)
+    assert delay is not None and 0 <= delay <= portkey_llm.RETRY_MAX_DELAY
+
+
+def test_retry_after_longer_than_max_delay_gives_up():
+    error = api_error(429, {"retry-after": str(portkey_llm.RETRY_MAX_DELAY + 60)})
+    assert _retry_delay(1, error) is None
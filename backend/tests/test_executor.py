@@ -0,0 +1,111 @@
+"""Tests for DependencyPool admission control and timeouts."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.executor import DependencyPool, PoolSaturatedError
+
+
+def test_run_offloads_blocking_calls():
+    pool = DependencyPool("test", max_workers=2, max_queue=0, timeout=1)
+    caller = threading.get_ident()
+
+    async def scenario():
+        return await pool.run(threading.get_ident)
+
+    try:
+        assert asyncio.run(scenario()) != caller
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_run_rejects_beyond_workers_plus_queue():
+    pool = DependencyPool("test", max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        admitted = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait, 5)
+        release.set()
+        await asyncio.gather(*admitted)
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+        assert stats["active"] == 1
+        assert stats["queued"] == 1
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_timed_out_call_keeps_its_slot_until_it_returns():
+    pool = DependencyPool("test", max_workers=1, max_queue=0, timeout=0.05)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(release.wait, 5)
+        # The abandoned call is still running, so the pool is still full
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(time.time)
+        release.set()
+        await asyncio.sleep(0.05)
+        return await pool.run(lambda: "free again")
+
+    try:
+        assert asyncio.run(scenario()) == "free again"
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_run_async_bounds_concurrency_and_times_out():
+    pool = DependencyPool("test", max_workers=2, max_queue=10, timeout=1)
+    running = 0
+    peak = 0
+
+    async def work(delay):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(delay)
+        running -= 1
+        return delay
+
+    async def scenario():
+        results = await asyncio.gather(*(pool.run_async(work, 0.02) for _ in range(6)))
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run_async(work, 1, timeout=0.02)
+        return results
+
+    assert asyncio.run(scenario()) == [0.02] * 6
+    assert peak == 2
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
+
+
+def test_slot_rejects_when_saturated():
+    pool = DependencyPool("test", max_workers=1, max_queue=0, timeout=None)
+
+    async def scenario():
+        async with pool.slot():
+            assert pool.stats()["active"] == 1
+            with pytest.raises(PoolSaturatedError):
+                async with pool.slot():
+                    pass
+        async with pool.slot():
+            pass
+
+    asyncio.run(scenario())
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == 2
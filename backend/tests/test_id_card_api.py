@@ -0,0 +1,102 @@
+"""Integration tests for ID card generation against the fake LLM gateway."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import id_generator
+from id_generator import CARD_FIELDS, generate_cache_key, generate_id_card_async, stream_id_card_async
+
+
+def collect(stream):
+    async def drain():
+        return [item async for item in stream]
+    return drain()
+
+
+def test_concurrent_misses_share_one_generation(fake_llm, card_request):
+    async def scenario():
+        return await asyncio.gather(*(generate_id_card_async(**card_request) for _ in range(5)))
+
+    cards = asyncio.run(scenario())
+    assert fake_llm.counters["requests"] == 1
+    assert all(card is not None and set(CARD_FIELDS) <= set(card) for card in cards)
+    # Served from the cache afterwards
+    assert asyncio.run(generate_id_card_async(**card_request))["cached"] is True
+    assert fake_llm.counters["requests"] == 1
+
+
+def test_streams_and_requests_for_one_key_share_one_generation(fake_llm, card_request):
+    async def scenario():
+        streams = [asyncio.ensure_future(collect(stream_id_card_async(**card_request))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        card = await generate_id_card_async(**card_request)
+        return card, await asyncio.gather(*streams)
+
+    card, streams = asyncio.run(scenario())
+    assert fake_llm.counters["requests"] == 1
+    for items in streams:
+        kind, final = items[-1]
+        assert kind == "done"
+        assert {key: final[key] for key in CARD_FIELDS} == {key: card[key] for key in CARD_FIELDS}
+        fields = [payload for kind, payload in items if kind == "field"]
+        assert fields == list(id_generator.card_events(final))
+
+
+def test_failed_generation_is_not_cached(fake_llm, card_request):
+    async def scenario():
+        fake_llm.error_rate = 1.0
+        assert await generate_id_card_async(**card_request) is None
+        fake_llm.error_rate = 0.0
+        return await generate_id_card_async(**card_request)
+
+    assert asyncio.run(scenario())["cached"] is False
+    assert fake_llm.counters["requests"] == 2
+
+
+@pytest.fixture
+def client(fake_llm):
+    from app import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_generate_endpoint_returns_a_generated_card(client, fake_llm, card_request):
+    response = client.post("/api/generate-id-card", json=card_request)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cached"] is False
+    assert body["title"] and body["peer_reviews"]
+    assert fake_llm.counters["requests"] == 1
+
+
+def test_generate_endpoint_falls_back_on_an_incomplete_cached_card(client, fake_llm, card_request):
+    stale = {"title": "Old card", "strengths": [], "weaknesses": [], "quotes": [],
+             "hidden_talent": "", "peer_reviews": []}
+    id_generator._id_card_cache.set(generate_cache_key(**card_request),
+                                    {"variants": [stale], "created_at": time.time()})
+
+    response = client.post("/api/generate-id-card", json=card_request)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] != "Old card"
+    assert body["strengths"] and body["peer_reviews"]
+    assert fake_llm.counters["requests"] == 0
+
+
+def test_stream_endpoint_emits_fields_then_done(client, card_request):
+    with client.stream("POST", "/api/generate-id-card/stream", json=card_request) as response:
+        assert response.status_code == 200
+        frames = [frame for frame in response.read().decode().split("\n\n") if frame]
+
+    events = [(frame.split("\n")[0][len("event: "):], json.loads(frame.split("\n")[1][len("data: "):]))
+              for frame in frames]
+    assert events[0][0] == "title"
+    kind, card = events[-1]
+    assert kind == "done"
+    assert [(name, data["index"], data["value"]) for name, data in events[:-1]] == \
+        list(id_generator.card_events(card))
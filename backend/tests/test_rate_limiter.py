@@ -0,0 +1,134 @@
+"""Tests for the LLM token-bucket rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.rate_limiter import RateLimitTimeout, TokenBucketRateLimiter, estimate_tokens
+
+# 100 tokens per second: draining the bucket and waiting for 5 tokens takes 0.05s
+TPM = 6000
+
+
+def drained_limiter(**kwargs) -> TokenBucketRateLimiter:
+    limiter = TokenBucketRateLimiter(requests_per_minute=float("inf"), tokens_per_minute=TPM, **kwargs)
+    limiter.acquire(TPM, timeout=1)
+    return limiter
+
+
+def test_estimate_tokens_counts_text_images_and_completion_budget():
+    messages = [
+        {"role": "system", "content": "x" * 400},
+        {"role": "user", "content": [
+            {"type": "text", "text": "y" * 40},
+            {"type": "image_url", "image_url": {"url": "data:..."}},
+        ]},
+    ]
+    assert estimate_tokens(messages, max_tokens=50) == 100 + 10 + 1000 + 50
+
+
+def test_acquire_is_immediate_with_capacity():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, tokens_per_minute=TPM)
+    start = time.monotonic()
+    limiter.acquire(100, timeout=1)
+    assert time.monotonic() - start < 0.05
+    assert limiter.stats()["granted"] == 1
+    assert limiter.stats()["waited"] == 0
+
+
+def test_interactive_callers_go_before_background_and_fifo_within_priority():
+    async def scenario():
+        limiter = drained_limiter()
+        order = []
+
+        async def caller(name, priority):
+            await limiter.acquire_async(5, priority=priority, timeout=5)
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(caller(f"background-{i}", "background")) for i in range(3)]
+        # The background callers queue first (and one reaches the head) before interactive ones arrive
+        await asyncio.sleep(0.01)
+        tasks += [asyncio.ensure_future(caller(f"interactive-{i}", "interactive")) for i in range(3)]
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == [
+        "interactive-0", "interactive-1", "interactive-2",
+        "background-0", "background-1", "background-2",
+    ]
+
+
+def test_timeout_raises_and_leaves_the_queue():
+    async def scenario():
+        limiter = drained_limiter()
+        # Needs the whole bucket again: one minute away
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire_async(TPM, timeout=0.05)
+        # The timed-out ticket no longer blocks the head of the queue
+        await limiter.acquire_async(5, timeout=1)
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1
+    assert stats["queued"] == 0
+
+
+def test_sync_acquire_timeout():
+    limiter = drained_limiter()
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(TPM, timeout=0.05)
+    assert limiter.stats()["queued"] == 0
+
+
+def test_refund_wakes_the_waiting_head():
+    async def scenario():
+        limiter = drained_limiter()
+
+        async def refund_later():
+            await asyncio.sleep(0.02)
+            limiter.release_unused(TPM)
+
+        asyncio.ensure_future(refund_later())
+        start = time.monotonic()
+        # Without the refund this waits a minute; the head also rechecks only every 0.25s
+        await limiter.acquire_async(TPM // 2, timeout=5)
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.2
+
+
+def test_queued_callers_wait_to_be_woken_instead_of_polling():
+    async def scenario():
+        limiter = drained_limiter()
+        checks = 0
+        try_take = limiter._try_take
+
+        def counting_try_take(*args):
+            nonlocal checks
+            checks += 1
+            return try_take(*args)
+
+        limiter._try_take = counting_try_take
+        await asyncio.gather(*(limiter.acquire_async(5, timeout=5) for _ in range(10)))
+        return checks
+
+    # About three checks per grant (enqueue, head wake, bucket wait); polling made hundreds
+    assert asyncio.run(scenario()) < 50
+
+
+def test_shared_buckets_draw_from_one_quota(tmp_path):
+    path = tmp_path / "rate_limit.sqlite"
+    first = TokenBucketRateLimiter(requests_per_minute=float("inf"), tokens_per_minute=TPM, shared_path=path)
+    second = TokenBucketRateLimiter(requests_per_minute=float("inf"), tokens_per_minute=TPM, shared_path=path)
+
+    first.acquire(TPM, timeout=1)
+    with pytest.raises(RateLimitTimeout):
+        second.acquire(TPM // 2, timeout=0.05)
+
+    async def refund_and_acquire():
+        await first.release_unused_async(TPM)
+        await second.acquire_async(TPM // 2, timeout=1)
+
+    asyncio.run(refund_and_acquire())
+    assert second.stats()["granted"] == 1
@@ -1,7 +1,19 @@
 """Backend utilities for Spirit Food."""
 
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Submodules read their timeout, retry, rate limit and batch settings at
+# import time, so config/.env is loaded before any of them, whichever entry
+# point imports this package first. Values already set in the environment win.
+load_dotenv(dotenv_path=Path(__file__).parent.parent / "config" / ".env")
+
 from .logger import get_logger
-from .portkey_llm import PortkeyLLM, get_portkey_llm
+from .portkey_llm import PortkeyLLM, get_portkey_llm, AsyncPortkeyLLM, get_async_portkey_llm
 from .snowflake_connection import SnowflakeHook
 
-__all__ = ['get_logger', 'PortkeyLLM', 'get_portkey_llm', 'SnowflakeHook']
+__all__ = [
+    'get_logger', 'PortkeyLLM', 'get_portkey_llm', 'AsyncPortkeyLLM',
+    'get_async_portkey_llm', 'SnowflakeHook'
+]
@@ -0,0 +1,238 @@
+"""Thread-safe caching primitives for Spirit Food backend."""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Sentinel distinguishing "not cached" from a cached None
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with a per-entry time-to-live.
+
+    Every entry carries its own expiry, so callers can cache different kinds
+    of results (hits, negative results, errors) for different durations.
+    Entries may also carry a staleness allowance: after expiring they are
+    kept that much longer so get_stale() can serve them while the caller
+    refreshes in the background (stale-while-revalidate).
+    All operations are guarded by a single lock and are safe to call from
+    worker threads and the event loop alike.
+    """
+
+    def __init__(self, max_entries: int = 10000, default_ttl: float = 300):
+        """
+        Args:
+            max_entries: Maximum number of entries before least-recently-used eviction
+            default_ttl: TTL in seconds used when set() is called without one
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # key -> (expires_at, stale_until, value)
+        self._data: "OrderedDict[Hashable, Tuple[float, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = dict(hits=0, stale_hits=0, misses=0, evictions=0, expirations=0)
+
+    def _lookup(self, key: Hashable, allow_stale: bool, count_miss: bool = True) -> Tuple[Any, bool]:
+        """Return (value or MISSING, is_stale); must be called with the lock held."""
+        entry = self._data.get(key)
+        if entry is None:
+            self._counters["misses"] += count_miss
+            return MISSING, False
+        expires_at, stale_until, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            if stale_until <= now:
+                del self._data[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += count_miss
+                return MISSING, False
+            if not allow_stale:
+                self._counters["misses"] += count_miss
+                return MISSING, False
+            self._data.move_to_end(key)
+            self._counters["stale_hits"] += 1
+            return value, True
+        self._data.move_to_end(key)
+        self._counters["hits"] += 1
+        return value, False
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Return the cached value for key, or `default` if absent or expired.
+        """
+        with self._lock:
+            value, _ = self._lookup(key, allow_stale=False)
+        return default if value is MISSING else value
+
+    def get_stale(self, key: Hashable, count_miss: bool = True) -> Tuple[Any, bool]:
+        """
+        Return (value, is_stale), serving expired entries within their staleness allowance.
+
+        Args:
+            count_miss: Count a miss; pass False for a pre-check whose miss the
+                follow-up lookup will count, so one request is not counted twice
+
+        Returns:
+            (MISSING, False) if absent or past the staleness bound
+        """
+        with self._lock:
+            return self._lookup(key, allow_stale=True, count_miss=count_miss)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, max_stale: float = 0):
+        """
+        Store value under key for `ttl` seconds, evicting LRU entries if full.
+
+        Args:
+            max_stale: Seconds past expiry that get_stale() may still serve the value
+        """
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, expires_at + max_stale, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def delete(self, key: Hashable):
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+            served = self._counters["hits"] + self._counters["stale_hits"]
+            return dict(
+                size=len(self._data),
+                max_entries=self.max_entries,
+                hit_ratio=round(served / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            )
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block until it finishes and receive the same result (or
+    the same exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument callable to execute
+            timeout: Seconds a follower waits for the leader before raising TimeoutError
+
+        Returns:
+            The result of fn()
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.event.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call for {key!r}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of SingleFlight.
+
+    The first caller for a key starts the coroutine as a task; every caller
+    (including the first) awaits that shared task, so a cancelled or timed
+    out caller does not abort the work for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, "asyncio.Task"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Await coro_fn() once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key
+            coro_fn: Zero-argument callable returning an awaitable
+            timeout: Seconds this caller waits before raising asyncio.TimeoutError
+
+        Returns:
+            The result of the shared coroutine
+        """
+        return await asyncio.wait_for(asyncio.shield(self.start(key, coro_fn)), timeout)
+
+    def start(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+        """
+        Return the shared task for a key, starting coro_fn() as it if none is in flight.
+
+        For callers that need the task itself (e.g. to follow its progress)
+        rather than just its result. Must be called from the event loop.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return task
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        return len(self._tasks)
@@ -0,0 +1,229 @@
+"""
+Bounded executors for blocking and rate-sensitive dependencies.
+
+Each dependency (Snowflake, LLM, ...) gets its own DependencyPool with a
+fixed number of workers, a bounded wait queue and a per-call timeout, so a
+slow dependency can only exhaust its own pool. Calls beyond workers + queue
+are rejected immediately with PoolSaturatedError instead of piling up.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a dependency pool has no free worker or queue slot."""
+
+    def __init__(self, pool_name: str):
+        super().__init__(f"{pool_name} pool is saturated")
+        self.pool_name = pool_name
+
+
+class DependencyPool:
+    """
+    Admission-controlled pool for one dependency.
+
+    `run` offloads a blocking function to the pool's threads; `run_async`
+    and `slot` bound native-async work (e.g. async LLM calls) with the same
+    concurrency, queue and timeout limits.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, timeout: Optional[float]):
+        """
+        Args:
+            name: Dependency name used in logs, errors and stats
+            max_workers: Calls allowed to execute concurrently
+            max_queue: Calls allowed to wait for a worker before new calls are rejected
+            timeout: Default seconds a caller waits for a result (None for no limit)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._active = 0
+        self._counters = dict(completed=0, rejected=0, timeouts=0)
+
+    def _admit(self):
+        with self._lock:
+            if self._admitted >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise PoolSaturatedError(self.name)
+            self._admitted += 1
+
+    def _release(self, *_):
+        with self._lock:
+            self._admitted -= 1
+            self._counters["completed"] += 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"{self.name}-pool"
+                    )
+        return self._executor
+
+    def _call_tracked(self, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a blocking function on this pool's threads.
+
+        The admission slot is held until the function actually returns, even
+        if the caller times out, so abandoned work still counts against the
+        pool.
+
+        Raises:
+            PoolSaturatedError: If all workers and queue slots are taken
+            asyncio.TimeoutError: If the result is not ready within the timeout
+        """
+        self._admit()
+        # Run in a copy of the caller's context so tracing spans nest across the thread hop
+        context = contextvars.copy_context()
+        future = self._get_executor().submit(context.run, partial(self._call_tracked, fn, *args, **kwargs))
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self._resolve_timeout(timeout))
+        except asyncio.TimeoutError:
+            self._count_timeout()
+            raise
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one of this pool's concurrency slots for an async block (e.g. a stream).
+
+        Raises:
+            PoolSaturatedError: If all workers and queue slots are taken
+        """
+        self._admit()
+        try:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_workers)
+            async with self._semaphore:
+                with self._lock:
+                    self._active += 1
+                try:
+                    yield
+                finally:
+                    with self._lock:
+                        self._active -= 1
+        finally:
+            self._release()
+
+    async def run_async(self, coro_fn: Callable[..., Awaitable], *args,
+                        timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Await coro_fn(*args, **kwargs) within this pool's concurrency, queue and timeout limits.
+
+        Raises:
+            PoolSaturatedError: If all workers and queue slots are taken
+            asyncio.TimeoutError: If the coroutine does not finish within the timeout
+        """
+        async with self.slot():
+            try:
+                return await asyncio.wait_for(coro_fn(*args, **kwargs), self._resolve_timeout(timeout))
+            except asyncio.TimeoutError:
+                self._count_timeout()
+                raise
+
+    def _resolve_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return self.timeout if timeout is None else timeout
+
+    def _count_timeout(self):
+        with self._lock:
+            self._counters["timeouts"] += 1
+        logger.warning(f"{self.name} call timed out")
+
+    def stats(self) -> dict:
+        """Occupancy and rejection counters."""
+        with self._lock:
+            return dict(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                active=self._active,
+                queued=max(self._admitted - self._active, 0),
+                **self._counters,
+            )
+
+    def shutdown(self, wait: bool = False):
+        """Stop the pool's threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Defaults per dependency: (max_workers, max_queue, timeout seconds)
+_POOL_DEFAULTS = {
+    "snowflake": (16, 64, 10.0),
+    "llm": (64, 256, 30.0),
+}
+
+_pools: Dict[str, DependencyPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str) -> DependencyPool:
+    """
+    Get the shared pool for a dependency, creating it on first use.
+
+    Sizing is read from EXECUTOR_<NAME>_WORKERS, EXECUTOR_<NAME>_QUEUE and
+    EXECUTOR_<NAME>_TIMEOUT (e.g. EXECUTOR_SNOWFLAKE_WORKERS).
+
+    Args:
+        name: Dependency name, e.g. "snowflake" or "llm"
+
+    Returns:
+        DependencyPool
+    """
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            workers, queue, timeout = _POOL_DEFAULTS.get(name, (8, 32, 30.0))
+            prefix = f"EXECUTOR_{name.upper()}"
+            timeout = float(os.getenv(f"{prefix}_TIMEOUT", timeout))
+            pool = DependencyPool(
+                name=name,
+                max_workers=int(os.getenv(f"{prefix}_WORKERS", workers)),
+                max_queue=int(os.getenv(f"{prefix}_QUEUE", queue)),
+                timeout=timeout if timeout > 0 else None,
+            )
+            _pools[name] = pool
+        return pool
+
+
+def get_pool_stats() -> Dict[str, dict]:
+    """Stats for every dependency pool created so far."""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
+
+
+def shutdown_pools(wait: bool = False):
+    """Shut down every dependency pool (e.g. on application shutdown)."""
+    for pool in list(_pools.values()):
+        pool.shutdown(wait=wait)
@@ -6,12 +6,23 @@ Shared utility for accessing Portkey LLM services for both text and image analys
 Supports multiple LLM providers through Portkey gateway.
 """
 
+import io
 import os
+import time
+import random
+import email.utils
 import base64
-from typing import Dict, Any, List, Optional, Union
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 from pathlib import Path
 
 from utils.logger import get_logger
+from utils.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from utils.tracing import traced
+from utils.rate_limiter import ACQUIRE_TIMEOUT, estimate_tokens, get_rate_limiter
 
 try:
     from portkey_ai import Portkey
@@ -27,6 +38,481 @@ except ImportError:
         PORTKEY_AVAILABLE = False
         OPENAI_AVAILABLE = False
 
+# Optional Pillow import for downscaling images before upload
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# Gateway timeouts (seconds)
+CONNECT_TIMEOUT = float(os.getenv("PORTKEY_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("PORTKEY_READ_TIMEOUT", "20"))
+
+# Retries on 429/5xx/connection errors: attempts after the first, backoff base and cap (seconds)
+MAX_RETRIES = int(os.getenv("PORTKEY_MAX_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.getenv("PORTKEY_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("PORTKEY_RETRY_MAX_DELAY", "8"))
+
+# Circuit breaker: consecutive failed calls before opening, seconds before a trial call
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("PORTKEY_BREAKER_FAILURES", "5"))
+BREAKER_RECOVERY_SECONDS = float(os.getenv("PORTKEY_BREAKER_RECOVERY_SECONDS", "30"))
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the gateway while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for the LLM gateway.
+    
+    After `failure_threshold` failed calls in a row the breaker opens and
+    calls are rejected immediately. Once `recovery_seconds` have passed a
+    single trial call is let through (half-open); its outcome closes or
+    re-opens the breaker.
+    """
+    
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 recovery_seconds: float = BREAKER_RECOVERY_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._counters = dict(opened=0, rejected=0)
+    
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.recovery_seconds:
+                return "half_open"
+            return self._state
+    
+    def before_call(self):
+        """
+        Admit or reject a call.
+        
+        Raises:
+            CircuitOpenError: If the breaker is open (or a half-open trial is already running)
+        """
+        with self._lock:
+            if self._state == "closed":
+                return
+            recovered = time.monotonic() - self._opened_at >= self.recovery_seconds
+            if recovered and not self._trial_in_flight:
+                self._state = "half_open"
+                self._trial_in_flight = True
+                return
+            self._counters["rejected"] += 1
+        raise CircuitOpenError("LLM gateway circuit breaker is open")
+    
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+    
+    def abandon_call(self):
+        """
+        Release a half-open trial slot without recording an outcome.
+        
+        For calls that were cancelled, or that failed in a way that says
+        nothing about gateway health (bad request, auth), so the breaker
+        neither closes nor re-opens on them.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self._counters["opened"] += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+    
+    def stats(self) -> dict:
+        """State and counters for monitoring."""
+        state = self.state
+        with self._lock:
+            return dict(state=state, consecutive_failures=self._failures, **self._counters)
+
+
+_circuit_breaker = CircuitBreaker()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the circuit breaker shared by the sync and async Portkey clients."""
+    return _circuit_breaker
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in _RETRYABLE_STATUS
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) from an API error, if present."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        # Malformed header: fall back to backoff rather than failing a retryable error
+        return None
+    return max(parsed.timestamp() - time.time(), 0.0) if parsed else None
+
+
+def _retry_delay(attempt: int, error: Exception) -> Optional[float]:
+    """
+    Seconds to wait before retry number `attempt` (1-based), or None to give up.
+    
+    Honours Retry-After when the gateway sends one, giving up if it asks
+    for longer than RETRY_MAX_DELAY; otherwise uses full-jitter exponential
+    backoff.
+    """
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        return retry_after if retry_after <= RETRY_MAX_DELAY else None
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _record_usage(model: str, response) -> Optional[int]:
+    """Record token usage metrics for a response and return its total tokens, if reported."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    LLM_TOKENS.inc(usage.prompt_tokens or 0, model=model, kind="prompt")
+    LLM_TOKENS.inc(usage.completion_tokens or 0, model=model, kind="completion")
+    return usage.total_tokens
+
+
+def _record_response(limiter, estimated: int, model: str, response):
+    """Record token usage and hand back the part of the rate-limit estimate the response did not use."""
+    total_tokens = _record_usage(model, response)
+    if limiter is not None and total_tokens is not None:
+        limiter.release_unused(estimated - total_tokens)
+
+
+async def _arecord_response(limiter, estimated: int, model: str, response):
+    """Async counterpart of _record_response; shared-bucket refunds run off the event loop."""
+    total_tokens = _record_usage(model, response)
+    if limiter is not None and total_tokens is not None:
+        await limiter.release_unused_async(estimated - total_tokens)
+
+
+def _call_with_resilience(create, logger, priority: str = "interactive", **kwargs):
+    """
+    Call a sync ``chat.completions.create`` with rate limiting, circuit breaking
+    and jittered retries.
+    
+    Every attempt, retries included, waits for rate-limit capacity at the
+    given priority ("interactive" or "background").
+    
+    Raises:
+        CircuitOpenError: If the breaker is open
+        RateLimitTimeout: If rate-limit capacity is not available within PORTKEY_RATE_LIMIT_TIMEOUT
+        Exception: The last error once retries are exhausted or for non-retryable errors
+    """
+    _circuit_breaker.before_call()
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+    model = kwargs.get("model", "unknown")
+    attempt = 0
+    # Until the outcome is recorded, any exit (limiter timeout, interrupted backoff)
+    # must hand back a half-open trial slot or the breaker stays half-open for good
+    settled = False
+    try:
+        while True:
+            if limiter is not None:
+                limiter.acquire(estimated, priority=priority, timeout=ACQUIRE_TIMEOUT)
+            start = time.perf_counter()
+            try:
+                response = create(**kwargs)
+            except Exception as e:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, model=model, outcome="error")
+                if not _is_retryable(e):
+                    # Client-side errors (bad request, auth) say nothing about gateway health:
+                    # neutral, so a half-open breaker is not closed by a call that proved nothing
+                    _circuit_breaker.abandon_call()
+                    settled = True
+                    raise
+                attempt += 1
+                delay = _retry_delay(attempt, e) if attempt <= MAX_RETRIES else None
+                if delay is None:
+                    _circuit_breaker.record_failure()
+                    settled = True
+                    raise
+                logger.warning(f"Retrying LLM call in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES}): {e}")
+                time.sleep(delay)
+                continue
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, model=model, outcome="ok")
+            _circuit_breaker.record_success()
+            settled = True
+            _record_response(limiter, estimated, model, response)
+            return response
+    finally:
+        if not settled:
+            _circuit_breaker.abandon_call()
+
+
+async def _acall_with_resilience(create, logger, priority: str = "interactive", **kwargs):
+    """Async counterpart of _call_with_resilience."""
+    _circuit_breaker.before_call()
+    limiter = get_rate_limiter()
+    estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+    model = kwargs.get("model", "unknown")
+    attempt = 0
+    # Until the outcome is recorded, any exit (limiter timeout, interrupted backoff)
+    # must hand back a half-open trial slot or the breaker stays half-open for good
+    settled = False
+    try:
+        while True:
+            if limiter is not None:
+                await limiter.acquire_async(estimated, priority=priority, timeout=ACQUIRE_TIMEOUT)
+            start = time.perf_counter()
+            try:
+                response = await create(**kwargs)
+            except Exception as e:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, model=model, outcome="error")
+                if not _is_retryable(e):
+                    _circuit_breaker.abandon_call()
+                    settled = True
+                    raise
+                attempt += 1
+                delay = _retry_delay(attempt, e) if attempt <= MAX_RETRIES else None
+                if delay is None:
+                    _circuit_breaker.record_failure()
+                    settled = True
+                    raise
+                logger.warning(f"Retrying LLM call in {delay:.2f}s (attempt {attempt}/{MAX_RETRIES}): {e}")
+                await asyncio.sleep(delay)
+                continue
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, model=model, outcome="ok")
+            _circuit_breaker.record_success()
+            settled = True
+            await _arecord_response(limiter, estimated, model, response)
+            return response
+    finally:
+        if not settled:
+            _circuit_breaker.abandon_call()
+
+
+def _response_format_kwargs(response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Only send response_format when set; providers without structured output reject a null."""
+    return {"response_format": response_format} if response_format else {}
+
+
+def _portkey_client_kwargs(logger) -> Optional[Dict[str, Any]]:
+    """
+    Build OpenAI client kwargs for the Portkey gateway from environment.
+    
+    Shared by the sync and async clients so both point at the same gateway.
+    
+    Returns:
+        Client kwargs or None if the gateway is not configured
+    """
+    if not OPENAI_AVAILABLE:
+        logger.debug("OpenAI library not available. Please install openai")
+        return None
+    
+    # Get Portkey configuration from environment
+    portkey_api_key = os.getenv('PORTKEY_API_KEY')
+    portkey_virtual_key = os.getenv('PORTKEY_OPENAI_VIRTUAL_KEY')
+    
+    if not all([portkey_api_key, portkey_virtual_key]):
+        logger.debug("Missing Portkey configuration in environment variables - LLM features disabled")
+        logger.debug("Expected: PORTKEY_API_KEY and PORTKEY_OPENAI_VIRTUAL_KEY")
+        return None
+    
+    # Use OpenAI client pointed at Portkey gateway (as per your instructions)
+    # Use custom base URL from environment (DoorDash internal gateway)
+    base_url = os.getenv('PORTKEY_BASE_URL', 'https://api.portkey.ai/v1')
+    
+    return dict(
+        api_key="dummy",  # Required by OpenAI SDK but ignored by Portkey
+        base_url=base_url,
+        default_headers={
+            "X-Portkey-API-Key": portkey_api_key,
+            "X-Portkey-Virtual-Key": portkey_virtual_key
+        },
+        # Explicit timeouts so a stalled gateway fails fast; retries are handled by _call_with_resilience
+        timeout=openai.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        max_retries=0
+    )
+
+
+# Read size for streaming base64 encoding; a multiple of 3 so chunks encode without padding
+_ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+
+# Longest image side sent to the model when downscaling (0 disables downscaling)
+IMAGE_MAX_DIMENSION = int(os.getenv("PORTKEY_IMAGE_MAX_DIMENSION", "0"))
+
+
+class _EncodedImageCache:
+    """Size-bounded LRU of encoded data URLs keyed by file identity and encoding options."""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[tuple, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: tuple, value: str):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = value
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+
+_encoded_image_cache = _EncodedImageCache(
+    max_bytes=int(os.getenv("PORTKEY_IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
+
+
+def _base64_data_url(stream: io.RawIOBase, size: int, image_format: str) -> str:
+    """
+    Base64-encode a byte stream straight into a preallocated data URL buffer.
+    
+    The source is read in chunks, so the only full-size copies are the
+    encoded buffer and the final string handed to the client.
+    """
+    prefix = f"data:image/{image_format};base64,".encode('ascii')
+    out = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+    out[:len(prefix)] = prefix
+    pos = len(prefix)
+    while True:
+        chunk = stream.read(_ENCODE_CHUNK_SIZE)
+        if not chunk:
+            break
+        encoded = base64.b64encode(chunk)
+        out[pos:pos + len(encoded)] = encoded
+        pos += len(encoded)
+    return out[:pos].decode('ascii') if pos != len(out) else out.decode('ascii')
+
+
+def _image_format(image_path: Path) -> str:
+    image_format = image_path.suffix.lower().lstrip('.')
+    return 'jpeg' if image_format == 'jpg' else image_format
+
+
+def encode_image_data_url(image_path: Union[str, Path], max_dimension: Optional[int] = None) -> str:
+    """
+    Encode an image file as a base64 data URL, reusing earlier encodings.
+    
+    Results are cached by path, mtime, size and max_dimension, so a file is
+    only re-read after it changes.
+    
+    Args:
+        image_path: Path to image file
+        max_dimension: Downscale so the longest side is at most this many pixels
+            (requires Pillow; defaults to PORTKEY_IMAGE_MAX_DIMENSION, 0 disables)
+    
+    Returns:
+        "data:image/<format>;base64,..." string
+    
+    Raises:
+        FileNotFoundError: If the image does not exist
+    """
+    image_path = Path(image_path)
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+    
+    max_dimension = IMAGE_MAX_DIMENSION if max_dimension is None else max_dimension
+    stat = image_path.stat()
+    key = (str(image_path.resolve()), stat.st_mtime_ns, stat.st_size, max_dimension)
+    cached = _encoded_image_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    image_format = _image_format(image_path)
+    if max_dimension and PIL_AVAILABLE:
+        with Image.open(image_path) as image:
+            if max(image.size) > max_dimension:
+                image.thumbnail((max_dimension, max_dimension))
+                # Re-encode as JPEG unless transparency needs to survive
+                if image.mode in ("RGBA", "LA", "P"):
+                    save_format, image_format = "PNG", "png"
+                else:
+                    save_format, image_format = "JPEG", "jpeg"
+                buffer = io.BytesIO()
+                image.save(buffer, format=save_format, optimize=True)
+                size = buffer.tell()
+                buffer.seek(0)
+                data_url = _base64_data_url(buffer, size, image_format)
+                _encoded_image_cache.set(key, data_url)
+                return data_url
+    
+    with open(image_path, 'rb', buffering=0) as f:
+        data_url = _base64_data_url(f, stat.st_size, image_format)
+    _encoded_image_cache.set(key, data_url)
+    return data_url
+
+
+def _build_image_messages(image_path: Path, prompt: str,
+                          max_dimension: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build a vision chat message embedding the image as a base64 data URL.
+    
+    Raises:
+        FileNotFoundError: If the image does not exist
+    """
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": encode_image_data_url(image_path, max_dimension)
+                    }
+                }
+            ]
+        }
+    ]
+
+
+# Defaults for batch image analysis
+BATCH_MAX_CONCURRENCY = int(os.getenv("PORTKEY_BATCH_MAX_CONCURRENCY", "8"))
+BATCH_ITEM_TIMEOUT = float(os.getenv("PORTKEY_BATCH_ITEM_TIMEOUT", "60"))
+BATCH_RETRIES = int(os.getenv("PORTKEY_BATCH_RETRIES", "2"))
+
 
 class PortkeyLLM:
     """
@@ -47,44 +533,26 @@ class PortkeyLLM:
     
     def _initialize_client(self):
         """Initialize Portkey client with configuration from environment."""
-        if not OPENAI_AVAILABLE:
-            self.logger.debug("OpenAI library not available. Please install openai")
+        client_kwargs = _portkey_client_kwargs(self.logger)
+        if client_kwargs is None:
             return
         
         try:
-            # Get Portkey configuration from environment
-            portkey_api_key = os.getenv('PORTKEY_API_KEY')
-            portkey_virtual_key = os.getenv('PORTKEY_OPENAI_VIRTUAL_KEY')
-            
-            if not all([portkey_api_key, portkey_virtual_key]):
-                self.logger.debug("Missing Portkey configuration in environment variables - LLM features disabled")
-                self.logger.debug("Expected: PORTKEY_API_KEY and PORTKEY_OPENAI_VIRTUAL_KEY")
-                return
-            
-            # Use OpenAI client pointed at Portkey gateway (as per your instructions)
-            # Use custom base URL from environment (DoorDash internal gateway)
-            base_url = os.getenv('PORTKEY_BASE_URL', 'https://api.portkey.ai/v1')
-            
-            self.client = openai.OpenAI(
-                api_key="dummy",  # Required by OpenAI SDK but ignored by Portkey
-                base_url=base_url,
-                default_headers={
-                    "X-Portkey-API-Key": portkey_api_key,
-                    "X-Portkey-Virtual-Key": portkey_virtual_key
-                }
-            )
-            
+            self.client = openai.OpenAI(**client_kwargs)
             self.logger.info("Successfully initialized Portkey client via OpenAI SDK")
             
         except Exception as e:
             self.logger.debug(f"Failed to initialize Portkey client: {e}")
     
+    @traced("llm.analyze_text")
     def analyze_text(self, 
                     text: str, 
                     prompt: str, 
                     model: str = "gpt-4o-mini",
                     max_tokens: int = 1000,
-                    temperature: float = 0.1) -> Optional[str]:
+                    temperature: float = 0.1,
+                    priority: str = "interactive",
+                    response_format: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Analyze text using LLM.
         
@@ -94,6 +562,8 @@ class PortkeyLLM:
             model: LLM model to use
             max_tokens: Maximum response tokens
             temperature: Response randomness (0.0-1.0)
+            priority: Rate-limit queue priority, "interactive" or "background"
+            response_format: Structured-output request, e.g. {"type": "json_object"}
             
         Returns:
             LLM response or None if failed
@@ -108,27 +578,38 @@ class PortkeyLLM:
                 {"role": "user", "content": text}
             ]
             
-            response = self.client.chat.completions.create(
+            response = _call_with_resilience(
+                self.client.chat.completions.create,
+                self.logger,
+                priority=priority,
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                **_response_format_kwargs(response_format)
             )
             
             result = response.choices[0].message.content
             self.logger.info(f"Text analysis completed: {len(text)} chars -> {len(result)} chars")
             return result
             
+        except CircuitOpenError:
+            self.logger.debug("LLM circuit breaker open - skipping call")
+            return None
         except Exception as e:
             self.logger.error(f"Error in text analysis: {e}")
             return None
     
+    @traced("llm.analyze_image")
     def analyze_image(self, 
                      image_path: Union[str, Path], 
                      prompt: str,
                      model: str = "gpt-4o",
                      max_tokens: int = 1000,
-                     temperature: float = 0.1) -> Optional[str]:
+                     temperature: float = 0.1,
+                     timeout: Optional[float] = None,
+                     max_dimension: Optional[int] = None,
+                     priority: str = "interactive") -> Optional[str]:
         """
         Analyze image using vision LLM.
         
@@ -138,6 +619,9 @@ class PortkeyLLM:
             model: Vision-capable LLM model to use
             max_tokens: Maximum response tokens
             temperature: Response randomness (0.0-1.0)
+            timeout: Request timeout in seconds (defaults to the client's)
+            max_dimension: Downscale the longest side to this many pixels before upload
+            priority: Rate-limit queue priority, "interactive" or "background"
             
         Returns:
             LLM response or None if failed
@@ -148,37 +632,13 @@ class PortkeyLLM:
         
         try:
             image_path = Path(image_path)
-            if not image_path.exists():
-                self.logger.error(f"Image file not found: {image_path}")
-                return None
-            
-            # Read and encode image
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
-            
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
-            
-            # Determine image format
-            image_format = image_path.suffix.lower().lstrip('.')
-            if image_format == 'jpg':
-                image_format = 'jpeg'
+            messages = _build_image_messages(image_path, prompt, max_dimension)
             
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/{image_format};base64,{image_base64}"
-                            }
-                        }
-                    ]
-                }
-            ]
-            
-            response = self.client.chat.completions.create(
+            client = self.client.with_options(timeout=timeout) if timeout else self.client
+            response = _call_with_resilience(
+                client.chat.completions.create,
+                self.logger,
+                priority=priority,
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -189,18 +649,32 @@ class PortkeyLLM:
             self.logger.info(f"Image analysis completed: {image_path.name} -> {len(result)} chars")
             return result
             
+        except FileNotFoundError as e:
+            self.logger.error(str(e))
+            return None
+        except CircuitOpenError:
+            self.logger.debug("LLM circuit breaker open - skipping call")
+            return None
         except Exception as e:
             self.logger.error(f"Error in image analysis: {e}")
             return None
     
+    @traced("llm.analyze_images_batch")
     def analyze_images_batch(self, 
                            image_paths: List[Union[str, Path]], 
                            prompt: str,
                            model: str = "gpt-4o",
                            max_tokens: int = 1500,
-                           temperature: float = 0.1) -> List[Optional[str]]:
+                           temperature: float = 0.1,
+                           max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                           item_timeout: Optional[float] = BATCH_ITEM_TIMEOUT,
+                           max_dimension: Optional[int] = None,
+                           priority: str = "background") -> List[Optional[str]]:
         """
-        Analyze multiple images in batch.
+        Analyze multiple images concurrently.
+        
+        Each image gets the normal retry policy of a single call (transient
+        errors and request timeouts); failures are not retried on top of it.
         
         Args:
             image_paths: List of paths to image files
@@ -208,23 +682,35 @@ class PortkeyLLM:
             model: Vision-capable LLM model to use
             max_tokens: Maximum response tokens
             temperature: Response randomness (0.0-1.0)
+            max_concurrency: Maximum requests in flight
+            item_timeout: Per-request timeout in seconds
+            max_dimension: Downscale the longest side to this many pixels before upload
+            priority: Rate-limit queue priority, "interactive" or "background"
             
         Returns:
-            List of LLM responses (same order as input)
+            List of LLM responses (same order as input), None for failed images
         """
-        results = []
+        if not image_paths:
+            return []
         
-        for image_path in image_paths:
-            result = self.analyze_image(
+        def _analyze(image_path):
+            return self.analyze_image(
                 image_path=image_path,
                 prompt=prompt,
                 model=model,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                timeout=item_timeout,
+                max_dimension=max_dimension,
+                priority=priority
             )
-            results.append(result)
         
-        self.logger.info(f"Batch image analysis completed: {len(image_paths)} images")
+        workers = max(1, min(max_concurrency, len(image_paths)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="portkey-batch") as executor:
+            results = list(executor.map(_analyze, image_paths))
+        
+        succeeded = sum(result is not None for result in results)
+        self.logger.info(f"Batch image analysis completed: {succeeded}/{len(image_paths)} images")
         return results
     
     def extract_structured_data(self, 
@@ -281,3 +767,295 @@ def get_portkey_llm() -> PortkeyLLM:
     if _portkey_instance is None:
         _portkey_instance = PortkeyLLM()
     return _portkey_instance
+
+
+class AsyncPortkeyLLM:
+    """
+    Async counterpart of PortkeyLLM built on ``openai.AsyncOpenAI``.
+    
+    Calls await the gateway instead of blocking, so a single event loop can
+    keep many LLM requests in flight at once.
+    """
+    
+    def __init__(self):
+        """Initialize the async Portkey client."""
+        self.logger = get_logger(__name__)
+        self.client = None
+        self._initialize_client()
+    
+    def _initialize_client(self):
+        """Initialize async Portkey client with configuration from environment."""
+        client_kwargs = _portkey_client_kwargs(self.logger)
+        if client_kwargs is None:
+            return
+        
+        try:
+            self.client = openai.AsyncOpenAI(**client_kwargs)
+            self.logger.info("Successfully initialized async Portkey client via OpenAI SDK")
+            
+        except Exception as e:
+            self.logger.debug(f"Failed to initialize async Portkey client: {e}")
+    
+    @traced("llm.analyze_text_async")
+    async def analyze_text_async(self, 
+                                 text: str, 
+                                 prompt: str, 
+                                 model: str = "gpt-4o-mini",
+                                 max_tokens: int = 1000,
+                                 temperature: float = 0.1,
+                                 priority: str = "interactive",
+                                 response_format: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Analyze text using LLM without blocking the event loop.
+        
+        Args:
+            text: Text content to analyze
+            prompt: Analysis prompt/instruction
+            model: LLM model to use
+            max_tokens: Maximum response tokens
+            temperature: Response randomness (0.0-1.0)
+            priority: Rate-limit queue priority, "interactive" or "background"
+            response_format: Structured-output request, e.g. {"type": "json_object"}
+            
+        Returns:
+            LLM response or None if failed
+        """
+        if not self.client:
+            self.logger.debug("Portkey client not initialized - LLM analysis unavailable")
+            return None
+        
+        try:
+            messages = [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": text}
+            ]
+            
+            response = await _acall_with_resilience(
+                self.client.chat.completions.create,
+                self.logger,
+                priority=priority,
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **_response_format_kwargs(response_format)
+            )
+            
+            result = response.choices[0].message.content
+            self.logger.info(f"Async text analysis completed: {len(text)} chars -> {len(result)} chars")
+            return result
+            
+        except CircuitOpenError:
+            self.logger.debug("LLM circuit breaker open - skipping call")
+            return None
+        except Exception as e:
+            self.logger.error(f"Error in async text analysis: {e}")
+            return None
+    
+    @traced("llm.stream_text_async")
+    async def stream_text_async(self, 
+                                text: str, 
+                                prompt: str, 
+                                model: str = "gpt-4o-mini",
+                                max_tokens: int = 1000,
+                                temperature: float = 0.1,
+                                priority: str = "interactive",
+                                response_format: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Stream a text analysis response as it is generated.
+        
+        Args:
+            text: Text content to analyze
+            prompt: Analysis prompt/instruction
+            model: LLM model to use
+            max_tokens: Maximum response tokens
+            temperature: Response randomness (0.0-1.0)
+            priority: Rate-limit queue priority, "interactive" or "background"
+            response_format: Structured-output request, e.g. {"type": "json_object"}
+            
+        Yields:
+            Content deltas in order; nothing if the client is unavailable
+            
+        Raises:
+            Exception: Errors from the gateway are propagated so callers can fall back
+        """
+        if not self.client:
+            self.logger.debug("Portkey client not initialized - LLM analysis unavailable")
+            return
+        
+        messages = [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": text}
+        ]
+        
+        stream = await _acall_with_resilience(
+            self.client.chat.completions.create,
+            self.logger,
+            priority=priority,
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            # Usage arrives in a final chunk without choices; without it nothing is metered
+            stream_options={"include_usage": True},
+            **_response_format_kwargs(response_format)
+        )
+        
+        total = 0
+        usage_chunk = None
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                total += len(delta)
+                yield delta
+        
+        if usage_chunk is not None:
+            await _arecord_response(get_rate_limiter(), estimate_tokens(messages, max_tokens), model, usage_chunk)
+        self.logger.info(f"Streamed text analysis completed: {len(text)} chars -> {total} chars")
+    
+    @traced("llm.analyze_image_async")
+    async def analyze_image_async(self, 
+                                  image_path: Union[str, Path], 
+                                  prompt: str,
+                                  model: str = "gpt-4o",
+                                  max_tokens: int = 1000,
+                                  temperature: float = 0.1,
+                                  max_dimension: Optional[int] = None,
+                                  priority: str = "interactive") -> Optional[str]:
+        """
+        Analyze image using vision LLM without blocking the event loop.
+        
+        Args:
+            image_path: Path to image file
+            prompt: Analysis prompt/instruction
+            model: Vision-capable LLM model to use
+            max_tokens: Maximum response tokens
+            temperature: Response randomness (0.0-1.0)
+            max_dimension: Downscale the longest side to this many pixels before upload
+            priority: Rate-limit queue priority, "interactive" or "background"
+            
+        Returns:
+            LLM response or None if failed
+        """
+        if not self.client:
+            self.logger.debug("Portkey client not initialized - LLM analysis unavailable")
+            return None
+        
+        try:
+            image_path = Path(image_path)
+            # File read + base64 encoding happen off the event loop
+            messages = await asyncio.to_thread(_build_image_messages, image_path, prompt, max_dimension)
+            
+            response = await _acall_with_resilience(
+                self.client.chat.completions.create,
+                self.logger,
+                priority=priority,
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            
+            result = response.choices[0].message.content
+            self.logger.info(f"Async image analysis completed: {image_path.name} -> {len(result)} chars")
+            return result
+            
+        except FileNotFoundError as e:
+            self.logger.error(str(e))
+            return None
+        except CircuitOpenError:
+            self.logger.debug("LLM circuit breaker open - skipping call")
+            return None
+        except Exception as e:
+            self.logger.error(f"Error in async image analysis: {e}")
+            return None
+    
+    @traced("llm.analyze_images_batch_async")
+    async def analyze_images_batch_async(self, 
+                                         image_paths: List[Union[str, Path]], 
+                                         prompt: str,
+                                         model: str = "gpt-4o",
+                                         max_tokens: int = 1500,
+                                         temperature: float = 0.1,
+                                         max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                                         item_timeout: Optional[float] = BATCH_ITEM_TIMEOUT,
+                                         retries: int = BATCH_RETRIES,
+                                         max_dimension: Optional[int] = None,
+                                         priority: str = "background") -> List[Optional[str]]:
+        """
+        Analyze multiple images concurrently on the event loop.
+        
+        Only images that hit item_timeout are attempted again; other failures
+        already went through the single-call retry policy (and the circuit
+        breaker), so retrying them would only add load.
+        
+        Args:
+            image_paths: List of paths to image files
+            prompt: Analysis prompt/instruction
+            model: Vision-capable LLM model to use
+            max_tokens: Maximum response tokens
+            temperature: Response randomness (0.0-1.0)
+            max_concurrency: Maximum requests in flight
+            item_timeout: Per-request timeout in seconds
+            retries: Extra attempts for an image whose analysis timed out
+            max_dimension: Downscale the longest side to this many pixels before upload
+            priority: Rate-limit queue priority, "interactive" or "background"
+            
+        Returns:
+            List of LLM responses (same order as input), None for failed images
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def _analyze_with_retry(image_path):
+            for attempt in range(retries + 1):
+                if attempt:
+                    await asyncio.sleep(min(2 ** (attempt - 1), 8))
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            self.analyze_image_async(
+                                image_path=image_path,
+                                prompt=prompt,
+                                model=model,
+                                max_tokens=max_tokens,
+                                temperature=temperature,
+                                max_dimension=max_dimension,
+                                priority=priority
+                            ),
+                            item_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        self.logger.warning(f"Image analysis timed out: {image_path}")
+            return None
+        
+        results = await asyncio.gather(*(_analyze_with_retry(path) for path in image_paths))
+        succeeded = sum(result is not None for result in results)
+        self.logger.info(f"Async batch image analysis completed: {succeeded}/{len(image_paths)} images")
+        return list(results)
+    
+    def is_available(self) -> bool:
+        """Check if AsyncPortkeyLLM is available and properly configured."""
+        return self.client is not None
+
+
+_async_portkey_instance = None
+
+def get_async_portkey_llm() -> AsyncPortkeyLLM:
+    """
+    Get shared AsyncPortkeyLLM instance (singleton pattern).
+    
+    The underlying ``AsyncOpenAI`` client pools HTTP connections, so it is
+    shared across requests rather than created per call.
+    
+    Returns:
+        AsyncPortkeyLLM instance
+    """
+    global _async_portkey_instance
+    if _async_portkey_instance is None:
+        _async_portkey_instance = AsyncPortkeyLLM()
+    return _async_portkey_instance
@@ -0,0 +1,379 @@
+"""
+Client-side rate limiting for LLM calls.
+
+A pair of token buckets (requests per minute and tokens per minute) sized to
+the Portkey virtual key's quota. Callers queue in priority order, interactive
+before background, FIFO within a priority, and only the head of the queue
+may draw from the buckets, so large requests are not starved by small ones.
+Bucket state can live in a SQLite file to share one quota across uvicorn
+workers.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRIORITIES = {"interactive": 0, "background": 1}
+
+# Rough characters-per-token ratio for prompt size estimates
+_CHARS_PER_TOKEN = 4
+# Flat token estimate for an image part of a vision request
+_IMAGE_TOKENS = 1000
+
+# Shared buckets: how long a take waits on another worker's transaction, and the
+# retry delay reported when it is still busy (callers poll rather than block)
+_SQLITE_BUSY_TIMEOUT = 0.05
+_SQLITE_BUSY_WAIT = 0.01
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a caller cannot acquire rate-limit capacity within its timeout."""
+
+
+def estimate_tokens(messages: list, max_tokens: int) -> int:
+    """
+    Estimate the quota cost of a chat request: prompt size plus the completion budget.
+
+    Args:
+        messages: Chat messages as passed to chat.completions.create
+        max_tokens: Completion token limit
+
+    Returns:
+        int: Estimated total tokens
+    """
+    prompt_tokens = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            prompt_tokens += len(content) // _CHARS_PER_TOKEN
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    prompt_tokens += len(part.get("text", "")) // _CHARS_PER_TOKEN
+                else:
+                    prompt_tokens += _IMAGE_TOKENS
+    return prompt_tokens + (max_tokens or 0)
+
+
+class _LocalBuckets:
+    """Bucket levels held in process memory."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = rpm
+        self._tokens = tpm
+        self._updated = time.monotonic()
+
+    def take(self, tokens: float) -> float:
+        """Take one request and `tokens` if available; return 0, or seconds until they would be."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+        return _take_from(self, tokens)
+
+    def give_back(self, tokens: float):
+        self._tokens = min(self.tpm, self._tokens + tokens)
+
+
+class _SQLiteBuckets:
+    """Bucket levels stored in a SQLite file so every worker process draws from one quota."""
+
+    def __init__(self, rpm: float, tpm: float, path: Union[str, Path]):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_rate_limit ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), requests REAL, tokens REAL, updated REAL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO llm_rate_limit (id, requests, tokens, updated) VALUES (1, ?, ?, ?)",
+                (rpm, tpm, time.time())
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=_SQLITE_BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _transact(self, fn):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._requests, self._tokens, updated = conn.execute(
+                "SELECT requests, tokens, updated FROM llm_rate_limit WHERE id = 1"
+            ).fetchone()
+            now = time.time()
+            elapsed = max(now - updated, 0.0)
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+            result = fn()
+            conn.execute(
+                "UPDATE llm_rate_limit SET requests = ?, tokens = ?, updated = ? WHERE id = 1",
+                (self._requests, self._tokens, now)
+            )
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def take(self, tokens: float) -> float:
+        try:
+            return self._transact(lambda: _take_from(self, tokens))
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            return _SQLITE_BUSY_WAIT
+
+    def give_back(self, tokens: float):
+        def _give():
+            self._tokens = min(self.tpm, self._tokens + tokens)
+        try:
+            self._transact(_give)
+        except sqlite3.OperationalError as e:
+            # A lost refund only makes the limiter more conservative
+            logger.debug(f"Skipped rate-limit refund of {tokens:.0f} tokens: {e}")
+
+
+def _take_from(buckets, tokens: float) -> float:
+    """Shared bucket check: take capacity if both buckets allow it, else return the wait."""
+    # A request larger than the whole bucket can never fit; let it through once the bucket is full
+    tokens = min(tokens, buckets.tpm)
+    waits = []
+    if buckets._requests < 1:
+        waits.append((1 - buckets._requests) * 60 / buckets.rpm)
+    if buckets._tokens < tokens:
+        waits.append((tokens - buckets._tokens) * 60 / buckets.tpm)
+    if waits:
+        return max(waits)
+    buckets._requests -= 1
+    buckets._tokens -= tokens
+    return 0.0
+
+
+class TokenBucketRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter with a priority queue.
+
+    Both sync (blocking) and async callers share one queue. Only the head of
+    the queue polls the buckets; everyone else sleeps until a grant, timeout
+    or refund wakes whichever ticket is at the head next.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 shared_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            requests_per_minute: Request quota per minute
+            tokens_per_minute: Token quota per minute
+            shared_path: SQLite file holding bucket state shared across processes (optional)
+        """
+        self._shared = bool(shared_path)
+        if shared_path:
+            self._buckets = _SQLiteBuckets(requests_per_minute, tokens_per_minute, shared_path)
+        else:
+            self._buckets = _LocalBuckets(requests_per_minute, tokens_per_minute)
+        self._lock = threading.Lock()
+        self._queue = []
+        self._seq = itertools.count()
+        # ticket -> callable that wakes its waiter; called when the ticket reaches the head
+        self._waiters: Dict[tuple, Callable[[], None]] = {}
+        self._counters = dict(granted=0, waited=0, timeouts=0)
+
+    def _enqueue(self, priority: str, wake: Callable[[], None]) -> tuple:
+        ticket = (PRIORITIES.get(priority, 0), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            self._waiters[ticket] = wake
+        return ticket
+
+    def _dequeue(self, ticket: tuple):
+        with self._lock:
+            self._waiters.pop(ticket, None)
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._wake_head()
+
+    def _wake_head(self):
+        """Wake the waiter at the head of the queue. Call with self._lock held."""
+        if self._queue:
+            self._waiters[self._queue[0]]()
+
+    def _try_take(self, ticket: tuple, tokens: float) -> Optional[float]:
+        """
+        Return 0 if capacity was granted to this ticket, else seconds to wait
+        before retrying, or None if it is not at the head and should wait to be woken.
+        """
+        with self._lock:
+            if self._queue[0] != ticket:
+                return None
+            wait = self._buckets.take(tokens)
+            if wait == 0:
+                heapq.heappop(self._queue)
+                del self._waiters[ticket]
+                self._counters["granted"] += 1
+                self._wake_head()
+            return wait
+
+    @staticmethod
+    def _sleep_time(wait: Optional[float], deadline: Optional[float]) -> Optional[float]:
+        """How long to sleep before retrying: a head ticket rechecks at least every 0.25s."""
+        remaining = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+        if wait is None:
+            return remaining
+        wait = min(wait, 0.25)
+        return wait if remaining is None else min(wait, remaining)
+
+    def _deadline_exceeded(self, deadline: Optional[float], ticket: tuple):
+        if deadline is not None and time.monotonic() >= deadline:
+            self._dequeue(ticket)
+            with self._lock:
+                self._counters["timeouts"] += 1
+            raise RateLimitTimeout("Timed out waiting for LLM rate-limit capacity")
+
+    def acquire(self, tokens: float, priority: str = "interactive", timeout: Optional[float] = None):
+        """
+        Block until one request and `tokens` tokens are available.
+
+        Raises:
+            RateLimitTimeout: If capacity is not granted within timeout
+        """
+        woken = threading.Event()
+        ticket = self._enqueue(priority, woken.set)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waited = False
+        try:
+            while True:
+                # Cleared before checking, so a wake-up arriving after the check is not lost
+                woken.clear()
+                wait = self._try_take(ticket, tokens)
+                if wait == 0:
+                    break
+                waited = True
+                self._deadline_exceeded(deadline, ticket)
+                woken.wait(self._sleep_time(wait, deadline))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        if waited:
+            with self._lock:
+                self._counters["waited"] += 1
+
+    async def acquire_async(self, tokens: float, priority: str = "interactive", timeout: Optional[float] = None):
+        """
+        Await one request and `tokens` tokens without blocking the event loop.
+
+        Raises:
+            RateLimitTimeout: If capacity is not granted within timeout
+        """
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+        # Grants and refunds can happen on other threads
+        ticket = self._enqueue(priority, lambda: loop.call_soon_threadsafe(woken.set))
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waited = False
+        try:
+            while True:
+                woken.clear()
+                if self._shared:
+                    # Shared buckets mean a SQLite transaction; keep it off the event loop
+                    wait = await asyncio.to_thread(self._try_take, ticket, tokens)
+                else:
+                    wait = self._try_take(ticket, tokens)
+                if wait == 0:
+                    break
+                waited = True
+                self._deadline_exceeded(deadline, ticket)
+                try:
+                    await asyncio.wait_for(woken.wait(), self._sleep_time(wait, deadline))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        if waited:
+            with self._lock:
+                self._counters["waited"] += 1
+
+    def release_unused(self, tokens: float):
+        """Return over-estimated tokens to the bucket once actual usage is known."""
+        if tokens > 0:
+            with self._lock:
+                self._buckets.give_back(tokens)
+                self._wake_head()
+
+    async def release_unused_async(self, tokens: float):
+        """release_unused for coroutines; shared-bucket refunds are SQLite transactions, run off the event loop."""
+        if tokens <= 0:
+            return
+        if self._shared:
+            await asyncio.to_thread(self.release_unused, tokens)
+        else:
+            self.release_unused(tokens)
+
+    def stats(self) -> dict:
+        """Queue depth and grant/wait/timeout counters."""
+        with self._lock:
+            return dict(
+                queued=len(self._queue),
+                requests_per_minute=self._buckets.rpm,
+                tokens_per_minute=self._buckets.tpm,
+                **self._counters,
+            )
+
+
+_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_rate_limiter_initialized = False
+_init_lock = threading.Lock()
+
+# Seconds a caller may wait in the rate-limit queue before giving up
+ACQUIRE_TIMEOUT = float(os.getenv("PORTKEY_RATE_LIMIT_TIMEOUT", "30"))
+
+
+def get_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """
+    Get the shared LLM rate limiter, configured from PORTKEY_RPM, PORTKEY_TPM
+    and PORTKEY_RATE_LIMIT_SHARED_PATH.
+
+    Returns:
+        TokenBucketRateLimiter, or None if neither quota is set
+    """
+    global _rate_limiter, _rate_limiter_initialized
+    if _rate_limiter_initialized:
+        return _rate_limiter
+    with _init_lock:
+        if not _rate_limiter_initialized:
+            rpm = float(os.getenv("PORTKEY_RPM", "0"))
+            tpm = float(os.getenv("PORTKEY_TPM", "0"))
+            if rpm > 0 or tpm > 0:
+                # An unset quota is unlimited
+                _rate_limiter = TokenBucketRateLimiter(
+                    requests_per_minute=rpm if rpm > 0 else float("inf"),
+                    tokens_per_minute=tpm if tpm > 0 else float("inf"),
+                    shared_path=os.getenv("PORTKEY_RATE_LIMIT_SHARED_PATH") or None
+                )
+                logger.info(f"LLM rate limiter enabled: {rpm or 'unlimited'} RPM, {tpm or 'unlimited'} TPM")
+            _rate_limiter_initialized = True
+    return _rate_limiter
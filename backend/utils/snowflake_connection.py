@@ -1,45 +1,426 @@
 import os
+import sys
+import time
+import importlib.util
+import itertools
 import datetime
-from typing import Optional, Union
+import threading
+import tempfile
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Optional, Sequence, Union
 from pathlib import Path
 from dotenv import load_dotenv
 import pandas as pd
 import snowflake.connector
 from snowflake.connector.pandas_tools import write_pandas
 from utils.logger import get_logger
+from utils.metrics import SNOWFLAKE_SECONDS
+from utils.tracing import traced
+
 logger = get_logger(__name__)
-try:
-    from snowflake.sqlalchemy import URL
-    from sqlalchemy import create_engine, sql
-    SQLALCHEMY_AVAILABLE = True
-except ImportError:
-    logger.warning("snowflake.sqlalchemy or sqlalchemy not available. SQL Alchemy functionality will be disabled.")
-    SQLALCHEMY_AVAILABLE = False
-
-# Optional PySpark imports
-try:
-    from pyspark.sql import DataFrame as SparkDataFrame
-    from pyspark.sql.functions import col as _col
-    from pyspark.sql import SparkSession
-    from pyspark.sql.types import (
-        StringType, IntegerType, LongType, FloatType, DoubleType, BooleanType,
-        TimestampType, DateType, ArrayType, MapType, StructType, DecimalType,
-        ByteType, ShortType, BinaryType, NullType
-    )
-    PYSPARK_AVAILABLE = True
-except ImportError:
+
+
+# Optional backends are detected up front but imported lazily on first use, so
+# pandas-only callers never pay for importing PySpark or Polars.
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+PYSPARK_AVAILABLE = _module_available("pyspark")
+if not PYSPARK_AVAILABLE:
     logger.warning("pyspark not available. Spark functionality will be disabled.")
-    PYSPARK_AVAILABLE = False
-    # Define a fallback type alias to avoid NameError
-    SparkDataFrame = object  # Use object as a fallback type
-
-# Optional polars import
-try:
-    import polars as pl
-    POLARS_AVAILABLE = True
-except ImportError:
+
+POLARS_AVAILABLE = _module_available("polars")
+if not POLARS_AVAILABLE:
     logger.warning("polars not available. Polars functionality will be disabled.")
-    POLARS_AVAILABLE = False
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from pyspark.sql import DataFrame as SparkDataFrame
+
+# Result batches downloaded concurrently by iter_pandas_batches / iter_arrow_batches
+BATCH_DOWNLOAD_WORKERS = int(os.getenv("SNOWFLAKE_BATCH_DOWNLOAD_WORKERS", "4"))
+
+# Bulk loads: rows per staged Parquet file, and files written/uploaded concurrently
+BULK_CHUNK_ROWS = int(os.getenv("SNOWFLAKE_BULK_CHUNK_ROWS", "250000"))
+BULK_UPLOAD_WORKERS = int(os.getenv("SNOWFLAKE_BULK_UPLOAD_WORKERS", "4"))
+
+
+def _project_arrow(table: "pa.Table", columns: Optional[Sequence[str]]) -> "pa.Table":
+    """Select `columns` (case-insensitive) from an Arrow table and lowercase the column names."""
+    if columns:
+        by_lower = {name.lower(): name for name in table.column_names}
+        missing = [c for c in columns if c.lower() not in by_lower]
+        if missing:
+            raise ValueError(f"Columns not in query result: {', '.join(missing)}")
+        table = table.select([by_lower[c.lower()] for c in columns])
+    return table.rename_columns([name.lower() for name in table.column_names])
+
+
+def _downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer and float columns to the smallest dtype that holds their values exactly."""
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
+
+
+def _is_spark_dataframe(df) -> bool:
+    """Check for a Spark DataFrame without importing PySpark if nothing has loaded it yet."""
+    if not PYSPARK_AVAILABLE or "pyspark" not in sys.modules:
+        return False
+    from pyspark.sql import DataFrame as SparkDataFrame
+    return isinstance(df, SparkDataFrame)
+
+
+_ENV_FILE_PATH = Path(__file__).parent.parent / "config" / ".env"
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def _load_env_once():
+    """Load config/.env into the process environment the first time it is needed."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv(dotenv_path=_ENV_FILE_PATH, override=True)
+            _env_loaded = True
+
+
+class _PooledConnection:
+    """A Snowflake connection plus the bookkeeping the pool needs for eviction."""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class SnowflakeConnectionPool:
+    """
+    Bounded pool of long-lived Snowflake connections.
+
+    Connections are opened lazily up to ``max_size`` and handed back to the
+    pool on release instead of being closed. Idle connections above
+    ``min_size`` are evicted after ``max_idle_seconds``, every connection is
+    retired after ``max_lifetime_seconds``, and a connection that sat idle for
+    longer than ``health_check_after_seconds`` is pinged before checkout.
+    """
+
+    def __init__(
+        self,
+        params: dict,
+        min_size: int = 1,
+        max_size: int = 8,
+        max_idle_seconds: float = 300,
+        max_lifetime_seconds: float = 3600,
+        health_check_after_seconds: float = 30,
+        checkout_timeout: float = 30,
+    ):
+        """
+        Create a pool for one set of connection parameters.
+
+        Args:
+            params: Keyword arguments for snowflake.connector.connect
+            min_size: Idle connections kept open regardless of idle time
+            max_size: Maximum number of open connections (idle + in use)
+            max_idle_seconds: Idle time after which surplus connections are closed
+            max_lifetime_seconds: Age after which a connection is always replaced
+            health_check_after_seconds: Idle time after which a connection is pinged on checkout
+            checkout_timeout: Seconds to wait for a free connection before raising TimeoutError
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size bounds: min_size={min_size}, max_size={max_size}")
+        self.params = params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.health_check_after_seconds = health_check_after_seconds
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._counters = dict(
+            created=0, closed=0, checkouts=0, reuses=0,
+            health_check_failures=0, checkout_timeouts=0,
+        )
+
+    def _is_expired(self, pooled: _PooledConnection, now: float) -> bool:
+        return now - pooled.created_at > self.max_lifetime_seconds
+
+    def _close_quietly(self, pooled: _PooledConnection):
+        try:
+            pooled.conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled Snowflake connection: {e}")
+
+    def _is_healthy(self, pooled: _PooledConnection, now: float) -> bool:
+        """Check a connection before handing it out; ping it only if it sat idle a while."""
+        try:
+            if pooled.conn.is_closed():
+                return False
+            if now - pooled.last_used > self.health_check_after_seconds:
+                cursor = pooled.conn.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled Snowflake connection failed health check: {e}")
+            return False
+
+    def _evict_idle_locked(self, now: float) -> list:
+        """Remove expired/idle-surplus connections; caller closes them outside the lock."""
+        evicted = []
+        kept = deque()
+        while self._idle:
+            pooled = self._idle.popleft()
+            idle_for = now - pooled.last_used
+            surplus = self._size - len(evicted) > self.min_size
+            if self._is_expired(pooled, now) or (surplus and idle_for > self.max_idle_seconds):
+                evicted.append(pooled)
+            else:
+                kept.append(pooled)
+        self._idle = kept
+        self._size -= len(evicted)
+        self._counters["closed"] += len(evicted)
+        return evicted
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check out a connection, opening a new one if the pool has room.
+
+        Args:
+            timeout: Seconds to wait when the pool is exhausted (defaults to checkout_timeout)
+
+        Returns:
+            A snowflake.connector connection
+
+        Raises:
+            TimeoutError: If no connection becomes available in time
+            RuntimeError: If the pool has been closed
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Snowflake connection pool is closed")
+                evicted = self._evict_idle_locked(time.monotonic())
+                pooled = None
+                open_new = False
+                while pooled is None and not open_new:
+                    if self._idle:
+                        pooled = self._idle.pop()  # LIFO keeps hot connections warm
+                    elif self._size < self.max_size:
+                        self._size += 1
+                        open_new = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._counters["checkout_timeouts"] += 1
+                            raise TimeoutError(
+                                f"Timed out after {timeout}s waiting for a Snowflake connection "
+                                f"(pool max_size={self.max_size})"
+                            )
+                        self._waiting += 1
+                        try:
+                            self._cond.wait(remaining)
+                        finally:
+                            self._waiting -= 1
+
+            for stale in evicted:
+                self._close_quietly(stale)
+
+            if open_new:
+                try:
+                    conn = snowflake.connector.connect(**self.params)
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                pooled = _PooledConnection(conn)
+                with self._cond:
+                    self._counters["created"] += 1
+                    self._counters["checkouts"] += 1
+                    self._in_use[id(conn)] = pooled
+                    size = self._size
+                logger.info(f"Opened new pooled Snowflake connection ({size}/{self.max_size})")
+                return conn
+
+            if self._is_healthy(pooled, time.monotonic()):
+                with self._cond:
+                    self._counters["checkouts"] += 1
+                    self._counters["reuses"] += 1
+                    self._in_use[id(pooled.conn)] = pooled
+                return pooled.conn
+
+            # Unhealthy: drop it and try again
+            self._close_quietly(pooled)
+            with self._cond:
+                self._size -= 1
+                self._counters["closed"] += 1
+                self._counters["health_check_failures"] += 1
+                self._cond.notify()
+
+    def release(self, conn, discard: bool = False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection previously returned by acquire()
+            discard: Close the connection instead of reusing it (e.g. after a connection error)
+        """
+        now = time.monotonic()
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+            if pooled is None:
+                logger.warning("Released a connection that does not belong to this pool")
+                return
+            pooled.last_used = now
+            reuse = not (discard or self._closed or self._is_expired(pooled, now) or conn.is_closed())
+            if reuse:
+                self._idle.append(pooled)
+            else:
+                self._size -= 1
+                self._counters["closed"] += 1
+            self._cond.notify()
+        if not reuse:
+            self._close_quietly(pooled)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that checks out a connection and always returns it."""
+        conn = self.acquire(timeout=timeout)
+        try:
+            yield conn
+        except snowflake.connector.errors.OperationalError:
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def prune(self):
+        """Close idle connections that exceeded their idle time or lifetime."""
+        with self._cond:
+            evicted = self._evict_idle_locked(time.monotonic())
+        for pooled in evicted:
+            self._close_quietly(pooled)
+        return len(evicted)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of pool occupancy and lifetime counters.
+
+        Returns:
+            dict: size, idle, in_use, waiting, min/max size and cumulative counters
+        """
+        with self._cond:
+            return dict(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                waiting=self._waiting,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                **self._counters,
+            )
+
+    def close(self):
+        """Close all idle connections; in-use connections are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._counters["closed"] += len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_quietly(pooled)
+        logger.info("Snowflake connection pool closed")
+
+
+_pools: Dict[tuple, SnowflakeConnectionPool] = {}
+_pools_lock = threading.Lock()
+_POOL_KEY_FIELDS = ("account", "user", "database", "schema", "warehouse", "role")
+
+
+def get_connection_pool(params: dict) -> SnowflakeConnectionPool:
+    """
+    Get the shared pool for a set of connection parameters, creating it on first use.
+
+    Pool sizing comes from SNOWFLAKE_POOL_MIN_SIZE, SNOWFLAKE_POOL_MAX_SIZE,
+    SNOWFLAKE_POOL_MAX_IDLE_SECONDS, SNOWFLAKE_POOL_MAX_LIFETIME_SECONDS and
+    SNOWFLAKE_POOL_CHECKOUT_TIMEOUT.
+
+    Args:
+        params: Keyword arguments for snowflake.connector.connect
+
+    Returns:
+        SnowflakeConnectionPool
+    """
+    key = tuple(params.get(field) for field in _POOL_KEY_FIELDS)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SnowflakeConnectionPool(
+                params=dict(params),
+                min_size=int(os.getenv("SNOWFLAKE_POOL_MIN_SIZE", "1")),
+                max_size=int(os.getenv("SNOWFLAKE_POOL_MAX_SIZE", "8")),
+                max_idle_seconds=float(os.getenv("SNOWFLAKE_POOL_MAX_IDLE_SECONDS", "300")),
+                max_lifetime_seconds=float(os.getenv("SNOWFLAKE_POOL_MAX_LIFETIME_SECONDS", "3600")),
+                checkout_timeout=float(os.getenv("SNOWFLAKE_POOL_CHECKOUT_TIMEOUT", "30")),
+            )
+            _pools[key] = pool
+            logger.info(f"Created Snowflake connection pool (max_size={pool.max_size})")
+        return pool
+
+
+def get_pool_stats() -> Dict[str, dict]:
+    """Return occupancy stats for every connection pool, keyed by 'user@account/warehouse'."""
+    return {
+        f"{key[1]}@{key[0]}/{key[4]}": pool.stats()
+        for key, pool in list(_pools.items())
+    }
+
+
+def close_all_pools():
+    """Close every shared connection pool (e.g. on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
 
 class SnowflakeHook:
     # Class-level variable to store persistent Spark session
@@ -96,6 +477,7 @@ class SnowflakeHook:
         spark_config: Optional[dict] = None,
         use_persistent_spark: bool = False,
         insecure_mode: bool = True,
+        use_pool: bool = False,
     ):
         """
         Instantiate snowflake hook with connection parameters.
@@ -113,11 +495,11 @@ class SnowflakeHook:
             spark_config: Additional Spark configuration parameters (optional)
             use_persistent_spark: Whether to use a persistent Spark session (default: False)
             insecure_mode: Whether to use insecure mode for certificate validation (default: True)
+            use_pool: Borrow connections from the shared connection pool instead of
+                opening a new session per hook (default: False)
         """
-        # First check for environment variables from shell profile for username and password
-        # These take highest priority
-        env_file_path = Path(__file__).parent.parent / "config" / ".env"
-        load_dotenv(dotenv_path=env_file_path, override=True)
+        # Load config/.env once per process; explicit arguments take highest priority
+        _load_env_once()
         self.user = username or os.getenv("SNOWFLAKE_USER")
         self.database = database or os.getenv("SNOWFLAKE_DATABASE", "proddb")
         self.schema = schema or os.getenv("SNOWFLAKE_SCHEMA", "public")
@@ -143,45 +525,62 @@ class SnowflakeHook:
         # Initialize connection attributes
         self.conn = None
         self.cursor = None
+        self.use_pool = use_pool
+        self._pool = get_connection_pool(self.params) if use_pool else None
+
+        # Spark is created lazily on first use of method='spark' (see the spark property)
+        self._spark = spark
+        self._spark_init_attempted = spark is not None
+        self._create_local_spark = create_local_spark
+        self._spark_config = spark_config
+        if spark is not None:
+            logger.info("Using provided Spark session")
+
+        # Snowflake connection parameters for the Spark connector
+        self.sfparams = dict(
+            sfUrl=f"{self.account}.snowflakecomputing.com",
+            sfAccount=self.account,
+            sfUser=self.user,
+            sfPassword=self.password,
+            sfDatabase=self.database,
+            sfSchema=self.schema,
+            sfWarehouse=self.warehouse,
+            sfRole=self.role
+        )
+
+    @property
+    def spark(self):
+        """
+        Spark session for this hook, created on first access.
 
-        # Setup Spark parameters if Spark is available
-        if PYSPARK_AVAILABLE:
-            # Use provided spark session or existing persistent session if requested
-            if spark is not None:
-                self.spark = spark
-                logger.info("Using provided Spark session")
-            elif use_persistent_spark:
+        Returns:
+            pyspark.sql.SparkSession or None if PySpark is unavailable or startup failed
+        """
+        if self._spark is None and not self._spark_init_attempted and PYSPARK_AVAILABLE:
+            self._spark_init_attempted = True
+            if self.use_persistent_spark:
                 # Use or create a persistent Spark session
-                self.spark = self.get_or_create_spark_session(
+                self._spark = self.get_or_create_spark_session(
                     app_name="SnowflakeHook",
-                    local_mode=create_local_spark,
-                    additional_configs=spark_config
+                    local_mode=self._create_local_spark,
+                    additional_configs=self._spark_config
                 )
             else:
                 try:
-                    self.spark = self.create_optimized_spark_session(
+                    self._spark = self.create_optimized_spark_session(
                         app_name="SnowflakeHook",
-                        local_mode=create_local_spark,
-                        additional_configs=spark_config
+                        local_mode=self._create_local_spark,
+                        additional_configs=self._spark_config
                     )
                 except Exception as e:
                     logger.error(f"Failed to create Spark session: {str(e)}")
-                    self.spark = None
-
-            # Setup Snowflake connection parameters for Spark
-            if self.spark is not None:
-                self.sfparams = dict(
-                    sfUrl=f"{self.account}.snowflakecomputing.com",
-                    sfAccount=self.account,
-                    sfUser=self.user,
-                    sfPassword=self.password,
-                    sfDatabase=self.database,
-                    sfSchema=self.schema,
-                    sfWarehouse=self.warehouse,
-                    sfRole=self.role
-                )
-        else:
-            self.spark = None
+                    self._spark = None
+        return self._spark
+
+    @spark.setter
+    def spark(self, session):
+        self._spark = session
+        self._spark_init_attempted = True
 
     def _validate_params(self):
         """
@@ -203,6 +602,7 @@ class SnowflakeHook:
         if missing_params:
             raise ValueError(f"Missing required Snowflake connection parameters: {', '.join(missing_params)}")
 
+    @traced("snowflake.connect")
     def connect(self):
         """
         Establish a connection to Snowflake.
@@ -214,20 +614,35 @@ class SnowflakeHook:
             Exception: If connection fails.
         """
         try:
-            self.conn = snowflake.connector.connect(**self.params)
+            with SNOWFLAKE_SECONDS.time(phase="connect"):
+                if self._pool is not None:
+                    self.conn = self._pool.acquire()
+                    logger.debug("Checked out pooled Snowflake connection")
+                    return self.conn
+                self.conn = snowflake.connector.connect(**self.params)
             logger.info("Successfully connected to Snowflake")
             return self.conn
         except Exception as e:
             logger.error(f"Error connecting to Snowflake: {str(e)}")
             raise
 
-    def close(self):
-        """Close the Snowflake connection."""
+    def close(self, discard: bool = False):
+        """
+        Close the Snowflake connection, or return it to the pool when pooled.
+
+        Args:
+            discard: For pooled connections, close instead of returning to the pool
+        """
         if self.cursor:
             self.cursor.close()
             self.cursor = None
 
         if self.conn:
+            if self._pool is not None:
+                self._pool.release(self.conn, discard=discard)
+                self.conn = None
+                logger.debug("Returned Snowflake connection to pool")
+                return
             self.conn.close()
             self.conn = None
             logger.info("Snowflake connection closed")
@@ -242,6 +657,8 @@ class SnowflakeHook:
         if not PYSPARK_AVAILABLE:
             raise RuntimeError("PySpark is not available. Please install it with 'pip install pyspark'")
 
+        from pyspark.sql import SparkSession
+
         try:
             builder = SparkSession.builder \
                 .appName(app_name) \
@@ -280,6 +697,7 @@ class SnowflakeHook:
             logger.error(f"Failed to create optimized Spark session: {str(e)}")
             raise
 
+    @traced("snowflake.query_snowflake")
     def query_snowflake(self, query: str, method: Optional[str] = 'pandas'):
         """
         Execute a query against Snowflake.
@@ -288,16 +706,21 @@ class SnowflakeHook:
             query: SQL query to execute
             method: Query execution method:
                 - 'pandas': Uses the Snowflake connector with pandas (default)
+                - 'pandas_arrow': pandas backed by the fetched Arrow buffers (pd.ArrowDtype
+                  columns), skipping conversion to NumPy/Python objects
+                - 'arrow': Returns the pyarrow.Table fetched by the connector
                 - 'spark': Uses PySpark with optimized network settings for local execution
-                - 'polars': Uses Polars DataFrame library (if available)
+                - 'polars': Uses Polars DataFrame library (if available), built from Arrow
 
         Returns:
-            pandas.DataFrame, pyspark.sql.DataFrame, polars.DataFrame: Query results
+            pandas.DataFrame, pyarrow.Table, pyspark.sql.DataFrame, polars.DataFrame: Query results
             Return type depends on the method parameter
         """
 
         if method == 'spark' and PYSPARK_AVAILABLE and self.spark is not None:
             # Spark method (only if available)
+            from pyspark.sql.functions import col as _col
+
             try:
                 logger.info(f"Executing query (spark): {query[:100]}...")
                 df = self.spark.read.format("snowflake")\
@@ -312,17 +735,29 @@ class SnowflakeHook:
                 logger.error(f"Error executing spark query: {str(e)}")
                 raise
 
-        elif method == 'polars' and POLARS_AVAILABLE and SQLALCHEMY_AVAILABLE:
-            # Polars method (only if available)
+        elif method == 'polars' and POLARS_AVAILABLE:
+            # Polars method (only if available); columnar end to end on the hook's connection
+            import polars as pl
+
             try:
                 logger.info(f"Executing query (polars): {query[:100]}...")
-                with create_engine(URL(**self.params)).connect() as ctx:
-                    df = pl.read_database(sql.text(query), ctx)
-                    df = df.rename({col: col.lower() for col in df.columns})
-                    return df
+                table = self.fetch_arrow_all(query)
+                return pl.from_arrow(table.rename_columns([c.lower() for c in table.column_names]))
             except Exception as e:
                 logger.error(f"Error executing polars query: {str(e)}")
                 raise
+
+        elif method in ('arrow', 'pandas_arrow'):
+            try:
+                logger.info(f"Executing query ({method}): {query[:100]}...")
+                table = self.fetch_arrow_all(query)
+                table = table.rename_columns([c.lower() for c in table.column_names])
+                if method == 'arrow':
+                    return table
+                return table.to_pandas(types_mapper=pd.ArrowDtype)
+            except Exception as e:
+                logger.error(f"Error executing {method} query: {str(e)}")
+                raise
         else:
             # Pandas method
             try:
@@ -333,8 +768,10 @@ class SnowflakeHook:
                 # Execute query
                 logger.info("Executing query (pandas)")
                 self.cursor = self.conn.cursor()
-                self.cursor.execute(query)
-                df = self.cursor.fetch_pandas_all()
+                with SNOWFLAKE_SECONDS.time(phase="query"):
+                    self.cursor.execute(query)
+                with SNOWFLAKE_SECONDS.time(phase="fetch"):
+                    df = self.cursor.fetch_pandas_all()
 
                 # Convert column names to lowercase
                 df.columns = map(str.lower, df.columns)
@@ -343,6 +780,7 @@ class SnowflakeHook:
                 logger.error(f"Error executing pandas query: {str(e)}")
                 raise
 
+    @traced("snowflake.query_without_result")
     def query_without_result(self, query: str):
         """
         Run a query without returning a result.
@@ -355,7 +793,8 @@ class SnowflakeHook:
             if not self.conn:
                 self.connect()
             self.cursor = self.conn.cursor()
-            self.cursor.execute(query)
+            with SNOWFLAKE_SECONDS.time(phase="query"):
+                self.cursor.execute(query)
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
             raise
@@ -384,33 +823,59 @@ class SnowflakeHook:
             exc_val: Exception value if any occurred.
             exc_tb: Exception traceback if any occurred.
         """
-        # Close Snowflake connection
-        self.close()
+        # Close Snowflake connection (a broken pooled connection is not reused)
+        self.close(discard=exc_type is not None and issubclass(exc_type, snowflake.connector.errors.OperationalError))
 
-        # Don't stop spark session if it's persistent
-        if PYSPARK_AVAILABLE and self.spark is not None and not self.use_persistent_spark:
-            if self.spark is not SnowflakeHook._persistent_spark_session:
-                self.spark.stop()
+        # Don't stop spark session if it's persistent (or was never started)
+        if self._spark is not None and not self.use_persistent_spark:
+            if self._spark is not SnowflakeHook._persistent_spark_session:
+                self._spark.stop()
 
         return False  # Re-raise any exceptions that occurred
 
-    def write_to_snowflake(self, df, table_name: str, mode: str = "append", method: str = "pandas"):
+    @traced("snowflake.write_to_snowflake")
+    def write_to_snowflake(self, df, table_name: str, mode: str = "append", method: str = "pandas",
+                           chunk_size: Optional[int] = None, compression: Optional[str] = None,
+                           parallel: int = 4, merge_keys: Optional[Sequence[str]] = None,
+                           grant: bool = True):
         """
         Write a DataFrame to a Snowflake table.
 
         Args:
-            df: DataFrame to write (pandas, Spark, or polars)
+            df: DataFrame to write (pandas, Spark, or polars); with method='bulk' also
+                an iterable of pandas DataFrames, streamed chunk by chunk
             table_name: Name of the target table
-            mode: Write mode (append, overwrite, error, ignore)
+            mode: Write mode (append, overwrite, error, ignore); 'bulk' supports
+                append, overwrite and merge
             method: Method to use:
                 - 'pandas': Uses the Snowflake connector with pandas (default)
+                - 'bulk': Parallel chunked Parquet upload and COPY INTO (see bulk_load)
                 - 'spark': Uses PySpark with optimized network settings
                 - 'polars': Uses Polars DataFrame library (if available)
+            chunk_size: Rows per staged Parquet file ('pandas' and 'bulk')
+            compression: Parquet compression ('gzip' or 'snappy'; 'pandas' defaults to gzip,
+                'bulk' to snappy)
+            parallel: Threads per file upload ('pandas' and 'bulk')
+            merge_keys: Key columns for mode='merge'
+            grant: Grant read/admin access on the table after writing
 
         Returns:
             bool: True if successful, False otherwise
 
         """
+        if method == 'bulk':
+            try:
+                self.bulk_load(
+                    df, table_name, mode=mode, merge_keys=merge_keys, chunk_size=chunk_size,
+                    compression=compression or "snappy", parallel=parallel
+                )
+                if grant:
+                    self.grant_access(table_name)
+                return True
+            except Exception as e:
+                logger.error(f"Error bulk loading into Snowflake: {str(e)}")
+                raise
+
         if method == 'pandas':
             # Write using pandas
             try:
@@ -418,16 +883,26 @@ class SnowflakeHook:
                     self.connect()
 
                 logger.info(f"Writing DataFrame to Snowflake table {table_name} using pandas")
-                success, num_chunks, num_rows, output = write_pandas(
-                    conn=self.conn,
-                    df=df,
-                    table_name=table_name,
-                    database=self.database,
-                    schema=self.schema,
-                    quote_identifiers=False
+                start = time.perf_counter()
+                with SNOWFLAKE_SECONDS.time(phase="write"):
+                    success, num_chunks, num_rows, output = write_pandas(
+                        conn=self.conn,
+                        df=df,
+                        table_name=table_name,
+                        database=self.database,
+                        schema=self.schema,
+                        chunk_size=chunk_size,
+                        compression=compression or "gzip",
+                        parallel=parallel,
+                        quote_identifiers=False
+                    )
+                elapsed = time.perf_counter() - start
+                if grant:
+                    self.grant_access(table_name)
+                logger.info(
+                    f"Successfully wrote {num_rows} rows to {table_name} in {num_chunks} chunks "
+                    f"({num_rows / elapsed if elapsed else 0:,.0f} rows/s)"
                 )
-                self.grant_access(table_name)
-                logger.info(f"Successfully wrote {num_rows} rows to {table_name}")
                 return success
             except Exception as e:
                 logger.error(f"Error writing DataFrame to Snowflake using pandas: {str(e)}")
@@ -442,7 +917,7 @@ class SnowflakeHook:
                 if isinstance(df, pd.DataFrame):
                     # Convert pandas to Spark
                     spark_df = self.spark.createDataFrame(df)
-                elif not isinstance(df, SparkDataFrame):
+                elif not _is_spark_dataframe(df):
                     raise ValueError("DataFrame must be a pandas DataFrame or Spark DataFrame when using 'spark' method")
                 else:
                     spark_df = df
@@ -465,9 +940,164 @@ class SnowflakeHook:
             if method != 'pandas':
                 logger.warning(f"Method '{method}' not supported or required packages not available. Using pandas instead.")
 
-            return self.write_to_snowflake(df, table_name, mode, method='pandas')
+            return self.write_to_snowflake(
+                df, table_name, mode, method='pandas', chunk_size=chunk_size,
+                compression=compression, parallel=parallel, grant=grant
+            )
+
+    def _qualified(self, table_name: str) -> str:
+        """Fully qualify a bare table name with the hook's database and schema."""
+        return table_name if "." in table_name else f"{self.database}.{self.schema}.{table_name}"
+
+    def _stage_frames(self, frames: Iterable[pd.DataFrame], stage: str, chunk_size: int,
+                      compression: str, parallel: int, max_workers: int) -> tuple:
+        """
+        Write frames to the stage as Parquet files, max_workers files at a time.
+
+        Frames are consumed lazily and at most 2 * max_workers chunks are in
+        flight, so iterator input is loaded in bounded memory.
+
+        Returns:
+            tuple: (rows, files, columns)
+        """
+        columns = None
+        rows = files = 0
+        pending = deque()
+
+        def upload(chunk: pd.DataFrame, path: str):
+            # Microsecond timestamps: Snowflake rejects Parquet's default nanosecond precision
+            chunk.to_parquet(path, compression=compression, index=False,
+                             coerce_timestamps="us", allow_truncated_timestamps=True)
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(
+                    f"PUT 'file://{Path(path).as_posix()}' @{stage} PARALLEL={parallel} "
+                    f"AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=AUTO_DETECT"
+                )
+            finally:
+                cursor.close()
+                os.remove(path)
+
+        with tempfile.TemporaryDirectory(prefix="snowflake-bulk-") as tmp_dir, \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snowflake-bulk") as pool:
+            try:
+                for frame in frames:
+                    if columns is None:
+                        columns = list(frame.columns)
+                    elif list(frame.columns) != columns:
+                        raise ValueError(f"Frame columns {list(frame.columns)} do not match {columns}")
+                    for start in range(0, len(frame), chunk_size):
+                        chunk = frame.iloc[start:start + chunk_size]
+                        pending.append(pool.submit(upload, chunk, os.path.join(tmp_dir, f"chunk{files}.parquet")))
+                        files += 1
+                        rows += len(chunk)
+                        while len(pending) >= 2 * max_workers:
+                            pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+        return rows, files, columns
+
+    @traced("snowflake.bulk_load")
+    def bulk_load(self, frames: Union[pd.DataFrame, Iterable[pd.DataFrame]], table_name: str,
+                  mode: str = "append", merge_keys: Optional[Sequence[str]] = None,
+                  chunk_size: Optional[int] = None, compression: str = "snappy", parallel: int = 4,
+                  max_workers: Optional[int] = None) -> dict:
+        """
+        Load DataFrames into an existing table through a temporary stage.
+
+        Frames are split into Parquet files that are written and PUT
+        concurrently, then loaded with one COPY INTO. Column names are
+        matched to the table case-insensitively.
+
+        Args:
+            frames: A DataFrame or an iterable of DataFrames with identical columns
+            table_name: Target table (bare names use the hook's database and schema)
+            mode: 'append', 'overwrite' (truncate first) or 'merge' (upsert on merge_keys;
+                rows must be unique per key, so reruns are idempotent)
+            merge_keys: Key columns for mode='merge'
+            chunk_size: Rows per Parquet file (defaults to SNOWFLAKE_BULK_CHUNK_ROWS)
+            compression: Parquet compression ('snappy' or 'gzip')
+            parallel: Threads per file upload
+            max_workers: Files written and uploaded concurrently
+                (defaults to SNOWFLAKE_BULK_UPLOAD_WORKERS)
+
+        Returns:
+            dict: rows, files, seconds and rows_per_sec
+
+        Raises:
+            ValueError: For an unknown mode, missing merge keys or mismatched frame columns
+        """
+        if mode not in ("append", "overwrite", "merge"):
+            raise ValueError(f"Unsupported bulk load mode: {mode}")
+        if mode == "merge" and not merge_keys:
+            raise ValueError("mode='merge' requires merge_keys")
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        if not self.conn:
+            self.connect()
+
+        target = self._qualified(table_name)
+        suffix = uuid.uuid4().hex[:12].upper()
+        stage = f"{self.database}.{self.schema}.SPIRIT_BULK_STAGE_{suffix}"
+        start = time.perf_counter()
+
+        with SNOWFLAKE_SECONDS.time(phase="write"):
+            self.query_without_result(f"CREATE TEMPORARY STAGE {stage} FILE_FORMAT = (TYPE = PARQUET)")
+            try:
+                rows, files, columns = self._stage_frames(
+                    frames, stage, chunk_size or BULK_CHUNK_ROWS, compression, parallel,
+                    max_workers or BULK_UPLOAD_WORKERS
+                )
+                copy_options = (
+                    "FILE_FORMAT = (TYPE = PARQUET USE_LOGICAL_TYPE = TRUE) "
+                    "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PURGE = TRUE ON_ERROR = ABORT_STATEMENT"
+                )
+                if mode == "merge" and files:
+                    staging = f"{self.database}.{self.schema}.SPIRIT_BULK_MERGE_{suffix}"
+                    self.query_without_result(f"CREATE TEMPORARY TABLE {staging} LIKE {target}")
+                    try:
+                        self.query_without_result(f"COPY INTO {staging} FROM @{stage} {copy_options}")
+                        self.query_without_result(self._merge_sql(target, staging, columns, merge_keys))
+                    finally:
+                        self.query_without_result(f"DROP TABLE IF EXISTS {staging}")
+                else:
+                    if mode == "overwrite":
+                        self.query_without_result(f"TRUNCATE TABLE IF EXISTS {target}")
+                    if files:
+                        self.query_without_result(f"COPY INTO {target} FROM @{stage} {copy_options}")
+            finally:
+                # Temporary objects outlive the load on pooled connections, so drop them explicitly
+                self.query_without_result(f"DROP STAGE IF EXISTS {stage}")
+
+        elapsed = time.perf_counter() - start
+        stats = dict(rows=rows, files=files, seconds=round(elapsed, 3),
+                     rows_per_sec=round(rows / elapsed, 1) if elapsed else 0.0)
+        logger.info(
+            f"Bulk loaded {rows} rows into {target} ({mode}) from {files} Parquet files "
+            f"in {elapsed:.1f}s ({stats['rows_per_sec']:,.0f} rows/s)"
+        )
+        return stats
 
-    def infer_create_table(self, df: Union[pd.DataFrame, SparkDataFrame], table_name: str,
+    @staticmethod
+    def _merge_sql(target: str, source: str, columns: Sequence[str], merge_keys: Sequence[str]) -> str:
+        """MERGE statement upserting every column of source into target on merge_keys."""
+        keys = {key.lower() for key in merge_keys}
+        missing = keys - {col.lower() for col in columns}
+        if missing:
+            raise ValueError(f"Merge keys not in data: {', '.join(sorted(missing))}")
+        on = " AND ".join(f"t.{key} = s.{key}" for key in merge_keys)
+        updates = ", ".join(f"t.{col} = s.{col}" for col in columns if col.lower() not in keys)
+        insert_cols = ", ".join(columns)
+        insert_vals = ", ".join(f"s.{col}" for col in columns)
+        sql = f"MERGE INTO {target} t USING {source} s ON {on} "
+        if updates:
+            sql += f"WHEN MATCHED THEN UPDATE SET {updates} "
+        return sql + f"WHEN NOT MATCHED THEN INSERT ({insert_cols}) VALUES ({insert_vals})"
+
+    def infer_create_table(self, df: Union[pd.DataFrame, "SparkDataFrame"], table_name: str,
                            schema: Optional[str] = None, database: Optional[str] = None) -> tuple:
         """
         Infer a CREATE TABLE statement and prepare the data for upload from a DataFrame.
@@ -543,7 +1173,13 @@ class SnowflakeHook:
 
             return create_table, df_to_upload
 
-        elif PYSPARK_AVAILABLE and isinstance(df, SparkDataFrame):
+        elif _is_spark_dataframe(df):
+            from pyspark.sql.types import (
+                StringType, IntegerType, LongType, FloatType, DoubleType, BooleanType,
+                TimestampType, DateType, ArrayType, MapType, StructType, DecimalType,
+                ByteType, ShortType, BinaryType, NullType
+            )
+
             # For Spark DataFrames
             spark_schema = df.schema
 
@@ -605,19 +1241,27 @@ class SnowflakeHook:
         else:
             raise TypeError("Input must be a pandas DataFrame or a Spark DataFrame")
 
-    def create_and_populate_table(self, df: Union[pd.DataFrame, SparkDataFrame], table_name: str,
-                                 schema: Optional[str] = None, database: Optional[str] = None,
-                                 method: Optional[str] = None) -> bool:
+    def create_and_populate_table(self, df: Union[pd.DataFrame, "SparkDataFrame", Iterable[pd.DataFrame]],
+                                 table_name: str, schema: Optional[str] = None, database: Optional[str] = None,
+                                 method: Optional[str] = None, merge_keys: Optional[Sequence[str]] = None,
+                                 chunk_size: Optional[int] = None, compression: Optional[str] = None,
+                                 parallel: int = 4) -> bool:
         """
         Create a new table based on DataFrame schema and populate it with data.
 
         Args:
-            df: DataFrame to analyze and upload (pandas or Spark)
+            df: DataFrame to analyze and upload (pandas or Spark); with method='bulk'
+                also an iterable of pandas DataFrames (the schema comes from the first)
             table_name: Name of the target table
             schema: Schema name to use (defaults to self.schema if None)
             database: Database name to use (defaults to self.database if None)
-            method: Method to use for data upload ('pandas' or 'spark').
+            method: Method to use for data upload ('pandas', 'bulk' or 'spark').
                    If None, auto-detects based on DataFrame type.
+            merge_keys: Upsert into the table on these columns instead of replacing it;
+                the table is only created if it does not exist (requires method='bulk')
+            chunk_size: Rows per staged Parquet file ('pandas' and 'bulk')
+            compression: Parquet compression ('pandas' and 'bulk')
+            parallel: Threads per file upload ('pandas' and 'bulk')
 
         Returns:
             bool: True if successful
@@ -629,11 +1273,21 @@ class SnowflakeHook:
             # Auto-detect method based on DataFrame type if not specified
             if method is None:
                 if isinstance(df, pd.DataFrame):
-                    method = "pandas"
-                elif PYSPARK_AVAILABLE and isinstance(df, SparkDataFrame):
+                    method = "bulk" if merge_keys else "pandas"
+                elif _is_spark_dataframe(df):
                     method = "spark"
                 else:
-                    method = "pandas"  # Default fallback
+                    method = "bulk"  # Iterable of pandas DataFrames
+            if merge_keys and method != "bulk":
+                raise ValueError("merge_keys requires method='bulk'")
+
+            frames = None
+            if method == "bulk" and not isinstance(df, pd.DataFrame):
+                # Stream an iterable of frames: infer the schema from the first one
+                frames = iter(df)
+                df = next(frames, None)
+                if df is None:
+                    raise ValueError("No DataFrames to load")
 
             # Generate the CREATE TABLE statement and prepare the DataFrame
             create_table_sql, prepared_df = self.infer_create_table(
@@ -643,13 +1297,34 @@ class SnowflakeHook:
                 database=database
             )
 
+            if merge_keys:
+                create_table_sql = create_table_sql.replace("CREATE OR REPLACE TABLE", "CREATE TABLE IF NOT EXISTS", 1)
             self.query_without_result(create_table_sql)
             logger.info(f"Successfully created table {table_name}")
+
+            if method == "bulk":
+                if frames is not None:
+                    rest = (self.infer_create_table(frame, table_name, schema, database)[1] for frame in frames)
+                    prepared_df = itertools.chain([prepared_df], rest)
+                return self.write_to_snowflake(
+                    df=prepared_df,
+                    table_name=f"{database or self.database}.{schema or self.schema}.{table_name}",
+                    mode="merge" if merge_keys else "append",
+                    method="bulk",
+                    chunk_size=chunk_size,
+                    compression=compression,
+                    parallel=parallel,
+                    merge_keys=merge_keys
+                )
+
             success = self.write_to_snowflake(
                 df=prepared_df,
                 table_name=table_name,
                 mode="append",
-                method=method
+                method=method,
+                chunk_size=chunk_size,
+                compression=compression,
+                parallel=parallel
             )
 
             return success
@@ -657,6 +1332,7 @@ class SnowflakeHook:
             logger.error(f"Error creating and populating table {table_name}: {str(e)}")
             raise
 
+    @traced("snowflake.fetch_pandas_all")
     def fetch_pandas_all(self, query, params=None):
         """
         Directly execute a query and fetch all results as a pandas DataFrame.
@@ -676,8 +1352,143 @@ class SnowflakeHook:
         # Ensure we have a cursor
         if not hasattr(self, 'cursor') or self.cursor is None:
             self.cursor = self.conn.cursor()
-        self.cursor.execute(query, params)
-        return self.cursor.fetch_pandas_all()
+        with SNOWFLAKE_SECONDS.time(phase="query"):
+            self.cursor.execute(query, params)
+        with SNOWFLAKE_SECONDS.time(phase="fetch"):
+            return self.cursor.fetch_pandas_all()
+
+    @traced("snowflake.fetch_arrow_all")
+    def fetch_arrow_all(self, query, params=None) -> "pa.Table":
+        """
+        Directly execute a query and fetch all results as a pyarrow Table.
+
+        Uses the connector's Arrow result format, so no Python row objects are
+        built; pl.from_arrow and Table.to_pandas can consume it without copies
+        for most column types.
+
+        Args:
+            query (str): SQL query to execute
+            params (dict, optional): Parameters to bind to the query
+
+        Returns:
+            pyarrow.Table: Query results (an empty table with the result schema if no rows)
+        """
+        if not self.conn:
+            self.connect()
+
+        cursor = self.conn.cursor()
+        try:
+            with SNOWFLAKE_SECONDS.time(phase="query"):
+                cursor.execute(query, params)
+            with SNOWFLAKE_SECONDS.time(phase="fetch"):
+                return cursor.fetch_arrow_all(force_return_table=True)
+        finally:
+            cursor.close()
+
+    def _result_batches(self, query: str, params=None) -> list:
+        """Execute a query and return the connector's result batches without downloading them."""
+        if not self.conn:
+            self.connect()
+        cursor = self.conn.cursor()
+        try:
+            with SNOWFLAKE_SECONDS.time(phase="query"):
+                cursor.execute(query, params)
+            return cursor.get_result_batches() or []
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _download_batches(batches: list, convert: Callable, max_workers: int) -> Iterator:
+        """
+        Yield convert(batch) for each result batch, in order.
+
+        With max_workers > 1 up to that many batches are downloaded and
+        converted ahead of the consumer, so memory stays bounded by the
+        prefetch window rather than the result size.
+        """
+        if max_workers <= 1 or len(batches) <= 1:
+            for batch in batches:
+                with SNOWFLAKE_SECONDS.time(phase="fetch"):
+                    converted = convert(batch)
+                yield converted
+            return
+
+        remaining = iter(batches)
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snowflake-batch")
+        pending = deque()
+        try:
+            for batch in remaining:
+                pending.append(pool.submit(convert, batch))
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                with SNOWFLAKE_SECONDS.time(phase="fetch"):
+                    converted = pending.popleft().result()
+                next_batch = next(remaining, None)
+                if next_batch is not None:
+                    pending.append(pool.submit(convert, next_batch))
+                yield converted
+        finally:
+            # Stop early consumers from paying for downloads they will never read
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def iter_arrow_batches(self, query: str, params=None, columns: Optional[Sequence[str]] = None,
+                           max_workers: Optional[int] = None) -> Iterator["pa.Table"]:
+        """
+        Execute a query and stream the result as Arrow tables, one per result batch.
+
+        The result is never materialized in full, so arbitrarily large exports
+        run in bounded memory. Consume the iterator while the hook is still
+        connected (e.g. inside its with block).
+
+        Args:
+            query: SQL query to execute
+            params: Parameters to bind to the query
+            columns: Only keep these result columns (case-insensitive); prefer
+                selecting fewer columns in SQL when the query can be changed
+            max_workers: Batches downloaded in parallel ahead of the consumer
+                (defaults to SNOWFLAKE_BATCH_DOWNLOAD_WORKERS; 1 downloads on demand)
+
+        Yields:
+            pyarrow.Table: Batch with lowercase column names
+        """
+        batches = self._result_batches(query, params)
+        logger.info(f"Streaming {sum(b.rowcount for b in batches)} rows in {len(batches)} Arrow batches")
+        conn = self.conn
+
+        def convert(batch):
+            return _project_arrow(batch.to_arrow(connection=conn), columns)
+
+        yield from self._download_batches(batches, convert, max_workers or BATCH_DOWNLOAD_WORKERS)
+
+    def iter_pandas_batches(self, query: str, params=None, columns: Optional[Sequence[str]] = None,
+                            downcast: bool = False, max_workers: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Execute a query and stream the result as pandas DataFrames, one per result batch.
+
+        Args:
+            query: SQL query to execute
+            params: Parameters to bind to the query
+            columns: Only keep these result columns (case-insensitive)
+            downcast: Shrink numeric columns to the smallest exact dtype; dtypes
+                may then differ between batches (pd.concat upcasts as needed)
+            max_workers: Batches downloaded in parallel ahead of the consumer
+                (defaults to SNOWFLAKE_BATCH_DOWNLOAD_WORKERS; 1 downloads on demand)
+
+        Yields:
+            pandas.DataFrame: Batch with lowercase column names
+        """
+        batches = self._result_batches(query, params)
+        logger.info(f"Streaming {sum(b.rowcount for b in batches)} rows in {len(batches)} pandas batches")
+        conn = self.conn
+
+        def convert(batch):
+            df = _project_arrow(batch.to_arrow(connection=conn), columns).to_pandas()
+            return _downcast_numeric(df) if downcast else df
+
+        yield from self._download_batches(batches, convert, max_workers or BATCH_DOWNLOAD_WORKERS)
 
     def drop_table(self, table_name: str):
         """
@@ -0,0 +1,447 @@
+"""
+Lightweight request tracing for Spirit Food backend.
+
+Spans are timed blocks of work (an HTTP request, a Snowflake query, an LLM
+call) linked into traces through a context variable, so nesting follows
+both threads (via contextvars propagation) and asyncio tasks. Finished
+spans of sampled traces are queued and exported in batches on a background
+thread, keeping request-path overhead to a few microseconds; unsampled
+traces create no span objects at all.
+
+Configuration (environment):
+    TRACING_EXPORTER: none (default), stdout, file or otlp
+    TRACING_FILE: JSON-lines output for the file exporter
+    TRACING_OTLP_ENDPOINT: OTLP/HTTP collector base URL (e.g. http://localhost:4318)
+    TRACING_SAMPLE_RATE: Fraction of traces recorded (0.0-1.0)
+    TRACING_SERVICE_NAME: service.name resource attribute
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from utils.logger import get_logger
+from utils.metrics import route_template
+
+logger = get_logger(__name__)
+
+
+class Span:
+    """A timed unit of work within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded for unsampled traces so callers can set attributes unconditionally."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Current span, or _UNSAMPLED inside a trace that was not sampled
+_UNSAMPLED = object()
+_current: contextvars.ContextVar = contextvars.ContextVar("spirit_current_span", default=None)
+
+
+def _reset(token: contextvars.Token):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # An async generator closed from another task; that context is discarded anyway
+        pass
+
+
+def current_span() -> Optional[Span]:
+    """The span currently in progress, or None."""
+    current = _current.get()
+    return current if isinstance(current, Span) else None
+
+
+# ============================================================================
+# Exporters
+# ============================================================================
+
+class SpanExporter:
+    """Interface for span exporters; export() is called on the background thread."""
+
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Write one JSON object per span to stdout."""
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            sys.stdout.write(json.dumps(span.to_dict(), default=str) + "\n")
+        sys.stdout.flush()
+
+
+class JSONFileSpanExporter(SpanExporter):
+    """Append one JSON object per span to a file (JSON lines)."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a")
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+        self._file.flush()
+
+    def shutdown(self):
+        self._file.close()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPHTTPSpanExporter(SpanExporter):
+    """
+    Send spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding.
+
+    Uses only the standard library, so no OpenTelemetry SDK is required.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            endpoint: Collector base URL; spans are posted to <endpoint>/v1/traces
+            service_name: service.name resource attribute
+            timeout: HTTP timeout in seconds
+            headers: Extra request headers (e.g. auth)
+        """
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def _encode(self, spans: List[Span]) -> bytes:
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "spirit_food"}, "spans": otlp_spans}],
+            }]
+        }
+        return json.dumps(payload, default=str).encode()
+
+    def export(self, spans: List[Span]):
+        request = urllib.request.Request(self.url, data=self._encode(spans), headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+# ============================================================================
+# Tracer
+# ============================================================================
+
+class Tracer:
+    """
+    Creates spans, applies head sampling and exports finished spans in batches.
+
+    The sampling decision is made once per trace at its root span; children
+    of an unsampled root are skipped entirely.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_rate: float = 1.0,
+                 max_queue: int = 10000, batch_size: int = 256, flush_interval: float = 2.0):
+        """
+        Args:
+            exporter: Destination for finished spans (None disables tracing)
+            sample_rate: Fraction of traces to record (0.0-1.0)
+            max_queue: Finished spans buffered before new ones are dropped
+            batch_size: Maximum spans per export call
+            flush_interval: Seconds between exports of a partial batch
+        """
+        self.exporter = exporter
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._counters = dict(started=0, exported=0, dropped=0, export_errors=0)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+                    self._worker.start()
+
+    def _export_loop(self):
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stop = True
+                    break
+                batch.append(span)
+            if batch:
+                try:
+                    self.exporter.export(batch)
+                    self._counters["exported"] += len(batch)
+                except Exception as e:
+                    self._counters["export_errors"] += 1
+                    logger.warning(f"Span export failed ({len(batch)} spans dropped): {e}")
+            if stop:
+                return
+
+    def _finish(self, span: Span):
+        span.end_ns = time.time_ns()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self._counters["dropped"] += 1
+            return
+        self._ensure_worker()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Union[Span, _NoopSpan]]:
+        """
+        Record a span around a block, as a child of the current span if any.
+
+        Yields:
+            The span (or a no-op stand-in when not sampled) for setting attributes
+        """
+        parent = _current.get()
+        if not self.enabled or parent is _UNSAMPLED:
+            yield _NOOP_SPAN
+            return
+        if parent is None and random.random() >= self.sample_rate:
+            token = _current.set(_UNSAMPLED)
+            try:
+                yield _NOOP_SPAN
+            finally:
+                _reset(token)
+            return
+
+        trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        span = Span(name, trace_id, parent.span_id if parent is not None else None, attributes)
+        self._counters["started"] += 1
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _reset(token)
+            self._finish(span)
+
+    def stats(self) -> Dict[str, Any]:
+        """Span counters and queue depth."""
+        return dict(
+            exporter=type(self.exporter).__name__ if self.exporter else None,
+            sample_rate=self.sample_rate,
+            queued=self._queue.qsize(),
+            **self._counters,
+        )
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush queued spans and stop the export thread."""
+        if self._worker is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._worker.join(timeout)
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def _create_tracer() -> Tracer:
+    exporter_name = os.getenv("TRACING_EXPORTER", "none").lower()
+    sample_rate = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+    service_name = os.getenv("TRACING_SERVICE_NAME", "spirit-food-backend")
+
+    exporter: Optional[SpanExporter] = None
+    if exporter_name == "stdout":
+        exporter = ConsoleSpanExporter()
+    elif exporter_name == "file":
+        exporter = JSONFileSpanExporter(os.getenv("TRACING_FILE", "data/traces.jsonl"))
+    elif exporter_name == "otlp":
+        endpoint = os.getenv("TRACING_OTLP_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        if endpoint:
+            exporter = OTLPHTTPSpanExporter(endpoint, service_name)
+        else:
+            logger.warning("TRACING_EXPORTER=otlp but no TRACING_OTLP_ENDPOINT set; tracing disabled")
+    elif exporter_name != "none":
+        logger.warning(f"Unknown TRACING_EXPORTER {exporter_name!r}; tracing disabled")
+
+    if exporter is not None:
+        logger.info(f"Tracing enabled: {type(exporter).__name__}, sample rate {sample_rate}")
+    return Tracer(exporter, sample_rate=sample_rate)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, configured from environment on first use."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _create_tracer()
+    return _tracer
+
+
+def span(name: str, **attributes):
+    """Shortcut for get_tracer().span(...)."""
+    return get_tracer().span(name, **attributes)
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator recording a span around each call of a function.
+
+    Works for plain functions, coroutine functions and async generators
+    (the span covers the whole iteration).
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+    """
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def agen_wrapper(*args, **kwargs):
+                with get_tracer().span(span_name):
+                    async for item in fn(*args, **kwargs):
+                        yield item
+            return agen_wrapper
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per HTTP request, named by route template."""
+
+    def __init__(self, app, routes: Sequence = (), exclude: Sequence[str] = ("/metrics", "/api/health")):
+        """
+        Args:
+            app: Wrapped ASGI application
+            routes: Router routes used to resolve path templates (e.g. fastapi_app.routes)
+            exclude: Route templates not to trace
+        """
+        self.app = app
+        self.routes = routes
+        self.exclude = set(exclude)
+
+    async def __call__(self, scope, receive, send):
+        tracer = get_tracer()
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+        route = route_template(self.routes, scope)
+        if route in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.span(f"{scope['method']} {route}", **{"http.method": scope["method"], "http.route": route}) as request_span:
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    request_span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, _send)
@@ -0,0 +1,185 @@
+"""
+ID Card Cache Warmer
+
+Enumerates every dish x cuisine x alignment adjective combination, generates
+the missing ID cards with bounded concurrency and a request rate cap, and
+persists them so the server can start with a warm cache.
+
+Usage:
+    python warm_cache.py                          # full combination space
+    python warm_cache.py --default-pairings-only  # 20 dishes x their default cuisine
+    python warm_cache.py --concurrency 8 --rate 2 --limit 100
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load config/.env before id_generator reads its cache and model settings at import
+load_dotenv(dotenv_path=Path(__file__).parent / "config" / ".env")
+
+from cuisine_matcher import DEFAULT_PAIRINGS, SUPPORTED_CUISINES
+from id_generator import generate_id_card_async, is_cached, load_cache_snapshot, save_cache_snapshot
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent / "data" / "id_card_cache.json"
+
+# Mirrors alignmentAdjectives in src/js/scoring.js: "<adventure axis>_<time axis>" -> adjective
+ALIGNMENT_ADJECTIVES = {
+    "Comfort_Early Bird": "Wholesome",
+    "Comfort_All Day": "Classic",
+    "Comfort_Late Night": "Soothing",
+    "Balanced_Early Bird": "Fresh",
+    "Balanced_All Day": "Versatile",
+    "Balanced_Late Night": "Chill",
+    "Adventurer_Early Bird": "Bold",
+    "Adventurer_All Day": "Wild",
+    "Adventurer_Late Night": "Unhinged"
+}
+
+# Representative winning-axis share for prompts (the top of three axes is always > 33%).
+# With ID_CARD_CACHE_FIDELITY=banded or exact only requests in this band/percentage hit warmed cards.
+REPRESENTATIVE_PERCENT = 60
+
+# (dish_type, cuisine, alignment_adjective, time_axis, adventure_axis)
+Combination = Tuple[str, str, str, str, str]
+
+
+def enumerate_combinations(default_pairings_only: bool = False) -> List[Combination]:
+    """
+    List ID card combinations, default dish/cuisine pairings first.
+
+    Args:
+        default_pairings_only: Only include each dish with its default cuisine
+
+    Returns:
+        List of (dish_type, cuisine, alignment_adjective, time_axis, adventure_axis)
+    """
+    combos = []
+    seen = set()
+    for default_pass in (True, False):
+        if not default_pass and default_pairings_only:
+            break
+        for dish_type, default_cuisine in DEFAULT_PAIRINGS.items():
+            cuisines = [default_cuisine] if default_pass else SUPPORTED_CUISINES
+            for cuisine in cuisines:
+                for alignment_key, adjective in ALIGNMENT_ADJECTIVES.items():
+                    adventure_axis, time_axis = alignment_key.split("_", 1)
+                    combo = (dish_type, cuisine, adjective, time_axis, adventure_axis)
+                    if combo not in seen:
+                        seen.add(combo)
+                        combos.append(combo)
+    return combos
+
+
+async def warm_id_card_cache(
+    combos: List[Combination],
+    concurrency: int = 4,
+    rate_per_second: float = 2.0,
+    snapshot_path: Optional[Path] = None,
+    checkpoint_every: int = 50
+) -> dict:
+    """
+    Generate and cache ID cards for every uncached combination.
+
+    Args:
+        combos: Combinations to warm (see enumerate_combinations)
+        concurrency: Maximum LLM calls in flight
+        rate_per_second: Maximum LLM calls started per second (0 for unlimited)
+        snapshot_path: Where to persist the cache (None to keep it in memory only)
+        checkpoint_every: Persist the snapshot after this many new cards
+
+    Returns:
+        dict: Counts of generated, skipped and failed combinations
+    """
+    pending = [
+        c for c in combos
+        if not is_cached(c[0], c[1], c[2], c[3], REPRESENTATIVE_PERCENT, c[4], REPRESENTATIVE_PERCENT)
+    ]
+    stats = dict(total=len(combos), skipped=len(combos) - len(pending), generated=0, failed=0)
+    logger.info(f"Warming {len(pending)} ID cards ({stats['skipped']} already cached)")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+    next_start = time.monotonic()
+    rate_lock = asyncio.Lock()
+    since_checkpoint = 0
+
+    async def _wait_for_rate_slot():
+        nonlocal next_start
+        async with rate_lock:
+            delay = next_start - time.monotonic()
+            next_start = max(next_start, time.monotonic()) + interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _warm_one(combo: Combination):
+        nonlocal since_checkpoint
+        dish_type, cuisine, adjective, time_axis, adventure_axis = combo
+        async with semaphore:
+            await _wait_for_rate_slot()
+            try:
+                result = await generate_id_card_async(
+                    dish_type=dish_type,
+                    cuisine=cuisine,
+                    alignment_adjective=adjective,
+                    time_axis=time_axis,
+                    time_percent=REPRESENTATIVE_PERCENT,
+                    adventure_axis=adventure_axis,
+                    adventure_percent=REPRESENTATIVE_PERCENT,
+                    priority="background"
+                )
+            except Exception as e:
+                logger.warning(f"Warm-up generation failed for {adjective} {cuisine} {dish_type}: {e}")
+                result = None
+        if result is None:
+            stats["failed"] += 1
+            return
+        stats["generated"] += 1
+        since_checkpoint += 1
+        if snapshot_path and since_checkpoint >= checkpoint_every:
+            since_checkpoint = 0
+            save_cache_snapshot(snapshot_path)
+
+    await asyncio.gather(*(_warm_one(combo) for combo in pending))
+
+    if snapshot_path:
+        save_cache_snapshot(snapshot_path)
+    logger.info(f"ID card warm-up finished: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate ID cards for the full combination space")
+    parser.add_argument("--default-pairings-only", action="store_true",
+                        help="Only warm each dish with its default cuisine")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum LLM calls in flight")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum LLM calls started per second")
+    parser.add_argument("--limit", type=int, help="Only warm the first N combinations")
+    parser.add_argument("--snapshot", type=Path,
+                        default=Path(os.getenv("ID_CARD_CACHE_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)),
+                        help="Cache snapshot file to resume from and write to")
+    args = parser.parse_args()
+
+    combos = enumerate_combinations(default_pairings_only=args.default_pairings_only)
+    if args.limit:
+        combos = combos[:args.limit]
+
+    load_cache_snapshot(args.snapshot)
+    asyncio.run(warm_id_card_cache(
+        combos,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        snapshot_path=args.snapshot
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -160,10 +160,15 @@ async function showResult() {
     quizScreen.classList.add('hidden');
     resultScreen.classList.remove('hidden');
 
+    // Render the hardcoded card right away; AI fields replace it as they stream in
+    renderIDCard(result);
+
     // Try to get AI-generated personality from backend
     console.log("Calling fetchAIPersonality...");
     try {
-        const aiPersonality = await fetchAIPersonality(result);
+        const aiPersonality = await fetchAIPersonality(result, partial => {
+            renderIDCard({ ...result, personality: partial, aiGenerated: true });
+        });
         console.log("fetchAIPersonality returned:", aiPersonality);
         if (aiPersonality) {
             result.personality = aiPersonality;
@@ -173,24 +178,47 @@ async function showResult() {
         console.error("fetchAIPersonality error:", e);
     }
 
-    // Render ID card
+    // Render final ID card
     console.log("About to call renderIDCard with result:", result);
     renderIDCard(result);
 }
 
+/**
+ * Transform a backend ID card response to the frontend personality format
+ */
+function toPersonality(data, dish) {
+    return {
+        archetype: data.title,
+        emoji: foodPersonalities[dish]?.emoji || "🍽️",
+        strengths: data.strengths,
+        weaknesses: data.weaknesses,
+        quotes: data.quotes,
+        peerReviews: data.peer_reviews.map(pr => ({
+            text: pr.text,
+            reviewer: pr.reviewer
+        })),
+        hiddenTalent: data.hidden_talent,
+        cached: data.cached
+    };
+}
+
 /**
  * Fetch AI-generated personality from backend API
+ *
+ * Reads the Server-Sent Events stream from /api/generate-id-card/stream and
+ * calls onUpdate with a partial personality each time a field arrives.
+ * Sections keep their hardcoded content until their first AI item lands.
  */
-async function fetchAIPersonality(result) {
+async function fetchAIPersonality(result, onUpdate = () => {}) {
     const BACKEND_URL = 'http://localhost:8000';
-    const TIMEOUT_MS = 5000; // 5 second timeout
+    const TIMEOUT_MS = 5000; // 5 second timeout for the first event
 
     try {
         // Add timeout to prevent hanging
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), TIMEOUT_MS);
 
-        const response = await fetch(`${BACKEND_URL}/api/generate-id-card`, {
+        const response = await fetch(`${BACKEND_URL}/api/generate-id-card/stream`, {
             signal: controller.signal,
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
@@ -205,29 +233,62 @@ async function fetchAIPersonality(result) {
             })
         });
 
-        clearTimeout(timeoutId); // Clear timeout on success
-
         if (!response.ok) {
+            clearTimeout(timeoutId);
             console.warn('Backend returned error, using hardcoded content');
             return null;
         }
 
-        const data = await response.json();
-
-        // Transform backend response to match frontend personality format
-        return {
-            archetype: data.title,
-            emoji: foodPersonalities[result.dish]?.emoji || "🍽️",
-            strengths: data.strengths,
-            weaknesses: data.weaknesses,
-            quotes: data.quotes,
-            peerReviews: data.peer_reviews.map(pr => ({
-                text: pr.text,
-                reviewer: pr.reviewer
-            })),
-            hiddenTalent: data.hidden_talent,
-            cached: data.cached
+        // Partial personality, seeded with hardcoded content
+        const partial = { ...result.personality, cached: false };
+        const started = new Set();
+        const listFields = {
+            strengths: 'strengths',
+            weaknesses: 'weaknesses',
+            quotes: 'quotes',
+            peer_reviews: 'peerReviews'
         };
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            clearTimeout(timeoutId); // Clear timeout once data is flowing
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                const event = frame.match(/^event: (.*)$/m)?.[1];
+                const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || 'null');
+
+                if (event === 'done') {
+                    return toPersonality(data, result.dish);
+                } else if (event === 'title') {
+                    partial.archetype = data.value;
+                } else if (event === 'hidden_talent') {
+                    partial.hiddenTalent = data.value;
+                } else if (listFields[event]) {
+                    const key = listFields[event];
+                    if (!started.has(key)) {
+                        started.add(key);
+                        partial[key] = [];
+                    }
+                    partial[key] = [...partial[key], data.value];
+                } else {
+                    continue;
+                }
+                onUpdate({ ...partial });
+            }
+        }
+
+        console.warn('Stream ended without a complete card, using hardcoded content');
+        return null;
     } catch (error) {
         console.warn('Backend unavailable, using hardcoded content:', error.message);
         return null;